@@ -2,7 +2,14 @@ import os
 import re
 import sys
 import time
+import random
+import asyncio
+import logging
+import threading
 import argparse
+import functools
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, date
 from typing import Dict, Any, List, Optional, Union
 
@@ -10,10 +17,12 @@ from dotenv import load_dotenv
 
 from alpaca.common.enums import SupportedCurrencies
 from alpaca.common.exceptions import APIError
+from alpaca.common.rest import RESTClient
 from alpaca.data.enums import DataFeed, OptionsFeed, CorporateActionsType
 from alpaca.data.historical.option import OptionHistoricalDataClient
 from alpaca.data.historical.stock import StockHistoricalDataClient, StockLatestTradeRequest
 from alpaca.data.historical.corporate_actions import CorporateActionsClient
+from alpaca.data.live.option import OptionDataStream
 from alpaca.data.live.stock import StockDataStream
 from alpaca.data.requests import (
     OptionLatestQuoteRequest,
@@ -59,6 +68,8 @@ from alpaca.trading.requests import (
 
 from mcp.server.fastmcp import FastMCP
 
+logger = logging.getLogger(__name__)
+
 # Configure Python path for local imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
 github_core_path = os.path.join(current_dir, '.github', 'core')
@@ -66,11 +77,45 @@ if github_core_path not in sys.path:
     sys.path.insert(0, github_core_path)
 # Import the UserAgentMixin
 from user_agent_mixin import UserAgentMixin
+
+# HTTP statuses alpaca-py retries itself, with a fixed wait. 429s are left to the shared rate limiter,
+# which would not see them otherwise, and other server errors to the limiter's backoff retries.
+SDK_RETRY_CODES = [504]
+
+class RateLimitedRESTClient(RESTClient):
+    """
+    REST client base whose HTTP requests all go through the shared rate limiter.
+    
+    alpaca-py makes every HTTP request, each page of a paged call such as get_option_chain
+    included, through the public get/post/put/patch/delete methods, so each page takes one
+    token and a 429 on one page retries only that page. Listed after the concrete client
+    class, so the concrete constructor reaches RESTClient.__init__ through this one.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("retry_exception_codes", SDK_RETRY_CODES)
+        super().__init__(*args, **kwargs)
+    
+    def get(self, path, data=None, **kwargs):
+        return rate_limiter.call(super().get, path, data, idempotent=True, **kwargs)
+    
+    def post(self, path, data=None):
+        return rate_limiter.call(super().post, path, data)
+    
+    def put(self, path, data=None):
+        return rate_limiter.call(super().put, path, data)
+    
+    def patch(self, path, data=None):
+        return rate_limiter.call(super().patch, path, data)
+    
+    def delete(self, path, data=None):
+        return rate_limiter.call(super().delete, path, data)
+
 # Define new classes using the mixin
-class TradingClientSigned(UserAgentMixin, TradingClient): pass
-class StockHistoricalDataClientSigned(UserAgentMixin, StockHistoricalDataClient): pass
-class OptionHistoricalDataClientSigned(UserAgentMixin, OptionHistoricalDataClient): pass
-class CorporateActionsClientSigned(UserAgentMixin, CorporateActionsClient): pass
+class TradingClientSigned(UserAgentMixin, TradingClient, RateLimitedRESTClient): pass
+class StockHistoricalDataClientSigned(UserAgentMixin, StockHistoricalDataClient, RateLimitedRESTClient): pass
+class OptionHistoricalDataClientSigned(UserAgentMixin, OptionHistoricalDataClient, RateLimitedRESTClient): pass
+class CorporateActionsClientSigned(UserAgentMixin, CorporateActionsClient, RateLimitedRESTClient): pass
 
 def detect_pycharm_environment():
     """
@@ -100,6 +145,24 @@ def parse_arguments():
         default=8000,
         help="Port to bind the server to for HTTP/SSE transport (default: 8000)"
     )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help="Maximum number of concurrent Alpaca API calls (default: ALPACA_MCP_MAX_CONCURRENCY or 8)"
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=int,
+        default=None,
+        help="Maximum Alpaca API requests per minute (default: ALPACA_RATE_LIMIT_PER_MINUTE or 200)"
+    )
+    parser.add_argument(
+        "--latency-target",
+        type=float,
+        default=None,
+        help="Seconds per Alpaca API request above which concurrency is reduced (default: ALPACA_LATENCY_TARGET or 10)"
+    )
     return parser.parse_args()
 
 def setup_transport_config(args):
@@ -154,21 +217,558 @@ TRDE_API_WSS = os.getenv("TRDE_API_WSS")
 DATA_API_URL = os.getenv("DATA_API_URL")
 STREAM_DATA_WSS = os.getenv("STREAM_DATA_WSS")
 
-# Check if keys are available
-if not TRADE_API_KEY or not TRADE_API_SECRET:
-    raise ValueError("Alpaca API credentials not found in environment variables.")
+def credentials_configured() -> bool:
+    """Cheap readiness probe: True when Alpaca API credentials are set (no network round trip)."""
+    return bool(TRADE_API_KEY and TRADE_API_SECRET)
 
-# Initialize clients
+def _require_credentials() -> None:
+    """Helper function to fail a client construction when credentials are missing."""
+    if not credentials_configured():
+        raise ValueError("Alpaca API credentials not found in environment variables.")
+
+# Stand-in clients by name (e.g. "trade_client"), used instead of building the real ones.
+# Tests and benchmarks fill this in before the first tool call.
+_CLIENT_OVERRIDES: Dict[str, Any] = {}
+
+class _LazyClient:
+    """
+    Proxy that builds an Alpaca client on first use.
+    
+    Importing this module then stays cheap and works without credentials; the cost of
+    building a client (and any credentials error) is paid by the first tool that needs it.
+    """
+    
+    def __init__(self, name: str, factory):
+        self._name = name
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+    
+    def _resolve(self):
+        client = self._client
+        if client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = _CLIENT_OVERRIDES.get(self._name) or self._factory()
+                client = self._client
+        return client
+    
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+def _rest_client(client_class, *args, **kwargs):
+    """Helper function to build a REST client (a RateLimitedRESTClient, so rate limited per HTTP request)."""
+    _require_credentials()
+    return client_class(*args, **kwargs)
+
+def _stream_client(stream_class, *args, **kwargs):
+    """Helper function to build a websocket data stream client."""
+    _require_credentials()
+    return stream_class(*args, **kwargs)
+
+# Initialize clients (built on first use)
+# TRADE_API_URL and DATA_API_URL, when set, point the REST clients at another host (a proxy, or
+# benchmarks/fake_alpaca_server.py for load tests)
 # For trading
-trade_client = TradingClientSigned(TRADE_API_KEY, TRADE_API_SECRET, paper=ALPACA_PAPER_TRADE)
+trade_client = _LazyClient("trade_client", lambda: _rest_client(
+    TradingClientSigned, TRADE_API_KEY, TRADE_API_SECRET, paper=ALPACA_PAPER_TRADE, url_override=TRADE_API_URL))
 # For historical market data
-stock_historical_data_client = StockHistoricalDataClientSigned(TRADE_API_KEY, TRADE_API_SECRET)
+stock_historical_data_client = _LazyClient("stock_historical_data_client", lambda: _rest_client(
+    StockHistoricalDataClientSigned, TRADE_API_KEY, TRADE_API_SECRET, url_override=DATA_API_URL))
 # For streaming market data
-stock_data_stream_client = StockDataStream(TRADE_API_KEY, TRADE_API_SECRET, url_override=STREAM_DATA_WSS)
+stock_data_stream_client = _LazyClient("stock_data_stream_client", lambda: _stream_client(
+    StockDataStream, TRADE_API_KEY, TRADE_API_SECRET, url_override=STREAM_DATA_WSS))
+option_data_stream_client = _LazyClient("option_data_stream_client", lambda: _stream_client(
+    OptionDataStream, TRADE_API_KEY, TRADE_API_SECRET))
 # For option historical data
-option_historical_data_client = OptionHistoricalDataClientSigned(api_key=TRADE_API_KEY, secret_key=TRADE_API_SECRET)
+option_historical_data_client = _LazyClient("option_historical_data_client", lambda: _rest_client(
+    OptionHistoricalDataClientSigned, api_key=TRADE_API_KEY, secret_key=TRADE_API_SECRET, url_override=DATA_API_URL))
 # For corporate actions data
-corporate_actions_client = CorporateActionsClientSigned(api_key=TRADE_API_KEY, secret_key=TRADE_API_SECRET)
+corporate_actions_client = _LazyClient("corporate_actions_client", lambda: _rest_client(
+    CorporateActionsClientSigned, api_key=TRADE_API_KEY, secret_key=TRADE_API_SECRET, url_override=DATA_API_URL))
+
+# ============================================================================
+# Upstream Rate Limiting
+# ============================================================================
+
+class RateLimitExceeded(Exception):
+    """Raised when an Alpaca API call is still rate limited (HTTP 429) after all retries"""
+    pass
+
+class UpstreamRateLimiter:
+    """
+    Process-wide limiter that every Alpaca HTTP request goes through.
+    
+    Each REST client routes its individual HTTP requests (every page of a paged
+    call) through call(), so tokens match real upstream traffic.
+    Combines a token bucket (requests per minute) with an AIMD concurrency limit:
+    the number of calls allowed in flight grows by about one per window of fast,
+    successful calls and is halved on 429s, errors or responses slower than
+    latency_target seconds. Rate limited calls are retried after the Retry-After
+    delay (or exponential backoff), and every caller waits out that delay, not
+    just the one that was throttled. Idempotent calls are also retried with
+    exponential backoff after server errors; only the failed call waits.
+    
+    Thread-safe; calls are made from the blocking executor's worker threads.
+    """
+    
+    def __init__(self, requests_per_minute: int, max_concurrency: int, max_retries: int = 4,
+                 latency_target: float = 10.0):
+        self._condition = threading.Condition()
+        self.max_retries = max_retries
+        self.latency_target = latency_target
+        self.min_concurrency = 1
+        self.configure(requests_per_minute, max_concurrency)
+        self._tokens = self._capacity
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._in_flight = 0
+        self.stats = {"calls": 0, "rate_limited": 0, "retries": 0, "errors": 0}
+    
+    def configure(self, requests_per_minute: int, max_concurrency: int) -> None:
+        """Update the request rate and the upper bound on the adaptive concurrency limit."""
+        if requests_per_minute < 1:
+            raise ValueError("requests_per_minute must be at least 1")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        with self._condition:
+            self.requests_per_minute = requests_per_minute
+            self._rate = requests_per_minute / 60.0
+            # Allow short bursts of up to ~5 seconds' worth of requests
+            self._capacity = max(1.0, self._rate * 5)
+            self.max_concurrency = max_concurrency
+            self._limit = float(max_concurrency)
+            self._condition.notify_all()
+    
+    @property
+    def concurrency_limit(self) -> int:
+        """Current adaptive limit on in-flight calls."""
+        return int(self._limit)
+    
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+    
+    def _acquire(self) -> None:
+        """Block until a token is available, the concurrency limit allows a call and no backoff is active."""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self._in_flight >= int(self._limit):
+                    wait = None  # woken by _release
+                elif self._tokens < 1:
+                    wait = (1 - self._tokens) / self._rate
+                else:
+                    self._tokens -= 1
+                    self._in_flight += 1
+                    self.stats["calls"] += 1
+                    return
+                self._condition.wait(wait)
+    
+    def _release(self, latency: float, congested: bool) -> None:
+        """Return a concurrency slot and adjust the limit (AIMD)."""
+        with self._condition:
+            self._in_flight -= 1
+            if not congested and latency <= self.latency_target:
+                self._limit = min(float(self.max_concurrency), self._limit + 1.0 / self._limit)
+            else:
+                self._limit = max(float(self.min_concurrency), self._limit / 2)
+            self._condition.notify_all()
+    
+    def _back_off(self, delay: float) -> None:
+        """Pause every caller for delay seconds and drain the bucket after a 429."""
+        with self._condition:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            self._tokens = 0.0
+    
+    @staticmethod
+    def _retry_delay(error: APIError, attempt: int) -> float:
+        """Seconds to wait before retrying a rate limited or failed call."""
+        response = error.response
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+        return min(30.0, 2 ** attempt) + random.uniform(0, 0.5)
+    
+    def call(self, func, *args, idempotent: bool = False, **kwargs):
+        """
+        Run one blocking Alpaca HTTP request under the limiter, retrying on HTTP 429.
+        
+        Idempotent requests (GETs) are also retried on server errors, except 504s, which
+        alpaca-py has already retried (see SDK_RETRY_CODES).
+        """
+        for attempt in range(self.max_retries + 1):
+            self._acquire()
+            start = time.monotonic()
+            try:
+                result = func(*args, **kwargs)
+            except APIError as api_error:
+                status_code = api_error.status_code
+                server_error = (status_code or 500) >= 500
+                # Only throttling and server-side failures signal congestion; a 404 or 422 does not
+                self._release(time.monotonic() - start, congested=status_code == 429 or server_error)
+                if status_code != 429:
+                    self.stats["errors"] += 1
+                    if idempotent and server_error and status_code not in SDK_RETRY_CODES and attempt < self.max_retries:
+                        self.stats["retries"] += 1
+                        # A server error says nothing about the request budget, so only this call waits
+                        time.sleep(self._retry_delay(api_error, attempt))
+                        continue
+                    raise
+                self.stats["rate_limited"] += 1
+                if attempt == self.max_retries:
+                    raise RateLimitExceeded(
+                        f"Alpaca API rate limit exceeded after {self.max_retries} retries"
+                    ) from api_error
+                self.stats["retries"] += 1
+                self._back_off(self._retry_delay(api_error, attempt))
+                continue
+            except Exception:
+                self._release(time.monotonic() - start, congested=True)
+                self.stats["errors"] += 1
+                raise
+            self._release(time.monotonic() - start, congested=False)
+            return result
+
+RATE_LIMIT_PER_MINUTE = int(os.getenv("ALPACA_RATE_LIMIT_PER_MINUTE", "200"))
+# Option chain pages routinely take a few seconds; only slower requests count as congestion
+LATENCY_TARGET = float(os.getenv("ALPACA_LATENCY_TARGET", "10"))
+
+# ============================================================================
+# Blocking Call Offloading
+# ============================================================================
+
+# The alpaca-py clients are synchronous. Tools run every SDK call in this bounded thread pool so a
+# slow request never blocks the event loop that serves the other connected MCP clients.
+MAX_CONCURRENCY = int(os.getenv("ALPACA_MCP_MAX_CONCURRENCY", "8"))
+_blocking_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="alpaca-sdk")
+rate_limiter = UpstreamRateLimiter(RATE_LIMIT_PER_MINUTE, MAX_CONCURRENCY, latency_target=LATENCY_TARGET)
+
+def configure_concurrency(max_concurrency: int) -> None:
+    """
+    Resize the pool used for blocking Alpaca API calls.
+    
+    Args:
+        max_concurrency (int): Maximum number of Alpaca API calls in flight at once (>= 1)
+    """
+    global MAX_CONCURRENCY, _blocking_executor
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    previous_executor = _blocking_executor
+    MAX_CONCURRENCY = max_concurrency
+    _blocking_executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="alpaca-sdk")
+    rate_limiter.configure(rate_limiter.requests_per_minute, max_concurrency)
+    previous_executor.shutdown(wait=False)
+
+def configure_rate_limit(requests_per_minute: int) -> None:
+    """
+    Set the shared request budget for all Alpaca API calls made by this process.
+    
+    Args:
+        requests_per_minute (int): Maximum number of Alpaca API requests per minute (>= 1)
+    """
+    global RATE_LIMIT_PER_MINUTE
+    rate_limiter.configure(requests_per_minute, MAX_CONCURRENCY)
+    RATE_LIMIT_PER_MINUTE = requests_per_minute
+
+def configure_latency_target(seconds: float) -> None:
+    """
+    Set the request latency above which the shared rate limiter reduces concurrency.
+    
+    Args:
+        seconds (float): Latency target in seconds (> 0)
+    """
+    global LATENCY_TARGET
+    if seconds <= 0:
+        raise ValueError("latency target must be positive")
+    rate_limiter.latency_target = seconds
+    LATENCY_TARGET = seconds
+
+async def _run_blocking(func, *args, **kwargs):
+    """Helper function to run a blocking alpaca-py call in the bounded executor (its requests are rate limited)."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_blocking_executor, functools.partial(func, *args, **kwargs))
+
+# ============================================================================
+# Structured Output Helpers
+# ============================================================================
+
+# Output formats accepted by tools that support structured results.
+# "text" is the human-readable default for LLM clients, "json" returns typed records
+# (plain dicts of floats/ints/strings) for programmatic consumers such as the screener.
+OUTPUT_FORMATS = ("text", "json")
+
+def _is_json_output(output_format: str) -> bool:
+    """Helper function to validate the output_format argument and check for structured output."""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Invalid output_format '{output_format}'. Supported formats: {', '.join(OUTPUT_FORMATS)}")
+    return output_format == "json"
+
+def _error_record(message: str, error: Exception) -> Dict[str, Any]:
+    """Helper function to build a structured error result, flagging upstream rate limiting."""
+    record = {"error": message}
+    if isinstance(error, RateLimitExceeded):
+        record["rate_limited"] = True
+    return record
+
+def _to_float(value) -> Optional[float]:
+    """Helper function to convert SDK numeric values (float, str or None) to float."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _to_int(value) -> Optional[int]:
+    """Helper function to convert SDK integer values (int, str or None) to int."""
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+def _to_iso(value) -> Optional[str]:
+    """Helper function to convert dates and timestamps to ISO 8601 strings."""
+    return value.isoformat() if value is not None else None
+
+def _enum_value(value) -> Optional[str]:
+    """Helper function to unwrap SDK enums to their plain string value."""
+    if value is None:
+        return None
+    return str(value.value) if hasattr(value, "value") else str(value)
+
+def _stock_quote_to_record(symbol: str, quote) -> Dict[str, Any]:
+    """Helper function to convert a stock quote into a structured record."""
+    return {
+        "symbol": symbol,
+        "bid_price": _to_float(quote.bid_price),
+        "ask_price": _to_float(quote.ask_price),
+        "bid_size": _to_float(quote.bid_size),
+        "ask_size": _to_float(quote.ask_size),
+        "timestamp": _to_iso(quote.timestamp),
+    }
+
+def _option_contract_to_record(contract) -> Dict[str, Any]:
+    """Helper function to convert an option contract into a structured record."""
+    return {
+        "symbol": contract.symbol,
+        "name": contract.name,
+        "type": _enum_value(contract.type),
+        "strike_price": _to_float(contract.strike_price),
+        "expiration_date": _to_iso(contract.expiration_date),
+        "status": _enum_value(contract.status),
+        "root_symbol": contract.root_symbol,
+        "underlying_symbol": contract.underlying_symbol,
+        "style": _enum_value(contract.style),
+        "size": _to_int(contract.size),
+        "tradable": bool(contract.tradable),
+        "open_interest": _to_int(contract.open_interest),
+        "open_interest_date": _to_iso(contract.open_interest_date),
+        "close_price": _to_float(contract.close_price),
+        "close_price_date": _to_iso(contract.close_price_date),
+    }
+
+def _option_snapshot_to_record(symbol: str, snapshot) -> Dict[str, Any]:
+    """Helper function to convert an option snapshot into a structured record.
+
+    Implied volatility is returned as a decimal (e.g. 0.4523), unrounded.
+    """
+    record = {
+        "symbol": symbol,
+        "implied_volatility": _to_float(snapshot.implied_volatility),
+        "latest_quote": None,
+        "latest_trade": None,
+        "greeks": None,
+    }
+    if snapshot.latest_quote:
+        quote = snapshot.latest_quote
+        record["latest_quote"] = {
+            "bid_price": _to_float(quote.bid_price),
+            "bid_size": _to_float(quote.bid_size),
+            "ask_price": _to_float(quote.ask_price),
+            "ask_size": _to_float(quote.ask_size),
+            "timestamp": _to_iso(quote.timestamp),
+        }
+    if snapshot.latest_trade:
+        trade = snapshot.latest_trade
+        record["latest_trade"] = {
+            "price": _to_float(trade.price),
+            "size": _to_float(trade.size),
+            "timestamp": _to_iso(trade.timestamp),
+        }
+    if snapshot.greeks:
+        greeks = snapshot.greeks
+        record["greeks"] = {
+            "delta": _to_float(greeks.delta),
+            "gamma": _to_float(greeks.gamma),
+            "rho": _to_float(greeks.rho),
+            "theta": _to_float(greeks.theta),
+            "vega": _to_float(greeks.vega),
+        }
+    return record
+
+# ============================================================================
+# Live Quote Book
+# ============================================================================
+
+class QuoteBook:
+    """
+    Latest streamed quote per symbol, fed by an Alpaca data stream on a background thread.
+    
+    Symbols are subscribed on demand: the websocket connects on the first subscription and
+    reconnects on its own after that. If the stream thread dies anyway, the next subscription
+    restarts it (at most once per RESTART_INTERVAL seconds). At most max_symbols stay
+    subscribed; beyond that, the symbols least recently subscribed to or read are unsubscribed.
+    Reads are a dictionary lookup and never touch the network, so callers check the book first
+    and fall back to REST for symbols without a fresh quote.
+    """
+    
+    RESTART_INTERVAL = 30.0
+    
+    def __init__(self, stream, name: str, max_symbols: int = 500):
+        self._stream = stream
+        self._name = name
+        self.max_symbols = max_symbols
+        self._quotes: Dict[str, tuple] = {}  # symbol -> (monotonic receive time, quote record)
+        # Subscribed symbols, least recently subscribed to or read first
+        self._subscribed: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = 0.0
+        # A single worker keeps subscription messages ordered and off the caller's thread
+        self._subscriber = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{name}-quote-subscriber")
+        self.updates = 0
+    
+    async def _on_quote(self, quote) -> None:
+        record = _stock_quote_to_record(quote.symbol, quote)
+        with self._lock:
+            # Quotes can still arrive for a symbol while it is being unsubscribed
+            if quote.symbol in self._subscribed:
+                self._quotes[quote.symbol] = (time.monotonic(), record)
+                self.updates += 1
+    
+    def _run_stream(self) -> None:
+        try:
+            self._stream.run()
+        except Exception as e:
+            logger.error(f"{self._name} quote stream failed: {e}")
+        else:
+            logger.warning(f"{self._name} quote stream stopped")
+    
+    def _stream_dead(self) -> bool:
+        """Whether a started stream thread has exited and may be restarted"""
+        return (
+            self._thread is not None and not self._thread.is_alive()
+            and time.monotonic() - self._started_at >= self.RESTART_INTERVAL
+        )
+    
+    def _subscribe(self, symbols: List[str], evicted: List[str]) -> None:
+        if evicted:
+            try:
+                self._stream.unsubscribe_quotes(*evicted)
+            except Exception as e:
+                logger.error(f"Error unsubscribing from {self._name} quotes for {', '.join(evicted)}: {e}")
+        try:
+            if symbols:
+                self._stream.subscribe_quotes(self._on_quote, *symbols)
+            if self._thread is None or self._stream_dead():
+                if self._thread is not None:
+                    # The stream keeps every subscription, so the new connection resubscribes them all
+                    logger.warning(f"Restarting the {self._name} quote stream")
+                self._thread = threading.Thread(target=self._run_stream, name=f"{self._name}-quote-stream", daemon=True)
+                self._started_at = time.monotonic()
+                self._thread.start()
+        except Exception as e:
+            # Let the next request retry the subscription; readers fall back to REST meanwhile
+            with self._lock:
+                for symbol in symbols:
+                    self._subscribed.pop(symbol, None)
+            logger.error(f"Error subscribing to {self._name} quotes for {', '.join(symbols)}: {e}")
+    
+    def subscribe(self, symbols: List[str]) -> int:
+        """
+        Start streaming quotes for symbols that are not subscribed yet, without blocking.
+        
+        Also restarts the stream thread if it has died, and unsubscribes the least recently
+        used symbols once more than max_symbols are subscribed.
+        
+        Args:
+            symbols (List[str]): Symbols to track
+        
+        Returns:
+            int: Number of newly subscribed symbols
+        """
+        with self._lock:
+            new_symbols = []
+            for symbol in dict.fromkeys(symbols):
+                if symbol in self._subscribed:
+                    self._subscribed.move_to_end(symbol)
+                else:
+                    self._subscribed[symbol] = None
+                    new_symbols.append(symbol)
+            evicted = []
+            while len(self._subscribed) > self.max_symbols:
+                symbol, _ = self._subscribed.popitem(last=False)
+                self._quotes.pop(symbol, None)
+                evicted.append(symbol)
+            if evicted:
+                # Symbols added and evicted by this same request were never sent to the stream
+                added = set(new_symbols)
+                evicted = [symbol for symbol in evicted if symbol not in added]
+                new_symbols = [symbol for symbol in new_symbols if symbol in self._subscribed]
+        if new_symbols or evicted or self._stream_dead():
+            self._subscriber.submit(self._subscribe, new_symbols, evicted)
+        return len(new_symbols)
+    
+    def is_subscribed(self, symbol: str) -> bool:
+        return symbol in self._subscribed
+    
+    def get(self, symbol: str, max_age: float) -> Optional[Dict[str, Any]]:
+        """
+        Return the latest streamed quote record for a symbol.
+        
+        Args:
+            symbol (str): Symbol to look up
+            max_age (float): Maximum seconds since the quote was received
+        
+        Returns:
+            dict: Quote record as returned by get_stock_quote, or None if missing or stale
+        """
+        with self._lock:
+            entry = self._quotes.get(symbol)
+            if symbol in self._subscribed:
+                self._subscribed.move_to_end(symbol)
+        if entry is None or time.monotonic() - entry[0] > max_age:
+            return None
+        return entry[1]
+    
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribed": len(self._subscribed),
+            "quotes": len(self._quotes),
+            "updates": self.updates,
+            "connected": self._thread is not None and self._thread.is_alive(),
+        }
+    
+    def stop(self) -> None:
+        """Close the websocket connection, if one was started."""
+        if self._thread is not None:
+            self._stream.stop()
+
+# Per stream; Alpaca plans cap how many symbols one connection may subscribe to
+STREAM_MAX_SYMBOLS = int(os.getenv("ALPACA_STREAM_MAX_SYMBOLS", "500"))
+
+stock_quote_book = QuoteBook(stock_data_stream_client, "stock", STREAM_MAX_SYMBOLS)
+option_quote_book = QuoteBook(option_data_stream_client, "option", STREAM_MAX_SYMBOLS)
 
 # ============================================================================
 # Account Information Tools
@@ -192,8 +792,7 @@ async def get_account_info() -> str:
             - Pattern Day Trader Status
             - Day Trades Remaining
     """
-    account = trade_client.get_account()
-    
+    account = await _run_blocking(trade_client.get_account)
     info = f"""
             Account Information:
             -------------------
@@ -225,8 +824,7 @@ async def get_positions() -> str:
             - Current Price
             - Unrealized P/L
     """
-    positions = trade_client.get_all_positions()
-    
+    positions = await _run_blocking(trade_client.get_all_positions)
     if not positions:
         return "No open positions found."
     
@@ -255,8 +853,7 @@ async def get_open_position(symbol: str) -> str:
         str: Formatted string containing the position details or an error message
     """
     try:
-        position = trade_client.get_open_position(symbol)
-        
+        position = await _run_blocking(trade_client.get_open_position, symbol)
         # Check if it's an options position by looking for the options symbol pattern
         is_option = len(symbol) > 6 and any(c in symbol for c in ['C', 'P'])
         
@@ -280,12 +877,13 @@ async def get_open_position(symbol: str) -> str:
 # ============================================================================
 
 @mcp.tool()
-async def get_stock_quote(symbol: str) -> str:
+async def get_stock_quote(symbol: str, output_format: str = "text") -> Union[str, Dict[str, Any]]:
     """
     Retrieves and formats the latest quote for a stock.
     
     Args:
         symbol (str): Stock ticker symbol (e.g., AAPL, MSFT)
+        output_format (str): "text" for a formatted string (default) or "json" for a structured record
     
     Returns:
         str: Formatted string containing:
@@ -294,10 +892,15 @@ async def get_stock_quote(symbol: str) -> str:
             - Ask Size
             - Bid Size
             - Timestamp
+        dict: When output_format is "json", {"quote": {...} or None} with unrounded prices,
+            or {"error": message, "rate_limited": True if throttled} on failure
     """
     try:
+        as_json = _is_json_output(output_format)
         request_params = StockLatestQuoteRequest(symbol_or_symbols=symbol)
-        quotes = stock_historical_data_client.get_stock_latest_quote(request_params)
+        quotes = await _run_blocking(stock_historical_data_client.get_stock_latest_quote, request_params)
+        if as_json:
+            return {"quote": _stock_quote_to_record(symbol, quotes[symbol]) if symbol in quotes else None}
         
         if symbol in quotes:
             quote = quotes[symbol]
@@ -313,8 +916,66 @@ async def get_stock_quote(symbol: str) -> str:
         else:
             return f"No quote data found for {symbol}."
     except Exception as e:
+        if output_format == "json":
+            return _error_record(f"Error fetching quote for {symbol}: {str(e)}", e)
         return f"Error fetching quote for {symbol}: {str(e)}"
 
+@mcp.tool()
+async def get_live_quotes(
+    symbols: List[str],
+    asset_class: str = "stock",
+    max_age_seconds: float = 5.0,
+    output_format: str = "text"
+) -> Union[str, Dict[str, Any]]:
+    """
+    Returns the latest streamed quotes for stocks or option contracts from the live quote book.
+    
+    Symbols that are not streamed yet are subscribed and will have quotes on later calls;
+    use get_stock_quote or get_option_latest_quote for an immediate REST lookup.
+    
+    Args:
+        symbols (List[str]): Stock tickers or option contract symbols
+        asset_class (str): "stock" (default) or "option"
+        max_age_seconds (float): Ignore quotes received more than this many seconds ago (default 5)
+        output_format (str): "text" for a formatted string (default) or "json" for structured records
+    
+    Returns:
+        str: One line per symbol with bid, ask and timestamp, or a note that it is pending
+        dict: When output_format is "json", {"quotes": {symbol: {...}}, "pending": [symbols]}
+    """
+    try:
+        as_json = _is_json_output(output_format)
+        books = {"stock": stock_quote_book, "option": option_quote_book}
+        if asset_class not in books:
+            raise ValueError(f"Invalid asset_class '{asset_class}'. Supported: {', '.join(books)}")
+        book = books[asset_class]
+        
+        symbols = [symbol.upper().strip() for symbol in symbols]
+        book.subscribe(symbols)
+        quotes = {}
+        pending = []
+        for symbol in symbols:
+            quote = book.get(symbol, max_age_seconds)
+            if quote is None:
+                pending.append(symbol)
+            else:
+                quotes[symbol] = quote
+        if as_json:
+            return {"quotes": quotes, "pending": pending}
+        
+        lines = [f"Live {asset_class} quotes:", "------------------------"]
+        for symbol in symbols:
+            quote = quotes.get(symbol)
+            if quote is None:
+                lines.append(f"{symbol}: no quote streamed in the last {max_age_seconds:g}s (subscribed)")
+            else:
+                lines.append(f"{symbol}: Bid ${quote['bid_price']:.2f} / Ask ${quote['ask_price']:.2f} at {quote['timestamp']}")
+        return "\n".join(lines)
+    except Exception as e:
+        if output_format == "json":
+            return _error_record(f"Error fetching live quotes: {str(e)}", e)
+        return f"Error fetching live quotes: {str(e)}"
+
 @mcp.tool()
 async def get_stock_bars(
     symbol: str, 
@@ -390,8 +1051,7 @@ async def get_stock_bars(
             limit=limit
         )
         
-        bars = stock_historical_data_client.get_stock_bars(request_params)
-        
+        bars = await _run_blocking(stock_historical_data_client.get_stock_bars, request_params)
         if bars[symbol]:
             time_range = f"{start_time.strftime('%Y-%m-%d %H:%M')} to {end_time.strftime('%Y-%m-%d %H:%M')}"
             result = f"Historical Data for {symbol} ({timeframe} bars, {time_range}):\n"
@@ -454,8 +1114,7 @@ async def get_stock_trades(
         )
         
         # Get the trades
-        trades = stock_historical_data_client.get_stock_trades(request_params)
-        
+        trades = await _run_blocking(stock_historical_data_client.get_stock_trades, request_params)
         if symbol in trades:
             result = f"Historical Trades for {symbol} (Last {days} days):\n"
             result += "---------------------------------------------------\n"
@@ -501,8 +1160,7 @@ async def get_stock_latest_trade(
         )
         
         # Get the latest trade
-        latest_trades = stock_historical_data_client.get_stock_latest_trade(request_params)
-        
+        latest_trades = await _run_blocking(stock_historical_data_client.get_stock_latest_trade, request_params)
         if symbol in latest_trades:
             trade = latest_trades[symbol]
             return f"""
@@ -545,8 +1203,7 @@ async def get_stock_latest_bar(
         )
         
         # Get the latest bar
-        latest_bars = stock_historical_data_client.get_stock_latest_bar(request_params)
-        
+        latest_bars = await _run_blocking(stock_historical_data_client.get_stock_latest_bar, request_params)
         if symbol in latest_bars:
             bar = latest_bars[symbol]
             return f"""
@@ -639,8 +1296,7 @@ async def get_stock_snapshot(
     try:
         # Create and execute request
         request = StockSnapshotRequest(symbol_or_symbols=symbol_or_symbols, feed=feed, currency=currency)
-        snapshots = stock_historical_data_client.get_stock_snapshot(request)
-        
+        snapshots = await _run_blocking(stock_historical_data_client.get_stock_snapshot, request)
         # Format response
         symbols = [symbol_or_symbols] if isinstance(symbol_or_symbols, str) else symbol_or_symbols
         results = ["Stock Snapshots:", "=" * 15, ""]
@@ -729,8 +1385,7 @@ async def get_orders(status: str = "all", limit: int = 10) -> str:
             limit=limit
         )
         
-        orders = trade_client.get_orders(request_params)
-        
+        orders = await _run_blocking(trade_client.get_orders, request_params)
         if not orders:
             return f"No {status} orders found."
         
@@ -896,7 +1551,7 @@ async def place_stock_order(
             return f"Invalid order type: {order_type}. Must be one of: MARKET, LIMIT, STOP, STOP_LIMIT, TRAILING_STOP."
 
         # Submit order
-        order = trade_client.submit_order(order_data)
+        order = await _run_blocking(trade_client.submit_order, order_data)
         return f"""
                 Order Placed Successfully:
                 -------------------------
@@ -922,8 +1577,7 @@ async def cancel_all_orders() -> str:
     """
     try:
         # Cancel all orders
-        cancel_responses = trade_client.cancel_orders()
-        
+        cancel_responses = await _run_blocking(trade_client.cancel_orders)
         if not cancel_responses:
             return "No orders were found to cancel."
         
@@ -957,8 +1611,7 @@ async def cancel_order_by_id(order_id: str) -> str:
     """
     try:
         # Cancel the specific order
-        response = trade_client.cancel_order_by_id(order_id)
-        
+        response = await _run_blocking(trade_client.cancel_order_by_id, order_id)
         # Format the response
         status = "Success" if response.status == 200 else "Failed"
         result = f"""
@@ -1003,8 +1656,7 @@ async def close_position(symbol: str, qty: Optional[str] = None, percentage: Opt
             )
         
         # Close the position
-        order = trade_client.close_position(symbol, close_options)
-        
+        order = await _run_blocking(trade_client.close_position, symbol, close_options)
         return f"""
                 Position Closed Successfully:
                 ----------------------------
@@ -1044,8 +1696,7 @@ async def close_all_positions(cancel_orders: bool = False) -> str:
     """
     try:
         # Close all positions
-        close_responses = trade_client.close_all_positions(cancel_orders=cancel_orders)
-        
+        close_responses = await _run_blocking(trade_client.close_all_positions, cancel_orders=cancel_orders)
         if not close_responses:
             return "No positions were found to close."
         
@@ -1086,7 +1737,7 @@ async def get_asset_info(symbol: str) -> str:
             - Trading Properties
     """
     try:
-        asset = trade_client.get_asset(symbol)
+        asset = await _run_blocking(trade_client.get_asset, symbol)
         return f"""
                 Asset Information for {symbol}:
                 ----------------------------
@@ -1131,8 +1782,7 @@ async def get_all_assets(
             )
         
         # Get all assets
-        assets = trade_client.get_all_assets(filter_params)
-        
+        assets = await _run_blocking(trade_client.get_all_assets, filter_params)
         if not assets:
             return "No assets found matching the criteria."
         
@@ -1172,7 +1822,7 @@ async def create_watchlist(name: str, symbols: List[str]) -> str:
     """
     try:
         watchlist_data = CreateWatchlistRequest(name=name, symbols=symbols)
-        watchlist = trade_client.create_watchlist(watchlist_data)
+        watchlist = await _run_blocking(trade_client.create_watchlist, watchlist_data)
         return f"Watchlist '{name}' created successfully with {len(symbols)} symbols."
     except Exception as e:
         return f"Error creating watchlist: {str(e)}"
@@ -1181,7 +1831,7 @@ async def create_watchlist(name: str, symbols: List[str]) -> str:
 async def get_watchlists() -> str:
     """Get all watchlists for the account."""
     try:
-        watchlists = trade_client.get_watchlists()
+        watchlists = await _run_blocking(trade_client.get_watchlists)
         result = "Watchlists:\n------------\n"
         for wl in watchlists:
             result += f"Name: {wl.name}\n"
@@ -1199,7 +1849,7 @@ async def update_watchlist(watchlist_id: str, name: str = None, symbols: List[st
     """Update an existing watchlist."""
     try:
         update_request = UpdateWatchlistRequest(name=name, symbols=symbols)
-        watchlist = trade_client.update_watchlist_by_id(watchlist_id, update_request)
+        watchlist = await _run_blocking(trade_client.update_watchlist_by_id, watchlist_id, update_request)
         return f"Watchlist updated successfully: {watchlist.name}"
     except Exception as e:
         return f"Error updating watchlist: {str(e)}"
@@ -1221,7 +1871,7 @@ async def get_market_clock() -> str:
             - Next Close Time
     """
     try:
-        clock = trade_client.get_clock()
+        clock = await _run_blocking(trade_client.get_clock)
         return f"""
                 Market Status:
                 -------------
@@ -1252,8 +1902,7 @@ async def get_market_calendar(start_date: str, end_date: str) -> str:
         
         # Create the request object with the correct parameters
         calendar_request = GetCalendarRequest(start=start_dt, end=end_dt)
-        calendar = trade_client.get_calendar(calendar_request)
-        
+        calendar = await _run_blocking(trade_client.get_calendar, calendar_request)
         result = f"Market Calendar ({start_date} to {end_date}):\n----------------------------\n"
         for day in calendar:
             result += f"Date: {day.date}, Open: {day.open}, Close: {day.close}\n"
@@ -1322,8 +1971,7 @@ async def get_corporate_announcements(
             limit=limit,
             sort=sort
         )
-        announcements = corporate_actions_client.get_corporate_actions(request)
-        
+        announcements = await _run_blocking(corporate_actions_client.get_corporate_actions, request)
         if not announcements or not announcements.data:
             return "No corporate announcements found for the specified criteria."
         
@@ -1390,6 +2038,82 @@ async def get_corporate_announcements(
 # Options Trading Tools
 # ============================================================================
 
+def _parse_option_symbol(option_symbol: str) -> Optional[Dict[str, Any]]:
+    """
+    Helper function to parse an OCC option symbol (e.g. 'AAPL250613P00205000') into its parts.
+    
+    Returns:
+        Optional[Dict[str, Any]]: root_symbol, expiration_date (ISO string), type ('call'/'put')
+            and strike_price, or None if the symbol is not a valid OCC symbol
+    """
+    match = re.match(r'^([A-Z0-9.]+?)(\d{6})([CP])(\d{8})$', option_symbol or "")
+    if not match:
+        return None
+    try:
+        expiration = datetime.strptime(match.group(2), "%y%m%d").date()
+    except ValueError:
+        return None
+    return {
+        "root_symbol": match.group(1),
+        "expiration_date": expiration.isoformat(),
+        "type": "call" if match.group(3) == "C" else "put",
+        "strike_price": int(match.group(4)) / 1000,
+    }
+
+def _format_option_snapshot(symbol: str, snapshot) -> str:
+    """Helper function to format an option snapshot (quote, trade, IV and Greeks) consistently."""
+    result = f"Symbol: {symbol}\n"
+    result += "-----------------\n"
+    
+    # Latest Quote
+    if snapshot.latest_quote:
+        quote = snapshot.latest_quote
+        result += f"Latest Quote:\n"
+        result += f"  Bid Price: ${quote.bid_price:.6f}\n"
+        result += f"  Bid Size: {quote.bid_size}\n"
+        result += f"  Bid Exchange: {quote.bid_exchange}\n"
+        result += f"  Ask Price: ${quote.ask_price:.6f}\n"
+        result += f"  Ask Size: {quote.ask_size}\n"
+        result += f"  Ask Exchange: {quote.ask_exchange}\n"
+        if quote.conditions:
+            result += f"  Conditions: {quote.conditions}\n"
+        if quote.tape:
+            result += f"  Tape: {quote.tape}\n"
+        result += f"  Timestamp: {quote.timestamp.strftime('%Y-%m-%d %H:%M:%S.%f %Z')}\n"
+    
+    # Latest Trade
+    if snapshot.latest_trade:
+        trade = snapshot.latest_trade
+        result += f"Latest Trade:\n"
+        result += f"  Price: ${trade.price:.6f}\n"
+        result += f"  Size: {trade.size}\n"
+        if trade.exchange:
+            result += f"  Exchange: {trade.exchange}\n"
+        if trade.conditions:
+            result += f"  Conditions: {trade.conditions}\n"
+        if trade.tape:
+            result += f"  Tape: {trade.tape}\n"
+        if trade.id:
+            result += f"  Trade ID: {trade.id}\n"
+        result += f"  Timestamp: {trade.timestamp.strftime('%Y-%m-%d %H:%M:%S.%f %Z')}\n"
+    
+    # Implied Volatility
+    if snapshot.implied_volatility is not None:
+        result += f"Implied Volatility: {snapshot.implied_volatility:.2%}\n"
+    
+    # Greeks
+    if snapshot.greeks:
+        greeks = snapshot.greeks
+        result += f"Greeks:\n"
+        result += f"  Delta: {greeks.delta:.4f}\n"
+        result += f"  Gamma: {greeks.gamma:.4f}\n"
+        result += f"  Rho: {greeks.rho:.4f}\n"
+        result += f"  Theta: {greeks.theta:.4f}\n"
+        result += f"  Vega: {greeks.vega:.4f}\n"
+    
+    return result
+
+
 @mcp.tool()
 async def get_option_contracts(
     underlying_symbol: str,
@@ -1397,13 +2121,17 @@ async def get_option_contracts(
     expiration_month: Optional[int] = None,
     expiration_year: Optional[int] = None,
     expiration_week_start: Optional[date] = None,
+    expiration_date_gte: Optional[date] = None,
+    expiration_date_lte: Optional[date] = None,
     strike_price_gte: Optional[str] = None,
     strike_price_lte: Optional[str] = None,
     type: Optional[ContractType] = None,
     status: Optional[AssetStatus] = None,
     root_symbol: Optional[str] = None,
-    limit: Optional[int] = None
-) -> str:
+    limit: Optional[int] = None,
+    page_token: Optional[str] = None,
+    output_format: str = "text"
+) -> Union[str, Dict[str, Any]]:
     """
     Retrieves metadata for option contracts based on specified criteria. This endpoint returns contract specifications
     and static data, not real-time pricing information.
@@ -1414,12 +2142,16 @@ async def get_option_contracts(
         expiration_month (Optional[int]): Optional expiration month (1-12) to get all contracts for that month
         expiration_year (Optional[int]): Optional expiration year (required if expiration_month is provided)
         expiration_week_start (Optional[date]): Optional start date of week to find all contracts expiring in that week (Monday-Sunday)
+        expiration_date_gte (Optional[date]): Optional earliest expiration date (inclusive), filtered by the API
+        expiration_date_lte (Optional[date]): Optional latest expiration date (inclusive), filtered by the API
         strike_price_gte (Optional[str]): Optional minimum strike price
         strike_price_lte (Optional[str]): Optional maximum strike price
         type (Optional[ContractType]): Optional contract type (CALL or PUT)
         status (Optional[AssetStatus]): Optional asset status filter (e.g., ACTIVE)
         root_symbol (Optional[str]): Optional root symbol for the option
-        limit (Optional[int]): Optional maximum number of contracts to return
+        limit (Optional[int]): Optional maximum number of contracts to return (per page, up to 10000)
+        page_token (Optional[str]): Optional token from a previous response's next_page_token to fetch the next page
+        output_format (str): "text" for a formatted string (default) or "json" for structured records
     
     Returns:
         str: Formatted string containing option contract metadata including:
@@ -1431,6 +2163,9 @@ async def get_option_contracts(
             - Open Interest and Close Price
             - Underlying Asset Information ('underlying_asset_id', 'underlying_symbol', 'underlying_name', 'underlying_exchange')
             - Trading Status (Tradable/Non-tradable)
+        dict: When output_format is "json", {"underlying_symbol", "contracts": [...], "total",
+            "next_page_token"} with one typed record per contract (no display cap),
+            or {"error": message, "rate_limited": True if throttled} on failure
     
     Note:
         This endpoint returns contract specifications and static data. For real-time pricing
@@ -1439,11 +2174,15 @@ async def get_option_contracts(
         For month-based queries, use expiration_month and expiration_year instead of expiration_date.
         For week-based queries, use expiration_week_start to find all contracts expiring in that week.
         The function will check all dates from Monday through Sunday of that week.
+        For range queries, use expiration_date_gte/expiration_date_lte and page through the results
+        with page_token (json output returns next_page_token).
         
         When more than 500 contracts are found, a guidance message is displayed instead of 
         overwhelming output to help users narrow their search criteria.
     """
     try:
+        as_json = _is_json_output(output_format)
+        
         # Determine the appropriate expiration filtering strategy
         use_specific_date = expiration_date is not None
         use_month_filter = expiration_month is not None and expiration_year is not None
@@ -1457,16 +2196,21 @@ async def get_option_contracts(
         request = GetOptionContractsRequest(
             underlying_symbols=[underlying_symbol],
             expiration_date=request_expiration_date,
+            expiration_date_gte=expiration_date_gte,
+            expiration_date_lte=expiration_date_lte,
             strike_price_gte=strike_price_gte,
             strike_price_lte=strike_price_lte,
             type=type,
             status=status,
             root_symbol=root_symbol,
-            limit=limit if limit else 1000  # Default to 1000 to get more comprehensive results
+            limit=limit if limit else 1000,  # Default to 1000 to get more comprehensive results
+            page_token=page_token
         )
         
         # Get the option contracts
-        response = trade_client.get_option_contracts(request)
+        response = await _run_blocking(trade_client.get_option_contracts, request)
+        if as_json and (not response or not response.option_contracts):
+            return {"underlying_symbol": underlying_symbol, "contracts": [], "total": 0, "next_page_token": None}
         
         if not response or not response.option_contracts:
             return f"No option contracts found for {underlying_symbol} matching the criteria."
@@ -1479,7 +2223,7 @@ async def get_option_contracts(
                 if contract.expiration_date.month == expiration_month and contract.expiration_date.year == expiration_year
             ]
             
-            if not contracts_to_display:
+            if not contracts_to_display and not as_json:
                 month_name = date(expiration_year, expiration_month, 1).strftime("%B")
                 return f"No option contracts found for {underlying_symbol} expiring in {month_name} {expiration_year}."
         
@@ -1497,9 +2241,18 @@ async def get_option_contracts(
                 if week_start <= contract.expiration_date <= week_end
             ]
             
-            if not contracts_to_display:
+            if not contracts_to_display and not as_json:
                 return f"No option contracts found for {underlying_symbol} expiring during the week of {week_start.strftime('%B %d, %Y')}."
         
+        if as_json:
+            contracts_to_display.sort(key=lambda x: (x.expiration_date, float(x.strike_price)))
+            return {
+                "underlying_symbol": underlying_symbol,
+                "contracts": [_option_contract_to_record(contract) for contract in contracts_to_display],
+                "total": len(contracts_to_display),
+                "next_page_token": response.next_page_token,
+            }
+        
         # Format the response
         if use_month_filter:
             month_name = date(expiration_year, expiration_month, 1).strftime("%B")
@@ -1561,6 +2314,8 @@ async def get_option_contracts(
         return result
         
     except Exception as e:
+        if output_format == "json":
+            return _error_record(f"Error fetching option contracts: {str(e)}", e)
         return f"Error fetching option contracts: {str(e)}"
 
 @mcp.tool()
@@ -1598,8 +2353,7 @@ async def get_option_latest_quote(
         )
         
         # Get the latest quote
-        quotes = option_historical_data_client.get_option_latest_quote(request)
-        
+        quotes = await _run_blocking(option_historical_data_client.get_option_latest_quote, request)
         if symbol in quotes:
             quote = quotes[symbol]
             return f"""
@@ -1623,7 +2377,11 @@ async def get_option_latest_quote(
 
 
 @mcp.tool()
-async def get_option_snapshot(symbol_or_symbols: Union[str, List[str]], feed: Optional[OptionsFeed] = None) -> str:
+async def get_option_snapshot(
+    symbol_or_symbols: Union[str, List[str]],
+    feed: Optional[OptionsFeed] = None,
+    output_format: str = "text"
+) -> Union[str, Dict[str, Any]]:
     """
     Retrieves comprehensive snapshots of option contracts including latest trade, quote, implied volatility, and Greeks.
     This endpoint provides a complete view of an option's current market state and theoretical values.
@@ -1633,6 +2391,7 @@ async def get_option_snapshot(symbol_or_symbols: Union[str, List[str]], feed: Op
             (e.g., 'AAPL250613P00205000')
         feed (Optional[OptionsFeed]): The source feed of the data (opra or indicative).
             Default: opra if the user has the options subscription, indicative otherwise.
+        output_format (str): "text" for a formatted string (default) or "json" for structured records
     
     Returns:
         str: Formatted string containing a comprehensive snapshot including:
@@ -1655,8 +2414,13 @@ async def get_option_snapshot(symbol_or_symbols: Union[str, List[str]], feed: Op
                 * Rho (interest rate sensitivity)
                 * Theta (time decay)
                 * Vega (volatility sensitivity)
+        dict: When output_format is "json", {"snapshots": {symbol: record or None}} where each record
+            holds the latest quote/trade, the unrounded implied volatility (decimal) and the Greeks,
+            or {"error": message, "rate_limited": True if throttled} on failure
     """
     try:
+        as_json = _is_json_output(output_format)
+        
         # Create snapshot request
         request = OptionSnapshotRequest(
             symbol_or_symbols=symbol_or_symbols,
@@ -1664,77 +2428,127 @@ async def get_option_snapshot(symbol_or_symbols: Union[str, List[str]], feed: Op
         )
         
         # Get snapshots
-        snapshots = option_historical_data_client.get_option_snapshot(request)
+        snapshots = await _run_blocking(option_historical_data_client.get_option_snapshot, request)
+        # Handle both single symbol and list of symbols
+        symbols = [symbol_or_symbols] if isinstance(symbol_or_symbols, str) else symbol_or_symbols
+        
+        if as_json:
+            return {
+                "snapshots": {
+                    symbol: _option_snapshot_to_record(symbol, snapshots[symbol]) if snapshots.get(symbol) is not None else None
+                    for symbol in symbols
+                }
+            }
         
         # Format the response
         result = "Option Snapshots:\n"
         result += "================\n\n"
         
-        # Handle both single symbol and list of symbols
-        symbols = [symbol_or_symbols] if isinstance(symbol_or_symbols, str) else symbol_or_symbols
-        
         for symbol in symbols:
             snapshot = snapshots.get(symbol)
             if snapshot is None:
                 result += f"No data available for {symbol}\n"
                 continue
                 
-            result += f"Symbol: {symbol}\n"
-            result += "-----------------\n"
-            
-            # Latest Quote
-            if snapshot.latest_quote:
-                quote = snapshot.latest_quote
-                result += f"Latest Quote:\n"
-                result += f"  Bid Price: ${quote.bid_price:.6f}\n"
-                result += f"  Bid Size: {quote.bid_size}\n"
-                result += f"  Bid Exchange: {quote.bid_exchange}\n"
-                result += f"  Ask Price: ${quote.ask_price:.6f}\n"
-                result += f"  Ask Size: {quote.ask_size}\n"
-                result += f"  Ask Exchange: {quote.ask_exchange}\n"
-                if quote.conditions:
-                    result += f"  Conditions: {quote.conditions}\n"
-                if quote.tape:
-                    result += f"  Tape: {quote.tape}\n"
-                result += f"  Timestamp: {quote.timestamp.strftime('%Y-%m-%d %H:%M:%S.%f %Z')}\n"
-            
-            # Latest Trade
-            if snapshot.latest_trade:
-                trade = snapshot.latest_trade
-                result += f"Latest Trade:\n"
-                result += f"  Price: ${trade.price:.6f}\n"
-                result += f"  Size: {trade.size}\n"
-                if trade.exchange:
-                    result += f"  Exchange: {trade.exchange}\n"
-                if trade.conditions:
-                    result += f"  Conditions: {trade.conditions}\n"
-                if trade.tape:
-                    result += f"  Tape: {trade.tape}\n"
-                if trade.id:
-                    result += f"  Trade ID: {trade.id}\n"
-                result += f"  Timestamp: {trade.timestamp.strftime('%Y-%m-%d %H:%M:%S.%f %Z')}\n"
-            
-            # Implied Volatility
-            if snapshot.implied_volatility is not None:
-                result += f"Implied Volatility: {snapshot.implied_volatility:.2%}\n"
-            
-            # Greeks
-            if snapshot.greeks:
-                greeks = snapshot.greeks
-                result += f"Greeks:\n"
-                result += f"  Delta: {greeks.delta:.4f}\n"
-                result += f"  Gamma: {greeks.gamma:.4f}\n"
-                result += f"  Rho: {greeks.rho:.4f}\n"
-                result += f"  Theta: {greeks.theta:.4f}\n"
-                result += f"  Vega: {greeks.vega:.4f}\n"
-            
+            result += _format_option_snapshot(symbol, snapshot)
             result += "\n"
         
         return result
         
     except Exception as e:
+        if output_format == "json":
+            return _error_record(f"Error retrieving option snapshots: {str(e)}", e)
         return f"Error retrieving option snapshots: {str(e)}"
 
+@mcp.tool()
+async def get_option_chain(
+    underlying_symbol: str,
+    type: Optional[ContractType] = None,
+    expiration_date: Optional[date] = None,
+    expiration_date_gte: Optional[date] = None,
+    expiration_date_lte: Optional[date] = None,
+    strike_price_gte: Optional[float] = None,
+    strike_price_lte: Optional[float] = None,
+    feed: Optional[OptionsFeed] = None,
+    output_format: str = "text"
+) -> Union[str, Dict[str, Any]]:
+    """
+    Retrieves snapshots (latest quote, latest trade, implied volatility and Greeks) for every option
+    contract of an underlying symbol in a single paginated request, using Alpaca's option chain endpoint.
+    
+    Args:
+        underlying_symbol (str): The symbol of the underlying asset (e.g., 'AAPL')
+        type (Optional[ContractType]): Optional contract type filter (CALL or PUT)
+        expiration_date (Optional[date]): Optional exact expiration date
+        expiration_date_gte (Optional[date]): Optional earliest expiration date (inclusive)
+        expiration_date_lte (Optional[date]): Optional latest expiration date (inclusive)
+        strike_price_gte (Optional[float]): Optional minimum strike price
+        strike_price_lte (Optional[float]): Optional maximum strike price
+        feed (Optional[OptionsFeed]): The source feed of the data (opra or indicative).
+            Default: opra if the user has the options subscription, indicative otherwise.
+        output_format (str): "text" for a formatted string (default) or "json" for structured records
+    
+    Returns:
+        str: Formatted string with one snapshot per contract, sorted by expiration and strike
+        dict: When output_format is "json", {"underlying_symbol", "snapshots": {symbol: record}, "total"}
+            where each record is a get_option_snapshot record extended with the root_symbol,
+            expiration_date, type and strike_price parsed from the contract symbol,
+            or {"error": message, "rate_limited": True if throttled} on failure
+    
+    Note:
+        When more than 500 contracts are found in text mode, a guidance message is displayed instead
+        of overwhelming output to help users narrow their search criteria.
+    """
+    try:
+        as_json = _is_json_output(output_format)
+        
+        request = OptionChainRequest(
+            underlying_symbol=underlying_symbol,
+            feed=feed,
+            type=type,
+            expiration_date=expiration_date,
+            expiration_date_gte=expiration_date_gte,
+            expiration_date_lte=expiration_date_lte,
+            strike_price_gte=strike_price_gte,
+            strike_price_lte=strike_price_lte
+        )
+        
+        # The SDK follows the next_page_token internally, so this is one logical request
+        chain = await _run_blocking(option_historical_data_client.get_option_chain, request)
+        if as_json:
+            snapshots = {}
+            for symbol, snapshot in (chain or {}).items():
+                record = _option_snapshot_to_record(symbol, snapshot)
+                record.update(_parse_option_symbol(symbol) or {})
+                snapshots[symbol] = record
+            return {"underlying_symbol": underlying_symbol, "snapshots": snapshots, "total": len(snapshots)}
+        
+        if not chain:
+            return f"No option chain data found for {underlying_symbol} matching the criteria."
+        
+        # Sort by expiration date and strike price (both encoded in the OCC symbol)
+        symbols = sorted(chain.keys(), key=lambda x: (x[-15:-9], x[-8:]))
+        
+        result = f"Option Chain for {underlying_symbol}:\n"
+        result += "========================\n\n"
+        
+        max_display_contracts = 500  # Threshold to limit display and show guidance message instead
+        if len(symbols) > max_display_contracts:
+            result += f"Found {len(symbols)} contracts. For easier viewing, please specify an expiration date range, strike price range or contract type."
+            return result
+        
+        for symbol in symbols:
+            result += _format_option_snapshot(symbol, chain[symbol])
+            result += "\n"
+        
+        result += f"Total contracts found for {underlying_symbol}: {len(symbols)}"
+        return result
+        
+    except Exception as e:
+        if output_format == "json":
+            return _error_record(f"Error retrieving option chain: {str(e)}", e)
+        return f"Error retrieving option chain: {str(e)}"
+
 # ============================================================================
 # Options Trading Helper Functions
 # ============================================================================
@@ -2106,8 +2920,7 @@ async def place_option_market_order(
         )
         
         # Submit order
-        order = trade_client.submit_order(order_data)
-        
+        order = await _run_blocking(trade_client.submit_order, order_data)
         # Format and return response
         return _format_option_order_response(order, order_class, order_legs)
         
@@ -2203,6 +3016,16 @@ if __name__ == "__main__":
     # Setup transport configuration based on command line arguments
     transport_config = setup_transport_config(args)
     
+    # Clients are built lazily, so check credentials up front when running as a server
+    _require_credentials()
+    
+    if args.max_concurrency is not None:
+        configure_concurrency(args.max_concurrency)
+    if args.rate_limit is not None:
+        configure_rate_limit(args.rate_limit)
+    if args.latency_target is not None:
+        configure_latency_target(args.latency_target)
+    
     try:
         # Run server with the specified transport
         if args.transport == "http":
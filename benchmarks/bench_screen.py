@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+PutScreenPro Screening Benchmark
+Screens synthetic universes end to end, fully offline, and reports wall time,
+upstream API calls, response parse time and peak memory.
+
+Every request the MCP server makes goes through the real alpaca-py clients to a
+replay of recorded responses (see benchmarks/replay.py). For each universe the
+responses are recorded from a deterministic SyntheticMarket in an untimed
+warm-up screen; the timed runs then replay them, each with a fresh client and
+cold caches. Peak memory is measured with tracemalloc in a separate run, so its
+overhead does not skew the timings.
+
+Usage:
+    python -m benchmarks.bench_screen --universe 20,200,2000 --expirations 8 --strikes 100
+    python -m benchmarks.bench_screen --universe 200 --mode threads --latency 0.05 --json results.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# The MCP server only checks that credentials are set; replayed requests never use them
+os.environ.setdefault("ALPACA_API_KEY", "replay")
+os.environ.setdefault("ALPACA_SECRET_KEY", "replay")
+
+import putscreenpro_engine as engine
+from benchmarks.replay import FixtureStore, ReplayTransport, install
+from benchmarks.synthetic_market import SyntheticMarket, universe_symbols
+
+logger = logging.getLogger("benchmarks.bench_screen")
+
+# How symbols are fanned out, mirroring the app's processing options
+MODES = ("async", "threads", "sequential")
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(prog="bench_screen", description="Offline end-to-end screening benchmark")
+    parser.add_argument("--universe", default="20,200",
+                        help="Comma-separated universe sizes in symbols (default: 20,200)")
+    parser.add_argument("--symbols", help="Comma-separated symbols to screen instead of synthetic S0000... tickers")
+    parser.add_argument("--expirations", type=int, default=8, help="Weekly expirations per symbol (default: 8)")
+    parser.add_argument("--strikes", type=int, default=100, help="Strikes per expiration (default: 100)")
+    parser.add_argument("--seed", type=int, default=7, help="Synthetic market seed (default: 7)")
+    parser.add_argument("--as-of", type=date.fromisoformat,
+                        help="Date to screen as of, YYYY-MM-DD (default: today, or the day a fixtures file was recorded)")
+    parser.add_argument("--mode", choices=MODES, default="async",
+                        help="async: the client's event loop (app default and CLI); threads: a thread pool "
+                             "over process_symbol_parallel; sequential: one symbol at a time")
+    parser.add_argument("--max-dte", type=int, default=45, help="Maximum days to expiration (default: 45)")
+    parser.add_argument("--max-pitm", type=float, default=20, help="Maximum probability ITM %% (default: 20)")
+    parser.add_argument("--min-oi", type=int, default=10, help="Minimum open interest (default: 10)")
+    parser.add_argument("--min-volume", type=int, default=0, help="Minimum volume (default: 0)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per universe; medians are reported (default: 3)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated seconds per upstream request (default: 0)")
+    parser.add_argument("--rate-limit", type=int, default=0,
+                        help="Upstream requests per minute (default: 0, unlimited; Alpaca's basic plan is 200)")
+    parser.add_argument("--config", help="Configuration file (default: the config.json next to putscreenpro_engine.py)")
+    parser.add_argument("--fixtures", help="Replay only the responses in this fixtures file (no synthetic market)")
+    parser.add_argument("--save-fixtures", help="Write the recorded responses to this file (last universe only)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak memory run")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log screening progress to stderr")
+    return parser.parse_args(argv)
+
+def configure_engine(args: argparse.Namespace) -> None:
+    """Load the configuration and turn off everything that keeps state between runs"""
+    engine.config.clear()
+    engine.config.update(engine.load_config(args.config))
+    engine.config.setdefault('streaming', {})['enabled'] = False
+    engine.config.setdefault('contract_store', {})['enabled'] = False
+    processing = engine.config.setdefault('processing', {})
+    processing['verify_account_on_start'] = False
+    processing['rate_limit_per_minute'] = args.rate_limit if args.rate_limit > 0 else 10 ** 9
+
+def run_screen(client: engine.MCPAlpacaClient, symbols: List[str], args: argparse.Namespace) -> engine.ScreenUniverse:
+    """Screen symbols the way the app does in the given mode"""
+    if args.mode == "async":
+        return engine.screen(client, symbols, args.max_dte, args.max_pitm)
+
+    results = {}
+    if args.mode == "threads":
+        max_workers = engine.get_config_value(engine.config, 'processing.max_parallel_workers', 4)
+        with ThreadPoolExecutor(max_workers=min(len(symbols), max_workers)) as executor:
+            future_to_symbol = {
+                executor.submit(client.process_symbol_parallel, symbol, args.max_dte, args.max_pitm, 0, 0): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(future_to_symbol):
+                try:
+                    results[future_to_symbol[future]] = future.result()
+                except Exception as e:
+                    logger.error(f"Error screening {future_to_symbol[future]}: {str(e)}")
+    else:
+        for symbol in symbols:
+            try:
+                results[symbol] = client.process_symbol_parallel(symbol, args.max_dte, args.max_pitm, 0, 0)
+            except Exception as e:
+                logger.error(f"Error screening {symbol}: {str(e)}")
+    return engine.ScreenUniverse(engine.combine_results(list(results.values())), list(results),
+                                 args.max_dte, args.max_pitm)
+
+def run_once(transport: ReplayTransport, symbols: List[str], args: argparse.Namespace) -> Dict[str, Any]:
+    """Screen and rank once with a fresh client and cold caches"""
+    client = engine.MCPAlpacaClient()
+    try:
+        transport.reset_stats()
+        started = time.perf_counter()
+        universe = run_screen(client, symbols, args)
+        screened = time.perf_counter()
+        # The app's ranking: filter the universe in memory, then each ticker's best contract
+        ranked = engine.best_per_ticker(
+            universe.filter(symbols, args.max_dte, args.max_pitm, args.min_oi, args.min_volume)
+        )
+        finished = time.perf_counter()
+    finally:
+        client._loop.call_soon_threadsafe(client._loop.stop)
+    return {
+        "wall_seconds": finished - started,
+        "screen_seconds": screened - started,
+        "rank_seconds": finished - screened,
+        "parse_seconds": transport.parse_seconds,
+        "upstream_calls": sum(transport.calls.values()),
+        "calls_by_endpoint": dict(sorted(transport.calls.items())),
+        "upstream_errors": transport.errors,
+        "unrecorded_requests": transport.recorded,
+        "contracts_scored": len(universe.frame),
+        "tickers_ranked": len(ranked),
+        "failed_symbols": len(universe.missing_symbols(symbols)),
+    }
+
+def run_universe(transport: ReplayTransport, symbols: List[str], args: argparse.Namespace) -> Dict[str, Any]:
+    """Warm up the fixtures, then time args.repeat runs and measure peak memory once"""
+    if transport.market is not None:
+        started = time.perf_counter()
+        run_once(transport, symbols, args)
+        logger.info(f"Recorded {len(transport.store)} responses for {len(symbols)} symbols "
+                    f"in {time.perf_counter() - started:.1f}s")
+
+    runs = [run_once(transport, symbols, args) for _ in range(max(1, args.repeat))]
+    result = dict(runs[-1])
+    for field in ("wall_seconds", "screen_seconds", "rank_seconds", "parse_seconds"):
+        result[field] = statistics.median(run[field] for run in runs)
+
+    result["peak_memory_mb"] = None
+    if not args.no_memory:
+        tracemalloc.start()
+        try:
+            run_once(transport, symbols, args)
+            result["peak_memory_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+
+    result.update({
+        "symbols": len(symbols),
+        "mode": args.mode,
+        "fixtures": len(transport.store),
+        "fixtures_mb": transport.store.compressed_bytes / (1024 * 1024),
+    })
+    return result
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    """Print one row per universe"""
+    header = (f"{'symbols':>8} {'mode':>10} {'wall s':>8} {'screen s':>9} {'rank s':>7} {'parse s':>8} "
+              f"{'calls':>7} {'scored':>8} {'ranked':>7} {'failed':>7} {'peak MB':>8}")
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        peak = f"{result['peak_memory_mb']:.1f}" if result["peak_memory_mb"] is not None else "-"
+        print(f"{result['symbols']:>8} {result['mode']:>10} {result['wall_seconds']:>8.2f} "
+              f"{result['screen_seconds']:>9.2f} {result['rank_seconds']:>7.3f} {result['parse_seconds']:>8.2f} "
+              f"{result['upstream_calls']:>7} {result['contracts_scored']:>8} {result['tickers_ranked']:>7} "
+              f"{result['failed_symbols']:>7} {peak:>8}")
+    print()
+    for result in results:
+        calls = ", ".join(f"{endpoint} {count}" for endpoint, count in result["calls_by_endpoint"].items())
+        print(f"{result['symbols']:>8} symbols: {calls}")
+        if result["unrecorded_requests"] or result["upstream_errors"]:
+            print(f"{'':>8} warning: {result['unrecorded_requests']} requests missed the fixtures and "
+                  f"{result['upstream_errors']} failed; timings include them")
+    print("\nparse s is time spent in the SDK decoding and parsing responses, summed over worker threads.")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_arguments(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        stream=sys.stderr,
+        force=True  # Importing the MCP server already configured logging for itself
+    )
+    configure_engine(args)
+
+    if args.fixtures:
+        store = FixtureStore.load(args.fixtures)
+        # Recorded requests carry dates relative to the recording day, so screen as of that day
+        as_of = store.as_of or args.as_of or date.today()
+        transport = ReplayTransport(store, latency=args.latency)
+        # A fixtures file defines its own universe: the symbols it has stock quotes for
+        recorded_symbols = sorted({
+            symbol for method, path, params in store.keys() if path == "/stocks/quotes/latest"
+            for symbol in json.loads(params).get("symbols", "").split(",")
+        })
+        universes = [args.symbols.split(",") if args.symbols else recorded_symbols]
+    else:
+        market = SyntheticMarket(args.expirations, args.strikes, args.seed, today=args.as_of)
+        as_of = market.today
+        transport = ReplayTransport(FixtureStore(as_of), market, latency=args.latency)
+        if args.symbols:
+            universes = [engine.parse_symbols(args.symbols)]
+        else:
+            universes = [universe_symbols(int(size)) for size in args.universe.split(",")]
+    engine.pin_current_date(as_of)
+    install(transport)
+
+    results = []
+    for symbols in universes:
+        if not args.fixtures:
+            transport.store = FixtureStore(as_of)
+        logger.info(f"Benchmarking {len(symbols)} symbols ({args.mode})")
+        results.append(run_universe(transport, symbols, args))
+
+    print_results(results)
+    if args.save_fixtures:
+        transport.store.save(args.save_fixtures)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"arguments": vars(args), "results": results}, f, indent=2, default=str)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Fake Alpaca Server - Local Stand-in for Load and Scale Testing
+Serves the Alpaca trading and market data endpoints PutScreenPro uses from a
+SyntheticMarket, with configurable latency, error rate and 429 rate limiting,
+so the MCP server and the screener can be load tested without touching real
+Alpaca limits.
+
+Endpoints (trading and data share one host; their paths do not overlap):
+    GET /v2/stocks/quotes/latest              latest stock quotes
+    GET /v2/options/contracts                 option contracts (paged)
+    GET /v1beta1/options/snapshots            option snapshots by symbol
+    GET /v1beta1/options/snapshots/{symbol}   option chain (paged)
+    GET /v2/account, /v2/clock, /v2/calendar  account, market clock and calendar
+    GET /_stats                               request counts of this server
+
+Usage:
+    python -m benchmarks.fake_alpaca_server --port 8765 --latency 0.05 --error-rate 0.01 --rate-limit 200
+
+    # In another shell, point the MCP server's clients at it:
+    export TRADE_API_URL=http://127.0.0.1:8765 DATA_API_URL=http://127.0.0.1:8765
+    export ALPACA_API_KEY=fake ALPACA_SECRET_KEY=fake
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_market import MarketError, SyntheticMarket, endpoint_name
+
+# Path prefixes of the Alpaca API versions the clients call
+API_VERSIONS = ("/v2", "/v1beta1")
+
+class FakeAlpacaServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server answering Alpaca API requests from a SyntheticMarket.
+
+    Every request waits latency seconds (plus up to latency_jitter more). Requests
+    beyond rate_limit per minute get HTTP 429 with Retry-After and X-RateLimit-*
+    headers, as from Alpaca; a token bucket allows bursts of up to burst requests.
+    Of the admitted requests, error_rate fail with HTTP 500.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, market: SyntheticMarket, latency: float = 0.0, latency_jitter: float = 0.0,
+                 error_rate: float = 0.0, rate_limit: int = 0, burst: Optional[int] = None,
+                 seed: int = 7, verbose: bool = False):
+        super().__init__(address, AlpacaRequestHandler)
+        self.market = market
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.verbose = verbose
+        self._rate = rate_limit / 60.0
+        self._capacity = float(burst if burst is not None else max(1, math.ceil(self._rate)))
+        self._tokens = self._capacity
+        self._last_refill = time.monotonic()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats: Counter = Counter()
+
+    def admit(self) -> Optional[float]:
+        """Take a rate limit token; return None if admitted, else the seconds until one is available"""
+        if not self.rate_limit:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * self._rate)
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return None
+            return (1 - self._tokens) / self._rate
+
+    def rate_limit_headers(self) -> Dict[str, str]:
+        if not self.rate_limit:
+            return {}
+        with self._lock:
+            remaining = int(self._tokens)
+            reset = time.time() + (self._capacity - self._tokens) / self._rate
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(math.ceil(reset)),
+        }
+
+    def delay(self) -> float:
+        with self._lock:
+            return self.latency + self.latency_jitter * self._random.random()
+
+    def fails(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def count(self, endpoint: str, status: int) -> None:
+        with self._lock:
+            self.stats[f"{endpoint} {status}"] += 1
+
+    def summary(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(sorted(self.stats.items()))
+
+class AlpacaRequestHandler(BaseHTTPRequestHandler):
+    """Routes one HTTP request to the fake server's market"""
+
+    # Keep connections alive like the real API; the SDK reuses them through a requests.Session
+    protocol_version = "HTTP/1.1"
+    server: FakeAlpacaServer
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def _handle(self, method: str) -> None:
+        url = urlsplit(self.path)
+        if url.path == "/_stats":
+            self._send(200, self.server.summary())
+            return
+        # Discard any request body so the connection can be reused
+        if int(self.headers.get("Content-Length") or 0):
+            self.rfile.read(int(self.headers["Content-Length"]))
+
+        path = url.path
+        for version in API_VERSIONS:
+            if path.startswith(version + "/"):
+                path = path[len(version):]
+                break
+        # Repeated parameters (how requests encodes lists) are joined like the SDK's comma lists
+        params = {key: ",".join(values) for key, values in parse_qs(url.query).items()}
+        endpoint = endpoint_name(path)
+
+        delay = self.server.delay()
+        if delay:
+            time.sleep(delay)
+
+        retry_after = self.server.admit()
+        headers = self.server.rate_limit_headers()
+        if retry_after is not None:
+            headers["Retry-After"] = str(math.ceil(retry_after))
+            status, body = 429, {"code": 42910000, "message": "rate limit exceeded"}
+        elif self.server.fails():
+            status, body = 500, {"code": 50010000, "message": "internal server error"}
+        else:
+            try:
+                status, body = 200, self.server.market.handle(method, path, params)
+            except MarketError as e:
+                status, body = e.status, e.body
+        self.server.count(endpoint, status)
+        self._send(status, body, headers)
+
+    def _send(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        payload = json.dumps(body, separators=(",", ":")).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(prog="fake_alpaca_server", description="Local fake Alpaca API for load testing")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind to (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--expirations", type=int, default=30, help="Weekly expirations per symbol (default: 30)")
+    parser.add_argument("--strikes", type=int, default=200, help="Strikes per expiration (default: 200)")
+    parser.add_argument("--seed", type=int, default=7, help="Synthetic market and error seed (default: 7)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request (default: 0)")
+    parser.add_argument("--latency-jitter", type=float, default=0.0,
+                        help="Up to this many random seconds more per request (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Share of admitted requests that fail with HTTP 500 (default: 0)")
+    parser.add_argument("--rate-limit", type=int, default=0,
+                        help="Requests per minute before HTTP 429 (default: 0, unlimited; Alpaca's basic plan is 200)")
+    parser.add_argument("--burst", type=int, help="Requests allowed in a burst (default: one second's worth)")
+    parser.add_argument("--unlisted", default="",
+                        help="Comma-separated symbols to answer like unknown tickers: no quotes, no contracts")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log every request to stderr")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_arguments(argv)
+    if not 0 <= args.error_rate <= 1:
+        print("--error-rate must be between 0 and 1", file=sys.stderr)
+        return 2
+
+    market = SyntheticMarket(args.expirations, args.strikes, args.seed,
+                             unlisted=[symbol for symbol in args.unlisted.upper().split(",") if symbol])
+    server = FakeAlpacaServer(
+        (args.host, args.port), market, latency=args.latency, latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate, rate_limit=args.rate_limit, burst=args.burst, seed=args.seed,
+        verbose=args.verbose
+    )
+    url = f"http://{args.host}:{server.server_address[1]}"
+    print(f"Fake Alpaca API on {url} ({args.expirations} expirations x {args.strikes} strikes per symbol)",
+          file=sys.stderr)
+    print(f"Point the clients at it with TRADE_API_URL={url} DATA_API_URL={url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for key, count in server.summary().items():
+            print(f"{count:>8} {key}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+Offline replay of Alpaca API responses through the real alpaca-py clients.
+
+The replay clients subclass the MCP server's *Signed clients and only swap the
+HTTP round trip: JSON bodies come from a FixtureStore (responses recorded from a
+SyntheticMarket, or loaded from a fixtures file) instead of the network, and
+everything above it (paging, response parsing into SDK models) runs unchanged.
+Installed through alpaca_mcp_server._CLIENT_OVERRIDES, they are what every MCP
+tool, and so the screener, talks to.
+"""
+
+import json
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from alpaca.common.exceptions import APIError
+
+import alpaca_mcp_server as server
+from benchmarks.synthetic_market import MarketError, endpoint_name, query_params
+
+FixtureKey = Tuple[str, str, str]
+
+class FixtureStore:
+    """
+    Recorded API responses keyed by method, endpoint path and query parameters.
+
+    Bodies are kept as compressed JSON, so a replay pays for decoding the JSON
+    the way a live response would, and large universes stay small in memory.
+    as_of is the date the responses were recorded on: requests embed dates
+    derived from it (expiration windows), so a replay pins the screener to it.
+    Strike ceilings and page sizes come from the configuration, so a replay
+    also needs the configuration the fixtures were recorded with.
+    """
+
+    def __init__(self, as_of: Optional[date] = None):
+        self.as_of = as_of
+        self._bodies: Dict[FixtureKey, bytes] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+    @staticmethod
+    def key(method: str, path: str, params: Dict[str, str]) -> FixtureKey:
+        return method.upper(), path, json.dumps(params, sort_keys=True)
+
+    def keys(self):
+        return list(self._bodies)
+
+    def get(self, key: FixtureKey) -> Optional[bytes]:
+        body = self._bodies.get(key)
+        return zlib.decompress(body) if body is not None else None
+
+    def put(self, key: FixtureKey, response: Any) -> bytes:
+        body = json.dumps(response, separators=(",", ":")).encode()
+        with self._lock:
+            self._bodies[key] = zlib.compress(body, 1)
+        return body
+
+    @property
+    def compressed_bytes(self) -> int:
+        return sum(len(body) for body in self._bodies.values())
+
+    def save(self, path: str) -> None:
+        """Write the fixtures as JSON lines of {"method", "path", "params", "response"}, after an {"as_of"} line"""
+        with open(path, "w") as f:
+            if self.as_of is not None:
+                f.write(json.dumps({"as_of": self.as_of.isoformat()}) + "\n")
+            for (method, endpoint, params), body in self._bodies.items():
+                entry = {"method": method, "path": endpoint, "params": json.loads(params),
+                         "response": json.loads(zlib.decompress(body))}
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    @classmethod
+    def load(cls, path: str) -> 'FixtureStore':
+        """Read fixtures written by save (or captured from live Alpaca in the same format)"""
+        store = cls()
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    if "as_of" in entry:
+                        store.as_of = date.fromisoformat(entry["as_of"])
+                        continue
+                    store.put(cls.key(entry["method"], entry["path"], entry["params"]), entry["response"])
+        return store
+
+class ReplayTransport:
+    """
+    Serves API requests from a FixtureStore.
+
+    Requests missing from the store are answered by the fallback market (if any)
+    and recorded; without one they fail with HTTP 404. latency simulates the
+    network round trip of every request.
+    """
+
+    def __init__(self, store: FixtureStore, market=None, latency: float = 0.0):
+        self.store = store
+        self.market = market
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.calls: Counter = Counter()
+            self.recorded = 0
+            self.errors = 0
+            self.parse_seconds = 0.0
+
+    def request(self, method: str, path: str, params: Dict[str, str]) -> Any:
+        started = time.perf_counter()
+        try:
+            key = FixtureStore.key(method, path, params)
+            body = self.store.get(key)
+            recorded = body is None
+            try:
+                if recorded:
+                    if self.market is None:
+                        raise MarketError(404, f"no recorded response for {method} {path} {params}")
+                    body = self.store.put(key, self.market.handle(method, path, params))
+            except MarketError as e:
+                with self._lock:
+                    self.calls[endpoint_name(path)] += 1
+                    self.errors += 1
+                raise _api_error(e.status, e.body)
+            with self._lock:
+                self.calls[endpoint_name(path)] += 1
+                self.recorded += recorded
+            if self.latency:
+                time.sleep(self.latency)
+        finally:
+            self._local.transport_seconds = getattr(self._local, "transport_seconds", 0.0) + time.perf_counter() - started
+        # Decoding the body is part of parsing the response, as with a live requests.Response.json()
+        return json.loads(body)
+
+    def timed(self, method):
+        """Wrap an SDK client method to add its time, minus the transport's, to parse_seconds"""
+        local = self._local
+
+        def timed_method(*args, **kwargs):
+            local.transport_seconds = 0.0
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started - local.transport_seconds
+                with self._lock:
+                    self.parse_seconds += elapsed
+
+        return timed_method
+
+def _api_error(status: int, body: Dict[str, Any]) -> APIError:
+    """Build the APIError alpaca-py raises for an HTTP error response"""
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(body).encode()
+    return APIError(response.text, requests.HTTPError(response=response))
+
+class _ReplayMixin:
+    """Replaces the HTTP round trip of an alpaca-py REST client with a ReplayTransport"""
+
+    _transport: ReplayTransport
+
+    def _request(self, method, path, data=None, base_url=None, api_version=None):
+        # Reached through the clients' rate limited get/post/..., like a live HTTP request
+        return self._transport.request(method, path, query_params(data))
+
+class ReplayTradingClient(_ReplayMixin, server.TradingClientSigned): pass
+class ReplayStockDataClient(_ReplayMixin, server.StockHistoricalDataClientSigned): pass
+class ReplayOptionDataClient(_ReplayMixin, server.OptionHistoricalDataClientSigned): pass
+
+# SDK methods behind the screener's tools whose parse time is measured
+TIMED_METHODS = {
+    "trade_client": ("get_option_contracts",),
+    "stock_historical_data_client": ("get_stock_latest_quote",),
+    "option_historical_data_client": ("get_option_snapshot", "get_option_chain"),
+}
+
+def install(transport: ReplayTransport) -> None:
+    """
+    Point the MCP server's REST clients at the transport.
+
+    Must run before the server's first tool call; the server builds its clients once.
+    """
+    clients = {
+        "trade_client": ReplayTradingClient("replay", "replay", paper=True),
+        "stock_historical_data_client": ReplayStockDataClient("replay", "replay"),
+        "option_historical_data_client": ReplayOptionDataClient("replay", "replay"),
+    }
+    for name, client in clients.items():
+        client._transport = transport
+        for method in TIMED_METHODS[name]:
+            setattr(client, method, transport.timed(getattr(client, method)))
+        server._CLIENT_OVERRIDES[name] = client
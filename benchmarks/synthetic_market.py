@@ -0,0 +1,394 @@
+"""
+Synthetic Alpaca market data for offline benchmarks and load tests.
+
+SyntheticMarket answers the Alpaca REST endpoints PutScreenPro uses with raw
+JSON in the same shape the real API returns, so the alpaca-py clients parse it
+exactly as they would a live response. Every symbol is priced deterministically
+from its name and the seed: the same symbol, seed and day always produce the
+same quotes, contracts and snapshots, and any ticker (AAPL or S0042) works
+unless it is marked unlisted.
+"""
+
+import math
+import zlib
+from datetime import date, datetime, time, timedelta, timezone
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+RISK_FREE_RATE = 0.05
+
+# Listed strike increments; each underlying uses the smallest one that spans its strike range
+STRIKE_INCREMENTS = (0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0)
+
+# Largest page the contracts endpoint serves, as on Alpaca
+MAX_CONTRACTS_PAGE = 10000
+
+def query_params(data: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Normalize SDK request fields to the string query parameters an HTTP server would see"""
+    params = {}
+    for key, value in (data or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            value = ",".join(str(item) for item in value)
+        elif isinstance(value, Enum):
+            value = value.value
+        params[key] = str(value)
+    return params
+
+def endpoint_name(path: str) -> str:
+    """Group request paths by endpoint, e.g. every /options/snapshots/{underlying} as the chain endpoint"""
+    if path.startswith("/options/snapshots/"):
+        return "/options/snapshots/{underlying}"
+    return path
+
+def universe_symbols(count: int) -> List[str]:
+    """Synthetic tickers S0000, S0001, ... for a universe of count symbols"""
+    return [f"S{index:04d}" for index in range(count)]
+
+def _normal_cdf(x: float) -> float:
+    return 0.5 * math.erfc(-x / math.sqrt(2.0))
+
+def _normal_pdf(x: float) -> float:
+    return math.exp(-0.5 * x * x) / math.sqrt(2.0 * math.pi)
+
+def _occ_symbol(underlying: str, expiration: date, contract_type: str, strike: float) -> str:
+    return f"{underlying}{expiration:%y%m%d}{contract_type[0].upper()}{int(round(strike * 1000)):08d}"
+
+def _parse_occ_symbol(symbol: str) -> Optional[Tuple[str, date, str, float]]:
+    if len(symbol) < 16 or symbol[-9] not in "CP":
+        return None
+    try:
+        expiration = datetime.strptime(symbol[-15:-9], "%y%m%d").date()
+        strike = int(symbol[-8:]) / 1000
+    except ValueError:
+        return None
+    return symbol[:-15], expiration, "put" if symbol[-9] == "P" else "call", strike
+
+def _timestamp(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+class MarketError(Exception):
+    """An API error response: HTTP status plus Alpaca's {"code", "message"} body"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.body = {"code": status * 100000, "message": message}
+
+class SyntheticMarket:
+    """
+    Deterministic stand-in for the Alpaca trading and market data APIs.
+
+    Each underlying lists weekly expirations (every Friday) and, per expiration,
+    puts and calls at strikes_per_expiration strikes centered on the stock price.
+    Option prices follow Black-Scholes with a per-symbol volatility, a downside
+    skew and a term structure; quotes, open interest and volume vary per contract.
+    Like Alpaca's indicative feed, a share of the snapshots (missing_greeks_ratio)
+    come without implied volatility and Greeks. Unlisted symbols behave like
+    unknown tickers on Alpaca: no quotes and no option contracts.
+    """
+
+    def __init__(self, expirations: int = 8, strikes_per_expiration: int = 100, seed: int = 7,
+                 missing_greeks_ratio: float = 0.1, today: Optional[date] = None,
+                 unlisted: Iterable[str] = ()):
+        if expirations < 1 or strikes_per_expiration < 1:
+            raise ValueError("expirations and strikes_per_expiration must be at least 1")
+        self.expirations = expirations
+        self.strikes_per_expiration = strikes_per_expiration
+        self.seed = seed
+        self.missing_greeks_ratio = missing_greeks_ratio
+        self.unlisted = frozenset(unlisted)
+        self.today = today or date.today()
+        self.as_of = datetime.combine(self.today, time(15, 30), tzinfo=timezone.utc)
+        # Generating thousands of contracts per request adds up; format the shared fields once
+        self._quote_time = _timestamp(self.as_of)
+        self._trade_times = [_timestamp(self.as_of - timedelta(minutes=minutes)) for minutes in range(60)]
+        self._bar_time = _timestamp(datetime.combine(self.today, time(4, 0), tzinfo=timezone.utc))
+        self._previous_day = (self.today - timedelta(days=1)).isoformat()
+        self._underlyings: Dict[str, Tuple[float, float]] = {}
+
+    # Deterministic pseudo-random numbers
+
+    def _uniforms(self, key: str, count: int) -> List[float]:
+        """count uniform numbers in [0, 1) fixed by the key and the seed"""
+        digest = zlib.crc32(f"{self.seed}:{key}".encode())
+        return [(((digest ^ (index * 0x9E3779B9)) * 2654435761) & 0xFFFFFFFF) / 2 ** 32 for index in range(count)]
+
+    # Underlyings
+
+    def _underlying(self, symbol: str) -> Tuple[float, float]:
+        """Stock price, log-uniform between $5 and $800, and base volatility of a symbol"""
+        underlying = self._underlyings.get(symbol)
+        if underlying is None:
+            price, volatility = self._uniforms(symbol, 2)
+            underlying = (round(5.0 * math.exp(price * math.log(160.0)), 2), 0.2 + 0.7 * volatility)
+            self._underlyings[symbol] = underlying
+        return underlying
+
+    def stock_price(self, symbol: str) -> float:
+        return self._underlying(symbol)[0]
+
+    def base_volatility(self, symbol: str) -> float:
+        return self._underlying(symbol)[1]
+
+    def expiration_dates(self) -> List[date]:
+        first_friday = self.today + timedelta(days=(4 - self.today.weekday()) % 7 or 7)
+        return [first_friday + timedelta(weeks=week) for week in range(self.expirations)]
+
+    def strikes(self, symbol: str) -> List[float]:
+        """strikes_per_expiration listed strikes around the stock price, spanning roughly +/-50%"""
+        price = self.stock_price(symbol)
+        increment = next(
+            (step for step in STRIKE_INCREMENTS if step * self.strikes_per_expiration >= price),
+            STRIKE_INCREMENTS[-1]
+        )
+        center = round(price / increment)
+        first = max(1, center - self.strikes_per_expiration // 2)
+        return [(first + offset) * increment for offset in range(self.strikes_per_expiration)]
+
+    def _volatility(self, symbol: str, strike: float, years: float) -> float:
+        log_moneyness = math.log(strike / self.stock_price(symbol))
+        skew = 0.8 * max(0.0, -log_moneyness) + 0.3 * log_moneyness * log_moneyness
+        term = 1.0 + 0.15 / math.sqrt(max(years, 1 / 365) * 52)
+        return self.base_volatility(symbol) * term * (1.0 + skew)
+
+    def _price_and_greeks(self, symbol: str, expiration: date, contract_type: str,
+                          strike: float) -> Tuple[float, float, Dict[str, float]]:
+        """Black-Scholes price, implied volatility and Greeks of one contract"""
+        stock_price = self.stock_price(symbol)
+        years = max((expiration - self.today).days, 1) / 365.0
+        sigma = self._volatility(symbol, strike, years)
+        root = math.sqrt(years)
+        d1 = (math.log(stock_price / strike) + (RISK_FREE_RATE + 0.5 * sigma * sigma) * years) / (sigma * root)
+        d2 = d1 - sigma * root
+        discount = math.exp(-RISK_FREE_RATE * years)
+        gamma = _normal_pdf(d1) / (stock_price * sigma * root)
+        vega = stock_price * _normal_pdf(d1) * root / 100
+        decay = -stock_price * _normal_pdf(d1) * sigma / (2 * root)
+        if contract_type == "put":
+            price = strike * discount * _normal_cdf(-d2) - stock_price * _normal_cdf(-d1)
+            delta = _normal_cdf(d1) - 1
+            theta = (decay + RISK_FREE_RATE * strike * discount * _normal_cdf(-d2)) / 365
+            rho = -strike * years * discount * _normal_cdf(-d2) / 100
+        else:
+            price = stock_price * _normal_cdf(d1) - strike * discount * _normal_cdf(d2)
+            delta = _normal_cdf(d1)
+            theta = (decay - RISK_FREE_RATE * strike * discount * _normal_cdf(d2)) / 365
+            rho = strike * years * discount * _normal_cdf(d2) / 100
+        greeks = {"delta": delta, "gamma": gamma, "rho": rho, "theta": theta, "vega": vega}
+        return max(price, 0.0), sigma, greeks
+
+    # Records in Alpaca's raw JSON shapes
+
+    def stock_quote(self, symbol: str) -> Dict[str, Any]:
+        price = self.stock_price(symbol)
+        half_spread = max(0.01, round(price * 0.0002, 2))
+        ask_size, bid_size = self._uniforms(symbol + ":quote", 2)
+        return {
+            "t": self._quote_time, "ax": "V", "ap": round(price + half_spread, 2), "as": 1 + int(9 * ask_size),
+            "bx": "V", "bp": round(price - half_spread, 2), "bs": 1 + int(9 * bid_size), "c": ["R"], "z": "C"
+        }
+
+    def option_contract(self, symbol: str, expiration: date, contract_type: str, strike: float) -> Dict[str, Any]:
+        option_symbol = _occ_symbol(symbol, expiration, contract_type, strike)
+        price, _, _ = self._price_and_greeks(symbol, expiration, contract_type, strike)
+        # Open interest concentrates near the money and thins out in the wings
+        distance = abs(math.log(strike / self.stock_price(symbol)))
+        open_interest = int(3000 * math.exp(-8 * distance) * self._uniforms(option_symbol + ":oi", 1)[0])
+        return {
+            "id": f"{zlib.crc32(option_symbol.encode()):08x}-0000-4000-8000-{self.seed:012d}",
+            "symbol": option_symbol,
+            "name": f"{symbol} {expiration:%b %d %Y} {strike:g} {contract_type.title()}",
+            "status": "active", "tradable": True, "expiration_date": expiration.isoformat(),
+            "root_symbol": symbol, "underlying_symbol": symbol,
+            "underlying_asset_id": f"{zlib.crc32(symbol.encode()):08x}-0000-4000-8000-000000000000",
+            "type": contract_type, "style": "american", "strike_price": f"{strike:g}", "size": "100",
+            "open_interest": str(open_interest), "open_interest_date": self._previous_day,
+            "close_price": f"{max(0.01, round(price, 2)):.2f}", "close_price_date": self._previous_day
+        }
+
+    def option_snapshot(self, option_symbol: str) -> Optional[Dict[str, Any]]:
+        parsed = _parse_occ_symbol(option_symbol)
+        if parsed is None:
+            return None
+        return self._snapshot(option_symbol, *parsed)
+
+    def _snapshot(self, option_symbol: str, symbol: str, expiration: date, contract_type: str,
+                  strike: float) -> Dict[str, Any]:
+        price, sigma, greeks = self._price_and_greeks(symbol, expiration, contract_type, strike)
+        spread, ask_size, bid_size, activity, trade_age, quality = self._uniforms(option_symbol, 6)
+        half_spread = max(0.01, price * (0.02 + 0.08 * spread))
+        bid = round(max(0.0, price - half_spread), 2)
+        ask = round(max(0.01, price + half_spread), 2)
+        snapshot = {
+            "latestQuote": {
+                "t": self._quote_time, "ax": "C", "ap": ask, "as": 1 + int(50 * ask_size),
+                "bx": "C", "bp": bid, "bs": 1 + int(50 * bid_size), "c": "A"
+            }
+        }
+        volume = int(500 * activity ** 3)
+        if volume:
+            snapshot["latestTrade"] = {
+                "t": self._trade_times[int(60 * trade_age)],
+                "x": "C", "p": round(max(0.01, price), 2), "s": 1 + volume % 20, "c": "I"
+            }
+            snapshot["dailyBar"] = {
+                "t": self._bar_time,
+                "o": round(max(0.01, price * 1.03), 2), "h": round(max(0.01, price * 1.08), 2),
+                "l": round(max(0.01, price * 0.95), 2), "c": round(max(0.01, price), 2),
+                "v": volume, "n": 1 + volume // 5, "vw": round(max(0.01, price), 4)
+            }
+        if quality >= self.missing_greeks_ratio and bid > 0:
+            snapshot["impliedVolatility"] = round(sigma, 4)
+            snapshot["greeks"] = {name: round(value, 4) for name, value in greeks.items()}
+        return snapshot
+
+    def _contracts(self, symbol: str, params: Dict[str, str]):
+        """Contracts of one underlying, in expiration then type then strike order, matching the filters"""
+        if symbol in self.unlisted:
+            return
+        contract_types = [params["type"]] if params.get("type") else ["call", "put"]
+        earliest = date.fromisoformat(params.get("expiration_date_gte") or params.get("expiration_date") or "0001-01-01")
+        latest = date.fromisoformat(params.get("expiration_date_lte") or params.get("expiration_date") or "9999-12-31")
+        lowest = float(params.get("strike_price_gte", "-inf"))
+        highest = float(params.get("strike_price_lte", "inf"))
+        strikes = [strike for strike in self.strikes(symbol) if lowest <= strike <= highest]
+        for expiration in self.expiration_dates():
+            if earliest <= expiration <= latest:
+                for contract_type in contract_types:
+                    for strike in strikes:
+                        yield expiration, contract_type, strike
+
+    @staticmethod
+    def _page(items: List[Any], params: Dict[str, str], default_limit: int, max_limit: int) -> Tuple[List[Any], Optional[str]]:
+        """Slice one page; page tokens are offsets into the result"""
+        try:
+            offset = int(params.get("page_token") or 0)
+            limit = int(params.get("limit") or default_limit)
+        except ValueError:
+            raise MarketError(422, "invalid page_token or limit")
+        if not 1 <= limit <= max_limit:
+            raise MarketError(422, f"limit must be between 1 and {max_limit}")
+        end = offset + limit
+        return items[offset:end], (str(end) if end < len(items) else None)
+
+    # Endpoints
+
+    def stock_latest_quotes(self, params: Dict[str, str]) -> Dict[str, Any]:
+        symbols = [symbol for symbol in params.get("symbols", "").split(",") if symbol]
+        if not symbols:
+            raise MarketError(400, "symbols is required")
+        return {"quotes": {symbol: self.stock_quote(symbol) for symbol in symbols if symbol not in self.unlisted}}
+
+    def option_contracts(self, params: Dict[str, str]) -> Dict[str, Any]:
+        underlyings = [symbol for symbol in params.get("underlying_symbols", "").split(",") if symbol]
+        if params.get("root_symbol"):
+            underlyings = [symbol for symbol in underlyings if symbol == params["root_symbol"]] if underlyings else [params["root_symbol"]]
+        if params.get("status", "active") != "active":
+            underlyings = []
+        keys = [(symbol,) + key for symbol in underlyings for key in self._contracts(symbol, params)]
+        page, next_page_token = self._page(keys, params, 100, MAX_CONTRACTS_PAGE)
+        return {
+            "option_contracts": [self.option_contract(*key) for key in page],
+            "next_page_token": next_page_token
+        }
+
+    def option_snapshots(self, params: Dict[str, str]) -> Dict[str, Any]:
+        symbols = [symbol for symbol in params.get("symbols", "").split(",") if symbol]
+        if not symbols:
+            raise MarketError(400, "symbols is required")
+        if len(symbols) > 100:
+            raise MarketError(400, "too many symbols, at most 100 are allowed")
+        snapshots = {}
+        for symbol in symbols:
+            snapshot = self.option_snapshot(symbol)
+            if snapshot is not None:
+                snapshots[symbol] = snapshot
+        return {"snapshots": snapshots, "next_page_token": None}
+
+    def option_chain(self, underlying: str, params: Dict[str, str]) -> Dict[str, Any]:
+        keys = list(self._contracts(underlying, params))
+        page, next_page_token = self._page(keys, params, 100, 1000)
+        snapshots = {}
+        for expiration, contract_type, strike in page:
+            option_symbol = _occ_symbol(underlying, expiration, contract_type, strike)
+            snapshots[option_symbol] = self._snapshot(option_symbol, underlying, expiration, contract_type, strike)
+        return {"snapshots": snapshots, "next_page_token": next_page_token}
+
+    def account(self) -> Dict[str, Any]:
+        return {
+            "id": "00000000-0000-4000-8000-000000000000", "account_number": "PA0000000000",
+            "status": "ACTIVE", "crypto_status": "ACTIVE", "currency": "USD",
+            "buying_power": "400000", "regt_buying_power": "200000", "daytrading_buying_power": "400000",
+            "non_marginable_buying_power": "100000", "options_buying_power": "100000", "cash": "100000",
+            "accrued_fees": "0", "portfolio_value": "100000", "pattern_day_trader": False,
+            "trading_blocked": False, "transfers_blocked": False, "account_blocked": False,
+            "created_at": "2024-01-02T14:30:00Z", "trade_suspended_by_user": False, "multiplier": "4",
+            "shorting_enabled": True, "equity": "100000", "last_equity": "100000",
+            "long_market_value": "0", "short_market_value": "0", "initial_margin": "0",
+            "maintenance_margin": "0", "last_maintenance_margin": "0", "sma": "0", "daytrade_count": 0,
+            "options_approved_level": 2, "options_trading_level": 2
+        }
+
+    def trading_days(self, start: date, end: date) -> List[date]:
+        """Weekdays from start to end (this market has no holidays)"""
+        return [start + timedelta(days=offset) for offset in range((end - start).days + 1)
+                if (start + timedelta(days=offset)).weekday() < 5]
+
+    def clock(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Regular hours 13:30-20:00 UTC (9:30-16:00 New York during daylight saving time)"""
+        now = now or datetime.now(timezone.utc)
+        opens = datetime.combine(now.date(), time(13, 30), tzinfo=timezone.utc)
+        closes = datetime.combine(now.date(), time(20, 0), tzinfo=timezone.utc)
+        is_open = now.weekday() < 5 and opens <= now < closes
+        later_days = self.trading_days(now.date() + timedelta(days=1), now.date() + timedelta(days=7))
+        today_is_trading_day = now.weekday() < 5
+        next_open_day = now.date() if today_is_trading_day and now < opens else later_days[0]
+        next_close_day = now.date() if today_is_trading_day and now < closes else later_days[0]
+        return {
+            "timestamp": now.isoformat(), "is_open": is_open,
+            "next_open": datetime.combine(next_open_day, time(13, 30), tzinfo=timezone.utc).isoformat(),
+            "next_close": datetime.combine(next_close_day, time(20, 0), tzinfo=timezone.utc).isoformat()
+        }
+
+    def calendar(self, params: Dict[str, str]) -> List[Dict[str, str]]:
+        start = date.fromisoformat(params.get("start") or self.today.isoformat())
+        end = date.fromisoformat(params.get("end") or (start + timedelta(days=30)).isoformat())
+        return [{"date": day.isoformat(), "open": "09:30", "close": "16:00"} for day in self.trading_days(start, end)]
+
+    def handle(self, method: str, path: str, params: Dict[str, str]) -> Any:
+        """
+        Answer one API request.
+
+        Args:
+            method (str): HTTP method
+            path (str): Endpoint path without the API version, e.g. "/options/contracts"
+            params (Dict[str, str]): Query parameters
+
+        Returns:
+            The response body (a dict, or a list for the calendar)
+
+        Raises:
+            MarketError: For unknown endpoints and invalid parameters
+        """
+        if method.upper() != "GET":
+            raise MarketError(405, f"{method} is not supported")
+        try:
+            if path == "/stocks/quotes/latest":
+                return self.stock_latest_quotes(params)
+            if path == "/options/contracts":
+                return self.option_contracts(params)
+            if path == "/options/snapshots":
+                return self.option_snapshots(params)
+            if path.startswith("/options/snapshots/"):
+                return self.option_chain(path.rsplit("/", 1)[1], params)
+            if path == "/account":
+                return self.account()
+            if path == "/clock":
+                return self.clock()
+            if path == "/calendar":
+                return self.calendar(params)
+        except ValueError as e:
+            raise MarketError(422, str(e))
+        raise MarketError(404, f"endpoint not found: {path}")
@@ -2,73 +2,29 @@
 """
 PutScreenPro - Cash-Secured Put Screener
 A Streamlit application for screening and analyzing cash-secured put opportunities
-Uses the Alpaca MCP server for data fetching
+Uses the Alpaca MCP server for data fetching; the screening engine lives in putscreenpro_engine
 """
 
 import streamlit as st
 import pandas as pd
 import numpy as np
-from datetime import datetime, date, timedelta
-import json
 import sys
-import asyncio
-import math
 import logging
 import time
-import os
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from scipy.stats import norm
-from typing import List, Dict, Optional, Any
+from typing import Callable, List, Optional
 
-# Configuration loading functions
-def load_config(config_path: str = "config.json") -> Dict[str, Any]:
-    """Load configuration from JSON file"""
-    try:
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as file:
-                config = json.load(file)
-                print(f"Configuration loaded from {config_path}")
-                return config
-        else:
-            print(f"Config file {config_path} not found, using defaults")
-            return get_default_config()
-    except Exception as e:
-        print(f"Error loading config file: {e}")
-        return get_default_config()
-
-def get_default_config() -> Dict[str, Any]:
-    """Return default configuration if file is missing"""
-    return {
-        "default_symbols": "AAPL,MSFT,GOOGL,TSLA,NVDA",
-        "ui_settings": {
-            "page_title": "PutScreenPro",
-            "page_icon": None
-        },
-        "filter_defaults": {
-            "max_dte": 20,
-            "max_pitm": 20,
-            "min_open_interest": 10,
-            "min_volume": 0
-        },
-        "processing": {
-            "fast_processing_default": True,
-            "max_parallel_workers": 4
-        }
-    }
-
-def get_config_value(config: Dict[str, Any], key_path: str, default: Any = None) -> Any:
-    """Get configuration value using dot notation (e.g., 'filter_defaults.max_dte')"""
-    try:
-        keys = key_path.split('.')
-        value = config
-        for key in keys:
-            value = value[key]
-        return value
-    except (KeyError, TypeError):
-        return default
-
-# Load configuration
-config = load_config()
+from putscreenpro_engine import (
+    MCPAlpacaClient,
+    MCPServerError,
+    PrescreenScheduler,
+    RateLimitError,
+    ScreenUniverse,
+    best_per_ticker,
+    config,
+    get_config_value,
+    parse_symbols,
+)
 
 # Configure logging for validation errors
 logging.basicConfig(
@@ -245,921 +201,197 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-class DataValidationError(Exception):
-    """Custom exception for data validation errors"""
-    pass
+# Display formats for the numeric result columns, applied only when rendering
+RESULT_FORMATS = {
+    'Price': "${:.2f}",
+    'Strike': "${:.2f}",
+    'Expiration': "{:%m/%d/%y}",
+    'Premium': "${:.0f}",
+    'Distance %': "{:.1f}%",
+    'Annual Return': "{:.1f}%",
+    'PITM': "{:.1f}%",
+    'Score': "{:.1f}",
+    'Expected Return': "{:.1f}%",
+    'Sharpe': "{:.2f}",
+    'Theta Eff': "{:.0f}",
+    'Vol Premium': "{:.1f}",
+    'Cash Required': "${:,.0f}",
+    'IV %': "{:.1f}%",
+    'Delta': "{:.3f}",
+    'Theta': "{:.3f}"
+}
 
-class CacheManager:
-    """Simple in-memory cache for API responses"""
-    
-    def __init__(self, default_ttl: int = 300):  # 5 minutes default TTL
-        self.cache = {}
-        self.timestamps = {}
-        self.default_ttl = default_ttl
-    
-    def get(self, key: str) -> Optional[Any]:
-        """Get cached value if not expired"""
-        if key not in self.cache:
-            return None
-            
-        # Check if expired
-        if time.time() - self.timestamps[key] > self.default_ttl:
-            self._expire(key)
-            return None
-            
-        return self.cache[key]
-    
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
-        """Set cache value with TTL"""
-        self.cache[key] = value
-        self.timestamps[key] = time.time()
-        logger.debug(f"Cached: {key}")
-    
-    def _expire(self, key: str) -> None:
-        """Remove expired cache entry"""
-        if key in self.cache:
-            del self.cache[key]
-        if key in self.timestamps:
-            del self.timestamps[key]
-    
-    def clear(self) -> None:
-        """Clear all cache entries"""
-        self.cache.clear()
-        self.timestamps.clear()
-        logger.info("Cache cleared")
+# Color coding for the key metrics, evaluated one numeric column at a time:
+# column -> (tier conditions, best tier first; style per tier; style when no tier matches)
+_GREEN = 'color: #00d09c; font-weight: 500;'
+_WHITE = 'color: #ffffff; font-weight: 500;'
+_YELLOW = 'color: #ffd93d; font-weight: 500;'
+_GRAY = 'color: #9ca3af; font-weight: 400;'
+_RED = 'color: #ff6b6b; font-weight: 500;'
+_RETURN_RULE = (lambda v: [v >= 20, v >= 12, v >= 6], [_GREEN, _WHITE, _GRAY], _RED)
+RESULT_STYLE_RULES = {
+    'Score': (lambda v: [v >= 70, v >= 50, v >= 30], ['color: #00d09c; font-weight: 600;', _WHITE, _YELLOW], _RED),
+    'Annual Return': _RETURN_RULE,
+    'Expected Return': _RETURN_RULE,
+    'PITM': (lambda v: [v <= 8, v <= 15, v <= 25], [_GREEN, _WHITE, _YELLOW], _RED),
+    'Sharpe': (lambda v: [v >= 1.0, v >= 0.5, v >= 0.0], [_GREEN, _WHITE, _GRAY], _RED)
+}
 
-class MCPAlpacaClient:
-    """Client to interact with the Alpaca MCP server"""
-    
-    def __init__(self):
-        """Initialize the MCP client"""
-        self.cache = CacheManager(default_ttl=300)  # 5 minute cache
-        self.server_running = self._check_mcp_server()
-        if not self.server_running:
-            st.error("Alpaca MCP server is not running. Please start it first.")
-            st.stop()
-    
-    def _check_mcp_server(self) -> bool:
-        """Check if the MCP server is accessible"""
-        try:
-            # Try to call a simple function to test connectivity
-            result = self._call_mcp_function("mcp_alpaca_get_account_info", {"random_string": "test"})
-            return result is not None
-        except Exception:
-            return False
+def style_result_column(column: pd.Series) -> np.ndarray:
+    """Return the CSS for every cell of a result column in one vectorized pass"""
+    if column.name not in RESULT_STYLE_RULES:
+        return np.full(len(column), 'color: #ffffff;')  # Default white text
+    
+    conditions, styles, default = RESULT_STYLE_RULES[column.name]
+    values = column.to_numpy(dtype=float, na_value=np.nan)
+    return np.select(conditions(values), styles, default)
+
+@st.cache_resource(show_spinner="Connecting to Alpaca MCP server...")
+def get_mcp_client() -> MCPAlpacaClient:
+    """Return the process-wide MCP client
     
-    def _call_mcp_function(self, function_name: str, params: Dict) -> Optional[Dict]:
-        """Call an MCP function and return the result"""
-        try:
-            # Since we can't directly call MCP functions from Streamlit,
-            # we'll import and call the functions from the alpaca_mcp_server module
-            import sys
-            import os
-            
-            # Add the current directory to the Python path
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            if current_dir not in sys.path:
-                sys.path.insert(0, current_dir)
-            
-            # Import the MCP server functions
-            try:
-                import alpaca_mcp_server as mcp
-            except ImportError:
-                st.error("Could not import alpaca_mcp_server module. Please ensure it's in the same directory.")
-                return None
-            
-            # Map function names to actual functions
-            function_map = {
-                "mcp_alpaca_get_stock_quote": mcp.get_stock_quote,
-                "mcp_alpaca_get_option_contracts": mcp.get_option_contracts,
-                "mcp_alpaca_get_option_snapshot": mcp.get_option_snapshot,
-                "mcp_alpaca_get_account_info": mcp.get_account_info
+    Shared by every browser session, so all sessions use one cache, one
+    connection check and one set of coalesced upstream requests.
+    """
+    try:
+        return MCPAlpacaClient()
+    except MCPServerError as e:
+        st.error(str(e))
+        st.stop()
+
+@st.cache_resource(show_spinner=False)
+def get_prescreen_scheduler() -> Optional[PrescreenScheduler]:
+    """Return the process-wide pre-screen scheduler for the default symbols, started on first use"""
+    if not get_config_value(config, 'prescreen.enabled', True):
+        return None
+    scheduler = PrescreenScheduler(
+        get_mcp_client(),
+        parse_symbols(get_config_value(config, 'default_symbols', "AAPL,MSFT,GOOGL")),
+        max_dte=get_config_value(config, 'prescreen.max_dte', get_config_value(config, 'filter_defaults.max_dte', 20)),
+        max_pitm=get_config_value(config, 'prescreen.max_pitm', get_config_value(config, 'filter_defaults.max_pitm', 20)),
+        interval=get_config_value(config, 'prescreen.interval', 300),
+        path=get_config_value(config, 'prescreen.path', ".cache/prescreen.parquet")
+    )
+    scheduler.start()
+    return scheduler
+
+def screen_universe(mcp_client: MCPAlpacaClient, symbols: List[str], max_dte: int, max_pitm: float,
+                    use_parallel: bool, universe: Optional[ScreenUniverse] = None,
+                    on_update: Optional[Callable[[ScreenUniverse], None]] = None) -> ScreenUniverse:
+    """Screen symbols with progress reporting and return them as a universe (added to universe if given)
+    
+    Open interest and volume filters are left to ScreenUniverse.filter so they can change without refetching.
+    on_update is called with the universe so far each time a symbol completes, so results can be shown
+    while slower symbols are still running.
+    """
+    # Progress tracking
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    
+    if universe is None:
+        universe = ScreenUniverse(pd.DataFrame(), [], max_dte, max_pitm)
+    elif on_update is not None:
+        on_update(universe)
+    
+    def add_result(symbol: str, symbol_results: pd.DataFrame) -> None:
+        nonlocal universe
+        universe = universe.extend(symbol_results, [symbol])
+        if on_update is not None:
+            on_update(universe)
+    
+    start_time = time.time()
+    
+    if use_parallel and len(symbols) > 1:
+        # Parallel processing for multiple symbols
+        status_text.text("Processing symbols in parallel...")
+        
+        executor = None
+        if get_config_value(config, 'processing.async_client', True):
+            # Fan out on the client's event loop; in-flight calls are capped by processing.max_concurrency
+            future_to_symbol = {
+                mcp_client.submit_symbol(symbol, max_dte, max_pitm, 0, 0): symbol
+                for symbol in symbols
+            }
+        else:
+            max_workers = get_config_value(config, 'processing.max_parallel_workers', 4)
+            executor = ThreadPoolExecutor(max_workers=min(len(symbols), max_workers))
+            # Submit all symbol processing tasks
+            future_to_symbol = {
+                executor.submit(mcp_client.process_symbol_parallel, symbol, max_dte, max_pitm, 0, 0): symbol 
+                for symbol in symbols
             }
-            
-            if function_name not in function_map:
-                st.error(f"Unknown MCP function: {function_name}")
-                return None
-            
-            # Call the function
-            if function_name == "mcp_alpaca_get_stock_quote":
-                result = asyncio.run(function_map[function_name](params.get("symbol", "")))
-            elif function_name == "mcp_alpaca_get_option_contracts":
-                result = asyncio.run(function_map[function_name](
-                    underlying_symbol=params.get("underlying_symbol", ""),
-                    expiration_date=params.get("expiration_date"),
-                    expiration_month=params.get("expiration_month"),
-                    expiration_year=params.get("expiration_year"),
-                    strike_price_gte=params.get("strike_price_gte"),
-                    strike_price_lte=params.get("strike_price_lte"),
-                    type=params.get("type"),
-                    status=params.get("status"),
-                    limit=params.get("limit")
-                ))
-            elif function_name == "mcp_alpaca_get_option_snapshot":
-                result = asyncio.run(function_map[function_name](
-                    symbol_or_symbols=params.get("symbol_or_symbols", "")
-                ))
-            elif function_name == "mcp_alpaca_get_account_info":
-                result = asyncio.run(function_map[function_name]())
-            else:
-                result = asyncio.run(function_map[function_name](**params))
-            
-            return {"result": result}
-            
-        except Exception as e:
-            st.error(f"Error calling MCP function {function_name}: {str(e)}")
-            return None
-    
-    def get_stock_quote(self, symbol: str) -> Optional[Dict]:
-        """Get current stock quote using MCP server with caching"""
-        if not symbol or not symbol.strip():
-            raise DataValidationError("Empty symbol provided")
-        
-        symbol = symbol.upper().strip()
-        cache_key = f"quote_{symbol}"
         
-        # Try cache first
-        cached_result = self.cache.get(cache_key)
-        if cached_result:
-            logger.debug(f"Cache hit for quote: {symbol}")
-            return cached_result
-            
         try:
-            result = self._call_mcp_function("mcp_alpaca_get_stock_quote", {"symbol": symbol})
-            
-            if not result or "result" not in result:
-                raise DataValidationError(f"No quote data returned for {symbol}")
-            
-            # Parse the result string to extract quote data
-            quote_text = result["result"]
-            if not quote_text or quote_text.strip() == "":
-                raise DataValidationError(f"Empty quote response for {symbol}")
+            completed = 0
+            for future in as_completed(future_to_symbol):
+                symbol = future_to_symbol[future]
+                completed += 1
+                progress = completed / len(symbols)
+                progress_bar.progress(progress)
+                status_text.text(f"Completed {symbol} ({completed}/{len(symbols)})")
                 
-            lines = quote_text.strip().split('\n')
-            quote_data = {}
-            
-            for line in lines:
                 try:
-                    if "Ask Price:" in line:
-                        quote_data['ask'] = float(line.split('$')[1].strip())
-                    elif "Bid Price:" in line:
-                        quote_data['bid'] = float(line.split('$')[1].strip())
-                except (ValueError, IndexError) as e:
-                    logger.warning(f"Could not parse price from line: {line}")
+                    symbol_results = future.result()
+                    add_result(symbol, symbol_results)
+                    logger.info(f"Parallel processing completed for {symbol}: {len(symbol_results)} options")
+                except RateLimitError as e:
+                    logger.error(f"Rate limited while processing {symbol}: {str(e)}")
+                    st.warning(f"Alpaca rate limit reached while processing {symbol}; its results are missing")
                     continue
-            
-            # Ensure we have both bid and ask
-            if 'ask' not in quote_data or 'bid' not in quote_data:
-                raise DataValidationError(f"Incomplete quote data for {symbol} - missing bid or ask")
-            
-            if 'ask' in quote_data and 'bid' in quote_data:
-                quote_data['mid_price'] = (quote_data['ask'] + quote_data['bid']) / 2
-                quote_data['symbol'] = symbol
-                
-                # Cache the result (quotes expire quickly - 30 seconds)
-                self.cache.set(cache_key, quote_data, ttl=30)
-                return quote_data
-                    
-            return None
-            
-        except DataValidationError:
-            raise  # Re-raise validation errors
-        except ConnectionError:
-            raise DataValidationError(f"Connection error while fetching quote for {symbol}")
-        except Exception as e:
-            raise DataValidationError(f"Unexpected error fetching quote for {symbol}: {str(e)}")
-    
-    def get_option_contracts(self, symbol: str, expiration_date: date, contract_type: str = "put") -> List[Dict]:
-        """Get option contracts for a symbol and expiration date using MCP server"""
-        try:
-            # Format the expiration date as string
-            exp_date_str = expiration_date.strftime("%Y-%m-%d")
-            
-            params = {
-                "underlying_symbol": symbol,
-                "expiration_date": exp_date_str,
-                "type": contract_type.lower(),
-                "status": "active",
-                "limit": 100
-            }
-            
-            result = self._call_mcp_function("mcp_alpaca_get_option_contracts", params)
-            
-            if result and "result" in result:
-                # Parse the result string to extract option data
-                contracts_text = result["result"]
-                option_data = []
-                
-                # Split by contract separators
-                contracts = contracts_text.split("-------------------------")
-                
-                for contract_block in contracts:
-                    if "Symbol:" in contract_block and "Put" in contract_block:
-                        lines = contract_block.strip().split('\n')
-                        contract_info = {}
-                        
-                        for line in lines:
-                            line = line.strip()
-                            if line.startswith("Symbol:"):
-                                contract_info['symbol'] = line.split(": ")[1]
-                            elif line.startswith("Name:"):
-                                contract_info['name'] = line.split(": ")[1]
-                            elif line.startswith("Strike Price:"):
-                                try:
-                                    price_str = line.split("$")[1]
-                                    contract_info['strike_price'] = float(price_str)
-                                except:
-                                    continue
-                            elif line.startswith("Expiration Date:"):
-                                contract_info['expiration_date'] = line.split(": ")[1]
-                            elif line.startswith("Open Interest:"):
-                                try:
-                                    oi_str = line.split(": ")[1]
-                                    if oi_str != "None":
-                                        contract_info['open_interest'] = int(oi_str)
-                                    else:
-                                        contract_info['open_interest'] = 0
-                                except:
-                                    contract_info['open_interest'] = 0
-                            elif line.startswith("Close Price:"):
-                                try:
-                                    price_str = line.split("$")[1]
-                                    contract_info['close_price'] = float(price_str)
-                                except:
-                                    contract_info['close_price'] = 0.0
-                        
-                        if 'strike_price' in contract_info and contract_info['strike_price'] > 0:
-                            option_data.append(contract_info)
-                
-                return sorted(option_data, key=lambda x: x['strike_price'])
-            
-            return []
-            
-        except Exception as e:
-            st.error(f"Error fetching options for {symbol}: {str(e)}")
-            return []
-
-    def get_option_snapshot(self, symbol: str) -> Optional[Dict]:
-        """Get option snapshot with Greeks, pricing data, and volume from MCP server"""
-        try:
-            params = {"symbol_or_symbols": symbol}
-            result = self._call_mcp_function("mcp_alpaca_get_option_snapshot", params)
-            
-            if result and "result" in result:
-                # Parse the text response to extract Greeks, pricing data, and volume
-                snapshot_text = result["result"]
-                lines = snapshot_text.split('\n')
-                data = {}
-                
-                for line in lines:
-                    line = line.strip()
-                    if 'Delta:' in line:
-                        try:
-                            delta_str = line.split('Delta:')[1].strip()
-                            data['delta'] = float(delta_str)
-                        except ValueError as e:
-                            logger.warning(f"Could not parse Delta from line: {line}")
-                            continue
-                    elif 'Gamma:' in line:
-                        try:
-                            gamma_str = line.split('Gamma:')[1].strip()
-                            data['gamma'] = float(gamma_str)
-                        except ValueError:
-                            continue
-                    elif 'Theta:' in line:
-                        try:
-                            theta_str = line.split('Theta:')[1].strip()
-                            data['theta'] = float(theta_str)
-                        except ValueError:
-                            continue
-                    elif 'Vega:' in line:
-                        try:
-                            vega_str = line.split('Vega:')[1].strip()
-                            data['vega'] = float(vega_str)
-                        except ValueError:
-                            continue
-                    elif 'Rho:' in line:
-                        try:
-                            rho_str = line.split('Rho:')[1].strip()
-                            data['rho'] = float(rho_str)
-                        except ValueError:
-                            continue
-                    elif 'Implied Volatility:' in line:
-                        try:
-                            iv_str = line.split('Implied Volatility:')[1].strip().replace('%', '')
-                            data['implied_volatility'] = float(iv_str)
-                        except ValueError:
-                            continue
-                    elif 'Bid Price:' in line:
-                        try:
-                            bid_str = line.split('Bid Price:')[1].strip().replace('$', '')
-                            data['bid'] = float(bid_str)
-                        except ValueError:
-                            continue
-                    elif 'Ask Price:' in line:
-                        try:
-                            ask_str = line.split('Ask Price:')[1].strip().replace('$', '')
-                            data['ask'] = float(ask_str)
-                        except ValueError:
-                            continue
-                    elif line.startswith('Price:') and 'Bid Price:' not in line and 'Ask Price:' not in line:
-                        try:
-                            # This is likely the trade price
-                            price_str = line.split('Price:')[1].strip().replace('$', '')
-                            data['last_price'] = float(price_str)
-                        except ValueError:
-                            continue
-                    elif 'Size:' in line and 'Bid Size:' not in line and 'Ask Size:' not in line:
-                        try:
-                            # This is likely the trade size (volume indicator)
-                            size_str = line.split('Size:')[1].strip()
-                            data['last_trade_size'] = int(size_str)
-                        except ValueError:
-                            continue
-                    elif 'Bid Size:' in line:
-                        try:
-                            bid_size_str = line.split('Bid Size:')[1].strip()
-                            data['bid_size'] = int(bid_size_str)
-                        except ValueError:
-                            continue
-                    elif 'Ask Size:' in line:
-                        try:
-                            ask_size_str = line.split('Ask Size:')[1].strip()
-                            data['ask_size'] = int(ask_size_str)
-                        except ValueError:
-                            continue
-                
-                return data
-            
-            return None
-            
-        except ConnectionError:
-            logger.error(f"Connection error while fetching option snapshot for {symbol}")
-            return None
-        except Exception as e:
-            logger.error(f"Unexpected error fetching option snapshot for {symbol}: {str(e)}")
-            return None
-
-    def get_available_expirations(self, symbol: str, max_days: int) -> List[date]:
-        """Get real expiration dates from Alpaca for the given symbol"""
-        try:
-            # Get option contracts for the symbol with a reasonable date range
-            today = date.today()
-            end_date = today + timedelta(days=max_days)
-            
-            # First, try to get contracts for different expiration months
-            expirations = set()
-            
-            # Check enough future months to cover max_days (no arbitrary limit)
-            months_to_check = (max_days // 30) + 2  # Dynamic based on max_days only
-            for month_offset in range(0, months_to_check):
-                check_date = today + timedelta(days=30 * month_offset)
-                
-                params = {
-                    "underlying_symbol": symbol,
-                    "expiration_month": check_date.month,
-                    "expiration_year": check_date.year,
-                    "limit": 50
-                }
-                
-                result = self._call_mcp_function("mcp_alpaca_get_option_contracts", params)
-                
-                if result and "result" in result:
-                    contracts_text = result["result"]
-                    
-                    # Extract expiration dates from contract symbols
-                    for line in contracts_text.split('\n'):
-                        if 'Symbol:' in line:
-                            symbol_text = line.split('Symbol:')[1].strip()
-                            # Parse expiration from option symbol (format: TICKER250822C00150000)
-                            if len(symbol_text) >= 15:
-                                try:
-                                    date_part = symbol_text[-15:-9]  # Extract YYMMDD
-                                    exp_year = 2000 + int(date_part[:2])
-                                    exp_month = int(date_part[2:4]) 
-                                    exp_day = int(date_part[4:6])
-                                    exp_date = date(exp_year, exp_month, exp_day)
-                                    
-                                    # Only include dates within our range
-                                    if today <= exp_date <= end_date:
-                                        expirations.add(exp_date)
-                                except (ValueError, IndexError):
-                                    continue
-            
-            # Convert to sorted list
-            expiration_list = sorted(list(expirations))
-            
-            # If no expirations found, fall back to Friday logic but with validation
-            if not expiration_list:
-                logger.warning(f"No option expirations found for {symbol}, using Friday estimates")
-                return self._get_friday_estimates(max_days)
-            
-            # Return all valid expirations within max_days, no arbitrary limit
-            logger.info(f"Found {len(expiration_list)} expiration dates for {symbol} within {max_days} days")
-            return expiration_list
-            
-        except Exception as e:
-            logger.warning(f"Error getting expirations for {symbol}: {str(e)}, using Friday estimates")
-            return self._get_friday_estimates(max_days)
-    
-    def _get_friday_estimates(self, max_days: int) -> List[date]:
-        """Fallback method to estimate Friday expirations"""
-        today = date.today()
-        fridays = []
-        
-        # Find next Friday
-        days_ahead = 4 - today.weekday()  # Friday is 4
-        if days_ahead <= 0:
-            days_ahead += 7
-        
-        current_friday = today + timedelta(days=days_ahead)
-        
-        # Get all Fridays within max_days (no arbitrary limit)
-        while (current_friday - today).days <= max_days:
-            fridays.append(current_friday)
-            current_friday += timedelta(days=7)
-        
-        return fridays
-    
-    @staticmethod
-    def validate_stock_quote(quote: Dict) -> Dict:
-        """Validate and clean stock quote data"""
-        if not quote:
-            raise DataValidationError("Empty quote data received")
-        
-        required_fields = ['bid', 'ask']
-        for field in required_fields:
-            if field not in quote:
-                raise DataValidationError(f"Missing required field in quote: {field}")
-            
-            if not isinstance(quote[field], (int, float)) or quote[field] <= 0:
-                raise DataValidationError(f"Invalid {field} price: {quote[field]}")
-        
-        # Calculate mid price if not present
-        if 'mid_price' not in quote:
-            quote['mid_price'] = (quote['bid'] + quote['ask']) / 2
-        
-        # Validate spread isn't too wide (more than 10%)
-        spread_pct = (quote['ask'] - quote['bid']) / quote['mid_price'] * 100
-        if spread_pct > 10:
-            logger.warning(f"Wide bid-ask spread detected for quote: {spread_pct:.1f}%")
-        
-        return quote
-    
-    @staticmethod 
-    def validate_option_data(option: Dict) -> Dict:
-        """Validate and clean option contract data"""
-        if not option:
-            raise DataValidationError("Empty option data received")
-        
-        # Required fields
-        required_fields = ['symbol', 'strike_price', 'close_price', 'open_interest']
-        for field in required_fields:
-            if field not in option:
-                raise DataValidationError(f"Missing required field in option: {field}")
-        
-        # Validate numeric fields
-        if option['strike_price'] <= 0:
-            raise DataValidationError(f"Invalid strike price: {option['strike_price']}")
-            
-        if option['close_price'] <= 0:
-            raise DataValidationError(f"Invalid option price: {option['close_price']}")
-            
-        if option['open_interest'] < 0:
-            raise DataValidationError(f"Invalid open interest: {option['open_interest']}")
-        
-        # Validate option symbol format
-        if not option['symbol'] or len(option['symbol']) < 10:
-            raise DataValidationError(f"Invalid option symbol: {option['symbol']}")
-        
-        return option
-    
-    @staticmethod
-    def validate_metrics(metrics: Dict) -> Dict:
-        """Validate calculated metrics"""
-        if not metrics:
-            raise DataValidationError("Empty metrics data")
-        
-        # Check for required fields
-        required_fields = ['annualized_return', 'pitm', 'cash_required', 'premium_received']
-        for field in required_fields:
-            if field not in metrics:
-                raise DataValidationError(f"Missing metric: {field}")
-            
-            if not isinstance(metrics[field], (int, float)):
-                raise DataValidationError(f"Invalid metric type for {field}: {type(metrics[field])}")
-        
-        # Sanity checks
-        if metrics['annualized_return'] < 0 or metrics['annualized_return'] > 1000:
-            logger.warning(f"Unusual annualized return detected: {metrics['annualized_return']:.1f}%")
-        
-        if metrics['pitm'] < 0 or metrics['pitm'] > 100:
-            raise DataValidationError(f"PITM out of range: {metrics['pitm']}")
-        
-        if metrics['cash_required'] <= 0:
-            raise DataValidationError(f"Invalid cash required: {metrics['cash_required']}")
-        
-        return metrics
-    
-    def process_symbol_parallel(self, symbol: str, max_dte: int, max_pitm: float, 
-                               min_open_interest: int, min_volume: int = 0) -> List[Dict]:
-        """Process a single symbol and return all valid options"""
-        try:
-            # Get stock quote with validation
-            quote = self.get_stock_quote(symbol)
-            if not quote:
-                logger.warning(f"Could not fetch quote for {symbol}")
-                return []
-            
-            # Validate quote data
-            quote = self.validate_stock_quote(quote)
-            stock_price = quote['mid_price']
-            
-            # Get real available expiration dates from Alpaca
-            today = date.today()
-            expiration_dates = self.get_available_expirations(symbol, max_dte)
-            if not expiration_dates:
-                logger.warning(f"No valid expirations found for {symbol} within {max_dte} days")
-                return []
-            
-            all_options = []
-            
-            # Analyze each expiration date
-            for exp_date in expiration_dates:
-                options = self.get_option_contracts(symbol, exp_date, "put")
-                
-                if not options:
+                except Exception as e:
+                    logger.error(f"Error in parallel processing for {symbol}: {str(e)}")
+                    st.warning(f"Error processing {symbol}")
                     continue
-                
-                days_to_exp = (exp_date - today).days
-                
-                for option in options:
-                    try:
-                        # Validate option data
-                        option = self.validate_option_data(option)
-                        
-                        # Apply basic filters
-                        if option['open_interest'] < min_open_interest:
-                            continue
-                        
-                        strike_price = option['strike_price']
-                        premium = option['close_price']
-                        
-                        # Calculate metrics with real Greeks
-                        metrics = self.calculate_option_metrics(
-                            stock_price, strike_price, premium, days_to_exp, 
-                            option_symbol=option['symbol']
-                        )
-                        
-                        # Validate calculated metrics
-                        metrics = self.validate_metrics(metrics)
-                        
-                        # Apply filters
-                        if metrics['pitm'] > max_pitm:
-                            continue
-                        
-                        # Apply volume filter if specified
-                        if min_volume > 0 and metrics['volume'] < min_volume:
-                            continue
-                        
-                        # Create result object with user-preferred column order
-                        result = {
-                            # User-Preferred Columns (First)
-                            'Ticker': symbol,
-                            'Price': f"${stock_price:.2f}",
-                            'Strike': f"${strike_price:.2f}",
-                            'Expiration': exp_date.strftime('%m/%d/%y'),
-                            'DTE': days_to_exp,
-                            'Premium': f"${metrics['premium_received']:.0f}",
-                            'Distance %': f"{metrics['distance_to_strike']:.1f}%",
-                            'Annual Return': f"{metrics['annualized_return']:.1f}%",
-                            'PITM': f"{metrics['pitm']:.1f}%",
-                            
-                            # High Importance - Risk & Quality Metrics
-                            'Score': f"{metrics['advanced_score']:.1f}",
-                            'Expected Return': f"{metrics['expected_return']:.1f}%",
-                            'Sharpe': f"{metrics['sharpe_ratio']:.2f}",
-                            
-                            # Medium Importance - Advanced Analysis
-                            'Theta Eff': f"{metrics['theta_efficiency']:.0f}",
-                            'Vol Premium': f"{metrics['volatility_risk_premium']:.1f}",
-                            'Cash Required': f"${metrics['cash_required']:,.0f}",
-                            
-                            # Greeks & Technical Data
-                            'IV %': f"{metrics['implied_volatility']:.1f}%",
-                            'Delta': f"{metrics['delta']:.3f}" if metrics['delta'] != 0 else "N/A",
-                            'Theta': f"{metrics['theta']:.3f}" if metrics['theta'] != 0 else "N/A",
-                            
-                            # Market Data & Quality Indicators
-                            'OI': option['open_interest'],
-                            'Volume': metrics['volume'] if metrics['volume'] > 0 else "N/A",
-                            'Source': metrics['data_source'],
-                            
-                            # Sorting keys (hidden)
-                            'sort_score': metrics['advanced_score'],
-                            'sort_expected_return': metrics['expected_return']
-                        }
-                        
-                        all_options.append(result)
-                        
-                    except DataValidationError as e:
-                        logger.warning(f"Skipping invalid option {option.get('symbol', 'unknown')}: {str(e)}")
-                        continue
-                    except Exception as e:
-                        logger.error(f"Error processing option {option.get('symbol', 'unknown')}: {str(e)}")
-                        continue
-            
-            logger.info(f"Processed {symbol}: found {len(all_options)} valid options")
-            return all_options
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+    else:
+        # Sequential processing (fallback or single symbol)
+        for i, symbol in enumerate(symbols):
+            status_text.text(f"Analyzing {symbol}...")
+            progress = (i + 1) / len(symbols)
+            progress_bar.progress(progress)
             
-        except DataValidationError as e:
-            logger.error(f"Invalid data for {symbol}: {str(e)}")
-            return []
-        except Exception as e:
-            logger.error(f"Error processing {symbol}: {str(e)}")
-            return []
-    
-    def calculate_implied_volatility(self, stock_price: float, strike_price: float, 
-                                   premium: float, days_to_expiration: int, 
-                                   risk_free_rate: float = 0.05) -> float:
-        """Estimate implied volatility using simplified approach"""
-        # This is a rough approximation - in reality you'd use Newton-Raphson
-        # For now, we'll estimate based on typical market volatilities
-        
-        # Time to expiration in years
-        time_to_exp = days_to_expiration / 365.0
-        
-        # Moneyness (how far ITM/OTM the option is)
-        moneyness = stock_price / strike_price
-        
-        # Rough IV estimation based on premium and moneyness
-        # This is very simplified but gives reasonable estimates
-        if moneyness > 1.1:  # Deep OTM put
-            return 0.25  # 25% IV
-        elif moneyness > 1.05:  # Moderately OTM
-            return 0.35  # 35% IV
-        elif moneyness > 0.95:  # Near the money
-            return 0.45  # 45% IV
-        else:  # ITM put
-            return 0.55  # 55% IV
-
-    def calculate_probability_weighted_return(self, stock_price: float, strike_price: float,
-                                            premium: float, days_to_expiration: int,
-                                            pitm: float, implied_vol: float) -> float:
-        """Calculate expected return considering all possible outcomes"""
-        
-        cash_required = strike_price * 100
-        premium_received = premium * 100
-        pitm_decimal = pitm / 100
-        
-        # Scenario 1: Option expires worthless (probability = 1 - PITM)
-        profit_expire_worthless = premium_received
-        prob_expire_worthless = 1 - pitm_decimal
-        
-        # Scenario 2: Assignment occurs (probability = PITM)
-        # For assignment scenario, estimate expected stock price given ITM condition
-        # Using conditional expectation based on log-normal distribution
-        
-        # Time to expiration in years
-        T = days_to_expiration / 365.0
-        
-        if T > 0 and implied_vol > 0:
-            # Calculate expected stock price if assigned (conditional on being ITM)
-            risk_free_rate = 0.05
-            d1 = (math.log(stock_price / strike_price) + (risk_free_rate + 0.5 * implied_vol**2) * T) / (implied_vol * math.sqrt(T))
-            d2 = d1 - implied_vol * math.sqrt(T)
-            
-            # Conditional expected stock price given assignment
-            # This is an approximation - assumes normal distribution for simplicity
-            expected_stock_if_assigned = strike_price * 0.95  # Conservative estimate
-        else:
-            expected_stock_if_assigned = strike_price
-        
-        # Profit if assigned = premium + any appreciation above strike
-        # Note: CSP seller keeps premium but may have unrealized loss on stock
-        profit_if_assigned = premium_received
-        
-        # Expected profit
-        expected_profit = (
-            profit_expire_worthless * prob_expire_worthless +
-            profit_if_assigned * pitm_decimal
-        )
-        
-        # Annualized expected return
-        period_return = expected_profit / cash_required
-        annualized_expected = period_return * (365 / max(days_to_expiration, 1))
-        
-        return annualized_expected * 100
-
-    def calculate_volatility_risk_premium(self, implied_vol: float, gamma: float) -> float:
-        """Calculate premium for volatility risk exposure"""
-        
-        # Higher IV = more premium, but also more risk
-        # Sweet spot is moderate IV with low gamma (less sensitive to moves)
-        vol_premium = max(0, (implied_vol - 20) * 2)  # Reward IV above 20%
-        gamma_penalty = abs(gamma) * 50  # Penalize high gamma exposure
-        
-        return max(0, vol_premium - gamma_penalty)
-
-    def calculate_options_sharpe_ratio(self, expected_return: float, stock_price: float, 
-                                     strike_price: float, days_to_expiration: int,
-                                     implied_vol: float) -> float:
-        """Calculate Sharpe ratio for options strategy"""
-        
-        # Estimate volatility of CSP returns based on underlying characteristics
-        time_factor = math.sqrt(days_to_expiration / 365)
-        moneyness_factor = abs((stock_price - strike_price) / stock_price)
-        
-        # Strategy volatility is lower than underlying due to limited upside
-        strategy_vol = implied_vol * time_factor * (0.5 + moneyness_factor)
-        
-        risk_free_rate = 5.0  # 5% risk-free rate
-        
-        if strategy_vol > 0:
-            sharpe = (expected_return - risk_free_rate) / (strategy_vol * 100)
-            return max(0, sharpe)
-        
-        return 0
-
-    def calculate_theta_efficiency(self, theta: float, premium: float, 
-                                 days_to_expiration: int) -> float:
-        """Calculate theta efficiency score"""
-        
-        theta_abs = abs(theta)  # Theta is negative for puts we sell
-        
-        if premium > 0 and days_to_expiration > 0:
-            # Theta efficiency = theta decay per day / premium at risk
-            daily_decay = theta_abs
-            theta_efficiency = (daily_decay * days_to_expiration) / premium
-            
-            # Normalize to 0-100 scale, cap at reasonable levels
-            return min(100, theta_efficiency * 1000)
-        
-        return 0
-
-    def calculate_advanced_score(self, metrics: Dict) -> float:
-        """Advanced multi-factor scoring for CSP selection"""
-        
-        # Extract key metrics
-        annualized_return = metrics.get('annualized_return', 0)
-        expected_return = metrics.get('expected_return', annualized_return)
-        sharpe_ratio = metrics.get('sharpe_ratio', 0)
-        vol_risk_premium = metrics.get('volatility_risk_premium', 0)
-        theta_efficiency = metrics.get('theta_efficiency', 0)
-        
-        # Normalize components to 0-1 scale
-        return_component = min(1.0, expected_return / 50)  # Cap at 50% return
-        sharpe_component = min(1.0, sharpe_ratio / 2)      # Cap at 2.0 Sharpe
-        vol_component = min(1.0, vol_risk_premium / 20)    # Cap at 20 points
-        theta_component = min(1.0, theta_efficiency / 100) # Cap at 100 points
-        
-        # Weighted composite score (0-100 scale)
-        composite_score = (
-            return_component * 30 +      # Expected return (30%)
-            sharpe_component * 25 +      # Risk-adjusted return (25%)  
-            vol_component * 20 +         # Volatility premium (20%)
-            theta_component * 25         # Theta efficiency (25%)
-        )
-        
-        return composite_score
-
-    def calculate_pitm_black_scholes(self, stock_price: float, strike_price: float,
-                                   days_to_expiration: int, volatility: float,
-                                   risk_free_rate: float = 0.05) -> float:
-        """Calculate probability ITM using Black-Scholes framework"""
-        
-        if days_to_expiration <= 0:
-            # Option has expired
-            return 100.0 if stock_price < strike_price else 0.0
-        
-        # Time to expiration in years
-        T = days_to_expiration / 365.0
-        
-        # Prevent division by zero
-        if T <= 0 or volatility <= 0:
-            return 50.0  # Default fallback
-        
-        try:
-            # Black-Scholes d2 parameter
-            d2 = (math.log(stock_price / strike_price) + 
-                  (risk_free_rate - 0.5 * volatility**2) * T) / (volatility * math.sqrt(T))
-            
-            # For a put option, PITM = N(-d2) where N is cumulative normal distribution
-            pitm = norm.cdf(-d2) * 100
-            
-            # Ensure reasonable bounds
-            return max(0.1, min(99.9, pitm))
-            
-        except (ValueError, ZeroDivisionError, OverflowError):
-            # Fallback to simple calculation if Black-Scholes fails
-            distance_pct = ((stock_price - strike_price) / strike_price) * 100
-            if distance_pct > 20:
-                return 5.0
-            elif distance_pct > 10:
-                return 15.0
-            elif distance_pct > 0:
-                return 25.0
-            else:
-                return 50.0
+            try:
+                symbol_results = mcp_client.process_symbol_parallel(symbol, max_dte, max_pitm, 0, 0)
+                add_result(symbol, symbol_results)
+                logger.info(f"Sequential processing completed for {symbol}: {len(symbol_results)} options")
+            except RateLimitError as e:
+                logger.error(f"Rate limited while processing {symbol}: {str(e)}")
+                st.warning(f"Alpaca rate limit reached while processing {symbol}; its results are missing")
+                continue
+            except Exception as e:
+                logger.error(f"Error processing {symbol}: {str(e)}")
+                st.warning(f"Error processing {symbol}")
+                continue
+    
+    processing_time = time.time() - start_time
+    logger.info(f"Total processing time: {processing_time:.2f} seconds")
+    status_text.text(f"Processing completed in {processing_time:.1f}s")
+    
+    progress_bar.empty()
+    time.sleep(1)  # Brief pause to show completion message
+    status_text.empty()
+    return universe
 
-    def calculate_option_metrics(self, stock_price: float, strike_price: float, 
-                                premium: float, days_to_expiration: int, 
-                                option_symbol: Optional[str] = None) -> Dict:
-        """Calculate advanced option metrics for cash-secured puts"""
-        
-        # Basic metrics
-        cash_required = strike_price * 100
-        premium_received = premium * 100
-        period_return = (premium_received / cash_required) * 100
-        annualized_return = period_return * (365 / max(days_to_expiration, 1))
-        distance_to_strike = ((stock_price - strike_price) / stock_price) * 100
-        
-        # Try to get real Greeks and IV from Alpaca if option symbol provided
-        real_greeks = {}
-        if option_symbol:
-            snapshot = self.get_option_snapshot(option_symbol)
-            if snapshot:
-                real_greeks = snapshot
-        
-        # Calculate PITM using Delta (most accurate method)
-        if 'delta' in real_greeks and 'implied_volatility' in real_greeks:
-            # Use real data from Alpaca
-            pitm = abs(real_greeks['delta']) * 100
-            implied_vol = real_greeks.get('implied_volatility', 0) / 100  # Convert from percentage to decimal
-            data_source = "Alpaca_Real"
-        else:
-            # Fallback to simplified calculation if no Greeks available
-            implied_vol = self.calculate_implied_volatility(
-                stock_price, strike_price, premium, days_to_expiration
-            )
-            pitm = self.calculate_pitm_black_scholes(
-                stock_price, strike_price, days_to_expiration, implied_vol
-            )
-            data_source = "Estimated"
-        
-        # Advanced Phase 1 calculations
-        gamma = real_greeks.get('gamma', 0)
-        theta = real_greeks.get('theta', 0)
-        
-        # 1. Probability-weighted expected return
-        expected_return = self.calculate_probability_weighted_return(
-            stock_price, strike_price, premium, days_to_expiration, pitm, implied_vol
-        )
-        
-        # 2. Volatility risk premium
-        volatility_risk_premium = self.calculate_volatility_risk_premium(
-            implied_vol * 100, gamma
-        )
-        
-        # 3. Options Sharpe ratio
-        sharpe_ratio = self.calculate_options_sharpe_ratio(
-            expected_return, stock_price, strike_price, days_to_expiration, implied_vol
-        )
-        
-        # 4. Theta efficiency
-        theta_efficiency = self.calculate_theta_efficiency(
-            theta, premium, days_to_expiration
-        )
-        
-        # Create comprehensive metrics dictionary
-        metrics = {
-            # Basic metrics
-            'cash_required': cash_required,
-            'premium_received': premium_received,
-            'period_return': period_return,
-            'annualized_return': annualized_return,
-            'pitm': pitm,
-            'distance_to_strike': distance_to_strike,
-            'implied_volatility': implied_vol * 100 if implied_vol else 0,
-            
-            # Greeks
-            'delta': real_greeks.get('delta', 0),
-            'gamma': gamma,
-            'theta': theta,
-            'vega': real_greeks.get('vega', 0),
-            'rho': real_greeks.get('rho', 0),
-            
-            # Market data
-            'bid': real_greeks.get('bid', 0),
-            'ask': real_greeks.get('ask', 0),
-            'last_price': real_greeks.get('last_price', premium),
-            'volume': real_greeks.get('last_trade_size', 0),
-            'bid_size': real_greeks.get('bid_size', 0),
-            'ask_size': real_greeks.get('ask_size', 0),
-            
-            # Advanced Phase 1 metrics
-            'expected_return': expected_return,
-            'volatility_risk_premium': volatility_risk_premium,
-            'sharpe_ratio': sharpe_ratio,
-            'theta_efficiency': theta_efficiency,
-            
-            'data_source': data_source
-        }
-        
-        # 5. Calculate advanced composite score
-        metrics['advanced_score'] = self.calculate_advanced_score(metrics)
-        
-        return metrics
+def render_results(df: pd.DataFrame, container=None) -> None:
+    """Display the ranked results table, sized to its rows"""
+    # Calculate dynamic height based on number of rows
+    num_rows = len(df)
+    row_height = 35  # Height per row in pixels
+    header_height = 50  # Height for header row
+    min_height = 200  # Minimum height for small datasets
+    
+    # Simple height calculation
+    dynamic_height = max(min_height, header_height + (num_rows * row_height))
+    
+    # Display styled dataframe with dynamic height
+    styled_df = (
+        df.style
+        .format(RESULT_FORMATS, na_rep="N/A")
+        .apply(style_result_column)
+    )
+    (container or st).dataframe(styled_df, use_container_width=True, height=int(dynamic_height), hide_index=True)
 
 def main():
     """Main Streamlit application"""
@@ -1168,13 +400,6 @@ def main():
     st.markdown("# PutScreenPro")
     st.markdown("Cash-secured puts - Find opportunities to buy the dip")
     
-    # Initialize the MCP client
-    if 'mcp_client' not in st.session_state:
-        with st.spinner("Connecting to Alpaca MCP server..."):
-            st.session_state.mcp_client = MCPAlpacaClient()
-    
-    mcp_client = st.session_state.mcp_client
-    
     # Simple sidebar header
     st.sidebar.markdown("### Filters")
     
@@ -1186,7 +411,7 @@ def main():
         help="Enter stock symbols separated by commas (e.g., AAPL,TSLA,MSFT)"
     )
     
-    symbols = [s.strip().upper() for s in symbols_input.split(',') if s.strip()]
+    symbols = parse_symbols(symbols_input)
     
     # Compact filters in columns
     col1, col2 = st.sidebar.columns(2)
@@ -1230,7 +455,29 @@ def main():
     
     # Prominent analyze button
     st.sidebar.markdown("---")
-    if st.sidebar.button("Analyze Opportunities", type="primary", use_container_width=True):
+    analyze = st.sidebar.button("Analyze Opportunities", type="primary", use_container_width=True)
+    
+    # Get the shared MCP client once the page and filters are on screen
+    mcp_client = get_mcp_client()
+    
+    # The session's last screen, reused while fresh so filter changes re-apply without refetching
+    universe = st.session_state.get('screen_universe')
+    if universe is not None and not universe.is_fresh(get_config_value(config, 'cache.session_ttl', 300)):
+        del st.session_state['screen_universe']
+        universe = None
+    
+    # Without a screen of its own, a session starts from the shared pre-screened universe
+    prescreened = False
+    if universe is None:
+        scheduler = get_prescreen_scheduler()
+        if scheduler is not None and scheduler.latest is not None:
+            universe = scheduler.latest
+            prescreened = True
+    
+    # Partial results while screening and the final table share this slot
+    results_placeholder = st.empty()
+    
+    if analyze:
         # Analysis logic starts here
         
         # Load processing settings from config
@@ -1274,198 +521,80 @@ def main():
             st.error("Minimum volume cannot be negative")
             return
         
-        # Progress tracking
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        all_results = []
-        start_time = time.time()
-        
-        if use_parallel and len(symbols) > 1:
-            # Parallel processing for multiple symbols
-            status_text.text("Processing symbols in parallel...")
-            
-            max_workers = get_config_value(config, 'processing.max_parallel_workers', 4)
-            with ThreadPoolExecutor(max_workers=min(len(symbols), max_workers)) as executor:
-                # Submit all symbol processing tasks
-                future_to_symbol = {
-                    executor.submit(mcp_client.process_symbol_parallel, symbol, max_dte, max_pitm, min_open_interest, min_volume): symbol 
-                    for symbol in symbols
-                }
-                
-                completed = 0
-                for future in as_completed(future_to_symbol):
-                    symbol = future_to_symbol[future]
-                    completed += 1
-                    progress = completed / len(symbols)
-                    progress_bar.progress(progress)
-                    status_text.text(f"Completed {symbol} ({completed}/{len(symbols)})")
-                    
-                    try:
-                        symbol_results = future.result()
-                        all_results.extend(symbol_results)
-                        logger.info(f"Parallel processing completed for {symbol}: {len(symbol_results)} options")
-                    except Exception as e:
-                        logger.error(f"Error in parallel processing for {symbol}: {str(e)}")
-                        st.warning(f"Error processing {symbol}")
-                        continue
+        # Only symbols the last screen did not cover are fetched, unless DTE or PITM grew past it;
+        # pressing Analyze over pre-screened results always screens live
+        if universe is not None and not prescreened and universe.covers(max_dte, max_pitm):
+            fetch_symbols = universe.missing_symbols(symbols)
+            fetch_dte, fetch_pitm = universe.max_dte, universe.max_pitm
         else:
-            # Sequential processing (fallback or single symbol)
-            for i, symbol in enumerate(symbols):
-                status_text.text(f"Analyzing {symbol}...")
-                progress = (i + 1) / len(symbols)
-                progress_bar.progress(progress)
-                
-                try:
-                    symbol_results = mcp_client.process_symbol_parallel(symbol, max_dte, max_pitm, min_open_interest, min_volume)
-                    all_results.extend(symbol_results)
-                    logger.info(f"Sequential processing completed for {symbol}: {len(symbol_results)} options")
-                except Exception as e:
-                    logger.error(f"Error processing {symbol}: {str(e)}")
-                    st.warning(f"Error processing {symbol}")
-                    continue
-        
-        # Volume filtering is now implemented within option processing
-        
-        processing_time = time.time() - start_time
-        logger.info(f"Total processing time: {processing_time:.2f} seconds")
-        status_text.text(f"Processing completed in {processing_time:.1f}s")
-        
-        progress_bar.empty()
-        time.sleep(1)  # Brief pause to show completion message
-        status_text.empty()
-        
-        if not all_results:
+            universe = None
+            fetch_symbols = symbols
+            fetch_dte, fetch_pitm = max_dte, max_pitm
+        
+        if fetch_symbols:
+            # Show each symbol's best contracts, re-ranked, as soon as it completes
+            def show_partial(partial: ScreenUniverse) -> None:
+                partial_df = best_per_ticker(partial.filter(symbols, max_dte, max_pitm, min_open_interest, min_volume))
+                if not partial_df.empty:
+                    render_results(partial_df, results_placeholder)
+            
+            universe = screen_universe(
+                mcp_client, fetch_symbols, fetch_dte, fetch_pitm, use_parallel, universe, on_update=show_partial
+            )
+            st.session_state['screen_universe'] = universe
+            prescreened = False
+            # Failed symbols stay out of the universe, so the next Analyze fetches them again
+            failed_symbols = universe.missing_symbols(fetch_symbols)
+            if failed_symbols:
+                st.warning(f"No data for {', '.join(failed_symbols)}; press Analyze Opportunities to retry")
+    elif universe is not None and not universe.covers(max_dte, max_pitm):
+        if not prescreened:
+            st.info("Press Analyze Opportunities to screen the new symbols or wider filters")
+        universe = None
+    elif universe is not None:
+        # Symbols not screened yet (new or failed) are fetched by the next Analyze; the rest still show
+        missing_symbols = universe.missing_symbols(symbols)
+        if missing_symbols:
+            st.info(f"Press Analyze Opportunities to screen {', '.join(missing_symbols)}")
+        if prescreened:
+            age_minutes = (time.time() - universe.created_at) / 60
+            st.caption(
+                f"Pre-screened {'just now' if age_minutes < 1 else f'{age_minutes:.0f} min ago'} · "
+                "press Analyze Opportunities for a live screen"
+            )
+    
+    if universe is not None:
+        filter_start = time.perf_counter()
+        df = best_per_ticker(universe.filter(symbols, max_dte, max_pitm, min_open_interest, min_volume))
+        logger.info(f"Filtered {len(universe.frame)} scored contracts in {(time.perf_counter() - filter_start) * 1000:.1f}ms")
+        if df.empty:
+            results_placeholder.empty()
             st.warning("No options found matching your criteria. Try adjusting the filters.")
             return
         
-        # Create DataFrame and get best result per ticker
-        df = pd.DataFrame(all_results)
-        
-        # Get only the best result for each ticker based on advanced score
-        df = df.loc[df.groupby('Ticker')['sort_score'].idxmax()]
-        
-        # Sort by advanced score (highest first)
-        df = df.sort_values('sort_score', ascending=False)
-        
-        # Reset index to remove the original row numbers and create clean 0,1,2... indexing
-        df = df.reset_index(drop=True)
-        
-        # Remove any empty rows more aggressively
-        df = df.dropna(how='all')  # Drop rows where all values are NaN
-        df = df.dropna(subset=['Ticker'])  # Drop rows where Ticker is NaN/empty
-        
-        # Remove rows with empty or None tickers
-        df = df[df['Ticker'].notna()]
-        df = df[df['Ticker'].astype(str).str.strip() != '']
-        df = df[df['Ticker'].astype(str) != 'nan']
-        
-        # Final cleanup - remove any remaining empty rows
-        # Check if any essential columns are empty
-        essential_cols = ['Ticker', 'Strike Price', 'Annualized Return (%)']
-        for col in essential_cols:
-            if col in df.columns:
-                df = df[df[col].notna()]
-                df = df[df[col].astype(str).str.strip() != '']
-        
-        # Reset index again after all filtering
-        df = df.reset_index(drop=True)
-        
-        # Remove sorting columns
-        df = df.drop(['sort_score', 'sort_expected_return'], axis=1, errors='ignore')
-        
-        # Display results
-        
-
-        # Results section - no header needed
-        
-        # Advanced color coding for new metrics
-        def highlight_advanced_style(val):
-            """Advanced highlighting for new algorithmic metrics"""
-            val_str = str(val)
-            
-            # Score column (primary ranking metric)
-            if val_str.replace('.', '').isdigit() and 'Score' in df.columns:
-                try:
-                    score_val = float(val_str)
-                    if score_val >= 70:
-                        return 'color: #00d09c; font-weight: 600;'  # Excellent score = bright green
-                    elif score_val >= 50:
-                        return 'color: #ffffff; font-weight: 500;'  # Good score = white
-                    elif score_val >= 30:
-                        return 'color: #ffd93d; font-weight: 500;'  # Fair score = yellow
-                    else:
-                        return 'color: #ff6b6b; font-weight: 500;'  # Poor score = red
-                except ValueError:
-                    pass
-            
-            # Expected Return and Annual Return
-            elif ('Return' in val_str or 'Annual Return' in val_str) and '%' in val_str:
-                try:
-                    return_val = float(val_str.rstrip('%'))
-                    if return_val >= 20:
-                        return 'color: #00d09c; font-weight: 500;'  # High return = green
-                    elif return_val >= 12:
-                        return 'color: #ffffff; font-weight: 500;'  # Good return = white
-                    elif return_val >= 6:
-                        return 'color: #9ca3af; font-weight: 400;'  # Fair return = gray
-                    else:
-                        return 'color: #ff6b6b; font-weight: 500;'  # Low return = red
-                except ValueError:
-                    pass
-            
-            # PITM risk assessment
-            elif 'PITM' in val_str or ('PITM' in val_str and '%' in val_str):
-                try:
-                    # Handle both "15.2%" and "15.2" formats
-                    pitm_val = float(val_str.rstrip('%'))
-                    if pitm_val <= 8:
-                        return 'color: #00d09c; font-weight: 500;'  # Low risk = green
-                    elif pitm_val <= 15:
-                        return 'color: #ffffff; font-weight: 500;'  # Medium risk = white  
-                    elif pitm_val <= 25:
-                        return 'color: #ffd93d; font-weight: 500;'  # Higher risk = yellow
-                    else:
-                        return 'color: #ff6b6b; font-weight: 500;'  # High risk = red
-                except ValueError:
-                    pass
-            
-            # Sharpe ratio
-            elif val_str.replace('.', '').replace('-', '').isdigit() and len(val_str) <= 5:
-                try:
-                    sharpe_val = float(val_str)
-                    if sharpe_val >= 1.0:
-                        return 'color: #00d09c; font-weight: 500;'  # Excellent Sharpe = green
-                    elif sharpe_val >= 0.5:
-                        return 'color: #ffffff; font-weight: 500;'  # Good Sharpe = white
-                    elif sharpe_val >= 0.0:
-                        return 'color: #9ca3af; font-weight: 400;'  # Fair Sharpe = gray
-                    else:
-                        return 'color: #ff6b6b; font-weight: 500;'  # Poor Sharpe = red
-                except ValueError:
-                    pass
-            
-            return 'color: #ffffff;'  # Default white text
-        
-        # Calculate dynamic height based on number of rows
-        num_rows = len(df)
-        row_height = 35  # Height per row in pixels
-        header_height = 50  # Height for header row
-        min_height = 200  # Minimum height for small datasets
-        
-        # Simple height calculation
-        dynamic_height = max(min_height, header_height + (num_rows * row_height))
-        
-        # Display styled dataframe with dynamic height
-        styled_df = df.style.map(highlight_advanced_style)
-        st.dataframe(styled_df, use_container_width=True, height=int(dynamic_height), hide_index=True)
+        render_results(df, results_placeholder)
         
     # Cache management at bottom (optional)
     with st.sidebar.expander("Advanced", expanded=False):
-        cache_size = len(mcp_client.cache.cache)
-        st.metric("Cache", f"{cache_size} items")
-        if st.button("Clear Cache", help="Clear all cached data"):
+        cache_stats = mcp_client.cache.stats()
+        st.metric("Cache", f"{cache_stats['entries']} items",
+                  help=f"About {cache_stats['bytes'] / (1024 * 1024):.1f} MB")
+        st.caption(
+            f"Hits: {cache_stats['hits']} · Misses: {cache_stats['misses']} "
+            f"({cache_stats['hit_rate']:.0%} hit rate) · Evictions: {cache_stats['evictions']} · "
+            f"Expired: {cache_stats['expirations']}"
+        )
+        if mcp_client.quote_book is not None:
+            book_stats = mcp_client.quote_book.stats
+            st.caption(
+                f"Live quotes: {book_stats['quotes']} of {book_stats['subscribed']} symbols streaming · "
+                f"{book_stats['updates']} updates" + ("" if book_stats['connected'] else " · not connected")
+            )
+        if st.button("Clear Cache", help="Clear all cached data (shared by all sessions)"):
             mcp_client.cache.clear()
+            if mcp_client.contract_store is not None:
+                mcp_client.contract_store.clear()
+            st.session_state.pop('screen_universe', None)
             st.rerun()
 
     # Enhanced Algorithm Documentation
@@ -1528,7 +657,7 @@ def main():
         **4. Quality Filters**: Verify **Volume**, **OI**, and **Source**
         - Volume >10 for liquidity (when available)
         - OI >25 for market interest
-        - "Alpaca_Real" source preferred over "Estimated"
+        - "Alpaca_Real" source preferred over "Surface" (IV interpolated from the underlying's quoted strikes), "Implied" (Greeks solved locally from the option price) and "Estimated"
         
         **5. Portfolio Construction**: Diversify across uncorrelated positions
         - Don't put >10-15% of capital in single position
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+PutScreenPro CLI - Headless Cash-Secured Put Screener
+Screens symbols with the PutScreenPro engine and writes the results to a file,
+for cron jobs and batch runs over large universes.
+
+Usage:
+    python putscreenpro_cli.py screen --symbols AAPL,MSFT --max-dte 30 --out results.parquet
+
+Exit status:
+    0  every symbol was screened
+    1  no symbol could be screened, or Alpaca or the output file was unusable
+    2  bad arguments
+    3  some symbols failed; results for the others were written
+"""
+
+import argparse
+import logging
+import sys
+import time
+from typing import List, Optional
+
+import pandas as pd
+
+import putscreenpro_engine as engine
+
+# Output formats by file extension; parquet needs pyarrow (or fastparquet) installed
+OUTPUT_FORMATS = {
+    ".csv": "csv",
+    ".json": "json",
+    ".jsonl": "jsonl",
+    ".parquet": "parquet",
+}
+
+# Distinct from 1 (nothing screened) so cron jobs can tell incomplete results apart
+EXIT_PARTIAL_FAILURE = 3
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        prog="putscreenpro", description="Headless cash-secured put screener",
+        epilog="Exit status: 0 all symbols screened, 1 none screened or an error, 2 bad arguments, "
+               "3 some symbols failed (the rest are written)"
+    )
+    parser.add_argument("--config", help="Configuration file (default: the config.json next to putscreenpro_engine.py)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log progress to stderr")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    screen = commands.add_parser("screen", help="Screen symbols and write the matching contracts to a file")
+    screen.add_argument("--symbols", help="Comma-separated symbols (default: default_symbols from the config)")
+    screen.add_argument("--symbols-file", help="File with symbols, one per line or comma-separated")
+    screen.add_argument("--max-dte", type=int, help="Maximum days to expiration (default: filter_defaults.max_dte)")
+    screen.add_argument("--max-pitm", type=float, help="Maximum probability ITM %% (default: filter_defaults.max_pitm)")
+    screen.add_argument("--min-oi", type=int, help="Minimum open interest (default: filter_defaults.min_open_interest)")
+    screen.add_argument("--min-volume", type=int, help="Minimum volume (default: filter_defaults.min_volume)")
+    screen.add_argument("--best-only", action="store_true", help="Keep only the highest-scoring contract per symbol")
+    screen.add_argument("--out", required=True,
+                        help="Output file; the format follows the extension: .csv, .json, .jsonl or .parquet")
+    return parser.parse_args(argv)
+
+def write_results(df: pd.DataFrame, path: str, output_format: str) -> None:
+    """Write screening results in the given format"""
+    if output_format == "csv":
+        df.to_csv(path, index=False)
+    elif output_format == "json":
+        df.to_json(path, orient="records", date_format="iso", indent=2)
+    elif output_format == "jsonl":
+        df.to_json(path, orient="records", date_format="iso", lines=True)
+    else:
+        df.to_parquet(path, index=False)
+
+def run_screen(args: argparse.Namespace) -> int:
+    """Run the screen command and return the process exit code"""
+    extension = args.out[args.out.rfind("."):].lower() if "." in args.out else ""
+    output_format = OUTPUT_FORMATS.get(extension)
+    if output_format is None:
+        print(f"Unsupported output file '{args.out}'. Use one of: {', '.join(OUTPUT_FORMATS)}", file=sys.stderr)
+        return 2
+
+    symbols_input = args.symbols or engine.get_config_value(engine.config, 'default_symbols', "")
+    if args.symbols_file:
+        with open(args.symbols_file) as f:
+            symbols_input = ",".join(line for line in f.read().splitlines() if not line.startswith("#"))
+    symbols = list(dict.fromkeys(engine.parse_symbols(symbols_input)))
+    if not symbols:
+        print("No symbols to screen", file=sys.stderr)
+        return 2
+
+    def setting(value, key_path: str, default):
+        return value if value is not None else engine.get_config_value(engine.config, key_path, default)
+
+    max_dte = setting(args.max_dte, 'filter_defaults.max_dte', 20)
+    max_pitm = setting(args.max_pitm, 'filter_defaults.max_pitm', 20)
+    min_open_interest = setting(args.min_oi, 'filter_defaults.min_open_interest', 10)
+    min_volume = setting(args.min_volume, 'filter_defaults.min_volume', 0)
+
+    try:
+        client = engine.MCPAlpacaClient()
+    except (engine.MCPServerError, ValueError) as e:
+        print(f"Could not connect to Alpaca: {e}", file=sys.stderr)
+        return 1
+
+    start_time = time.time()
+    universe = engine.screen(client, symbols, max_dte, max_pitm)
+    df = universe.filter(symbols, max_dte, max_pitm, min_open_interest, min_volume)
+    if args.best_only:
+        df = engine.best_per_ticker(df)
+    elif not df.empty:
+        df = df.sort_values('Score', ascending=False).reset_index(drop=True)
+
+    try:
+        write_results(df, args.out, output_format)
+    except ImportError as e:
+        print(f"Writing {output_format} needs an optional dependency (pip install pyarrow): {e}", file=sys.stderr)
+        return 1
+
+    failed = universe.missing_symbols(symbols)
+    print(
+        f"Screened {len(symbols) - len(failed)}/{len(symbols)} symbols in {time.time() - start_time:.1f}s; "
+        f"wrote {len(df)} contracts to {args.out}",
+        file=sys.stderr
+    )
+    if failed:
+        print(f"Failed: {', '.join(failed)}", file=sys.stderr)
+    if not failed:
+        return 0
+    return EXIT_PARTIAL_FAILURE if len(failed) < len(symbols) else 1
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_arguments(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        stream=sys.stderr
+    )
+
+    engine.config.clear()
+    engine.config.update(engine.load_config(args.config))
+    # A one-shot run gains nothing from websocket quote streams
+    engine.config.setdefault('streaming', {})['enabled'] = False
+
+    if args.command == "screen":
+        return run_screen(args)
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,2427 @@
+#!/usr/bin/env python3
+"""
+PutScreenPro Engine - Cash-Secured Put Screening Engine
+The UI-free core of PutScreenPro: configuration, the Alpaca MCP client, option
+metrics, filtering and ranking. Used by the Streamlit app and the command line.
+"""
+
+import pandas as pd
+import numpy as np
+from datetime import datetime, date, timedelta
+import json
+import sys
+import asyncio
+import math
+import logging
+import threading
+import time
+import os
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import Future, as_completed
+from typing import Iterator, List, Dict, Optional, Any, Tuple
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+# The config.json shipped next to this module, whatever the working directory
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+
+# Configuration loading functions
+def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
+    """Load configuration from a JSON file (DEFAULT_CONFIG_PATH if not given)"""
+    config_path = config_path or DEFAULT_CONFIG_PATH
+    try:
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as file:
+                config = json.load(file)
+                logger.info(f"Configuration loaded from {config_path}")
+                return config
+        else:
+            logger.warning(f"Config file {config_path} not found, using defaults")
+            return get_default_config()
+    except Exception as e:
+        logger.error(f"Error loading config file {config_path}: {e}")
+        return get_default_config()
+
+def get_default_config() -> Dict[str, Any]:
+    """Return default configuration if file is missing"""
+    return {
+        "default_symbols": "AAPL,MSFT,GOOGL,TSLA,NVDA",
+        "ui_settings": {
+            "page_title": "PutScreenPro",
+            "page_icon": None
+        },
+        "filter_defaults": {
+            "max_dte": 20,
+            "max_pitm": 20,
+            "min_open_interest": 10,
+            "min_volume": 0
+        },
+        "processing": {
+            "fast_processing_default": True,
+            "max_parallel_workers": 4,
+            "snapshot_batch_size": 100,
+            "use_option_chain": True,
+            "async_client": True,
+            "strike_pushdown": True,
+            "max_implied_volatility": 3.0,
+            "max_risk_free_rate": 0.1,
+            "delta_pruning": False,
+            "delta_probe_count": 8,
+            "solve_greeks": True,
+            "quote_only": False,
+            "volatility_surface": True,
+            "max_concurrency": 8,
+            "rate_limit_per_minute": 200,
+            "latency_target": 10,
+            "verify_account_on_start": False
+        },
+        "streaming": {
+            "enabled": True,
+            "max_quote_age": 5,
+            "max_symbols": 500,
+            "option_quotes": False
+        },
+        "prescreen": {
+            "enabled": True,
+            "interval": 300,
+            "path": ".cache/prescreen.parquet"
+        },
+        "contract_store": {
+            "enabled": True,
+            "path": ".cache/contracts.sqlite"
+        },
+        "cache": {
+            "default_ttl": 300,
+            "quote_ttl": 30,
+            "snapshot_ttl": 30,
+            "surface_ttl": 120,
+            "session_ttl": 300,
+            "negative_ttl": 60,
+            "max_entries": 5000,
+            "max_mb": 64
+        }
+    }
+
+def get_config_value(config: Dict[str, Any], key_path: str, default: Any = None) -> Any:
+    """Get configuration value using dot notation (e.g., 'filter_defaults.max_dte')"""
+    try:
+        keys = key_path.split('.')
+        value = config
+        for key in keys:
+            value = value[key]
+        return value
+    except (KeyError, TypeError):
+        return default
+
+# Load configuration
+config = load_config()
+
+# Offline replays (benchmarks/replay.py) pin the date, since recorded requests embed expiration dates
+_pinned_date: Optional[date] = None
+
+def pin_current_date(as_of: Optional[date]) -> None:
+    """Screen as of the given date instead of the calendar date (None unpins)"""
+    global _pinned_date
+    _pinned_date = as_of
+
+def current_date() -> date:
+    """The date screens run as of: today, unless pinned with pin_current_date"""
+    return _pinned_date or date.today()
+
+class _StandardNormal:
+    """Standard normal cdf, pdf and ppf with the same results as scipy.stats.norm
+    
+    Built on scipy.special, imported on first use: importing scipy.stats costs
+    about a second on a cold start, most of which this module never needs.
+    """
+    
+    @staticmethod
+    def cdf(x):
+        from scipy.special import ndtr
+        return ndtr(x)
+    
+    @staticmethod
+    def pdf(x):
+        return np.exp(-np.square(x) / 2.0) / np.sqrt(2 * np.pi)
+    
+    @staticmethod
+    def ppf(q):
+        from scipy.special import ndtri
+        return ndtri(q)
+
+norm = _StandardNormal()
+
+class DataValidationError(Exception):
+    """Custom exception for data validation errors"""
+    pass
+
+class MCPServerError(Exception):
+    """Raised when the Alpaca MCP server module cannot be imported or does not respond"""
+    pass
+
+class RateLimitError(Exception):
+    """Raised when the Alpaca API is still rate limiting requests after the server's retries"""
+    pass
+
+class SymbolFetchError(Exception):
+    """Raised when a symbol's quote or contracts could not be fetched, as opposed to it having no qualifying options"""
+    pass
+
+class CacheManager:
+    """Thread-safe in-memory LRU cache for API responses with per-entry TTL
+    
+    Entries are evicted least-recently-used first once the cache exceeds
+    max_entries or (approximately) max_bytes. Keys known to have no data can be
+    cached as NEGATIVE so repeated lookups skip the upstream request.
+    """
+    
+    # Stored for keys that returned no data (negative caching)
+    NEGATIVE = object()
+    # Values are sized from at most this many items per container, this many levels deep
+    SIZE_SAMPLE = 32
+    SIZE_DEPTH = 6
+    
+    def __init__(self, default_ttl: int = 300, max_entries: int = 5000,
+                 max_bytes: int = 64 * 1024 * 1024, negative_ttl: int = 60):
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.negative_ttl = negative_ttl
+        # key -> (value, expires_at, approximate size in bytes), oldest access first
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get cached value if not expired (may be NEGATIVE)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            # Check if expired
+            if time.monotonic() >= entry[1]:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Set cache value with TTL (default_ttl if not given)"""
+        size = self._approximate_size(value)
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+            self._evict()
+        logger.debug(f"Cached: {key}")
+    
+    def set_negative(self, key: str, ttl: Optional[int] = None) -> None:
+        """Remember that a key has no data for negative_ttl seconds"""
+        self.set(key, self.NEGATIVE, self.negative_ttl if ttl is None else ttl)
+    
+    def _remove(self, key: str) -> None:
+        """Remove a cache entry (caller holds the lock)"""
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+    
+    def _evict(self) -> None:
+        """Drop expired entries, then least recently used ones, until within bounds (caller holds the lock)"""
+        if len(self._entries) <= self.max_entries and self._bytes <= self.max_bytes:
+            return
+        
+        now = time.monotonic()
+        for key in [key for key, entry in self._entries.items() if now >= entry[1]]:
+            self._remove(key)
+            self.expirations += 1
+        
+        # Always keep the newest entry, even if it alone exceeds max_bytes
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+    
+    @classmethod
+    def _approximate_size(cls, value: Any, depth: int = 0) -> int:
+        """Estimate the memory used by a cached value, including nested containers and numpy arrays
+        
+        Objects are sized by their attributes. Containers longer than SIZE_SAMPLE are extrapolated from evenly spaced
+        items, and nesting deeper than SIZE_DEPTH is not followed, so sizing a
+        large contract listing on set() stays cheap.
+        """
+        size = sys.getsizeof(value)
+        if isinstance(value, np.ndarray):
+            # getsizeof only includes the data of arrays that own it
+            return size + (value.nbytes if value.base is not None else 0)
+        if depth >= cls.SIZE_DEPTH:
+            return size
+        
+        if isinstance(value, dict):
+            return size + cls._sample_size(list(value), depth) + cls._sample_size(list(value.values()), depth)
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return size + cls._sample_size(list(value), depth)
+        if hasattr(value, '__dict__') and not isinstance(value, type):
+            return size + cls._approximate_size(vars(value), depth + 1)
+        return size
+    
+    @classmethod
+    def _sample_size(cls, items: List, depth: int) -> int:
+        """Total size of items nested at depth, extrapolated from at most SIZE_SAMPLE evenly spaced ones"""
+        if not items:
+            return 0
+        sample = items[::math.ceil(len(items) / cls.SIZE_SAMPLE)]
+        return sum(cls._approximate_size(item, depth + 1) for item in sample) * len(items) // len(sample)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return entry count, approximate size and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+    
+    def clear(self) -> None:
+        """Clear all cache entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = self.expirations = 0
+        logger.info("Cache cleared")
+
+class ContractMetadataStore:
+    """SQLite-backed store for option contract metadata, valid for one trading day
+    
+    Contract listings (strikes, expirations, OCC symbols, open interest, close
+    price) change at most once a day, so discovery results are persisted per
+    underlying and expiration and reused until the trading day rolls over.
+    A coverage row records the furthest expiration and the strike ceiling (if
+    any) a complete discovery covered, so narrower requests can be answered
+    from the store as well: a listing stored with a higher ceiling, or none,
+    serves any lower ceiling. Coverage is one (expiration, ceiling) window per
+    underlying, so with strike pushdown every stored listing has a ceiling and
+    only serves requests at or below it; a later discovery reaching further out
+    under a lower ceiling replaces a wider one, and requests for all strikes
+    (no ceiling) are only served by listings stored without one.
+    
+    The whole current trading day is loaded into memory by warm(); lookups never
+    touch the disk. Stale rows from earlier trading days are deleted on warm(),
+    and entries held in memory are dropped once the trading day rolls over.
+    warm(), put() and clear() do blocking SQLite I/O and are serialized by a
+    write lock that get() never takes, so callers on an event loop run them in
+    an executor.
+    """
+    
+    MARKET_TIMEZONE = ZoneInfo("America/New_York")
+    # Bumped whenever the tables change; older stores are rebuilt (they only hold one day of data)
+    SCHEMA_VERSION = 2
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # Serializes disk writes; held without _lock so lookups never wait on SQLite
+        self._write_lock = threading.Lock()
+        # (underlying, contract_type) -> (covered through, strike ceiling or None, {expiration: contracts sorted by strike})
+        self._entries: Dict[Tuple[str, str], Tuple[date, Optional[float], Dict[date, List[Dict]]]] = {}
+        self._trading_day: Optional[date] = None
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+                conn.executescript("DROP TABLE IF EXISTS coverage; DROP TABLE IF EXISTS contracts;")
+                conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS coverage (
+                    underlying TEXT NOT NULL,
+                    contract_type TEXT NOT NULL,
+                    covered_through TEXT NOT NULL,
+                    strike_price_lte REAL,
+                    trading_day TEXT NOT NULL,
+                    PRIMARY KEY (underlying, contract_type)
+                );
+                CREATE TABLE IF NOT EXISTS contracts (
+                    symbol TEXT PRIMARY KEY,
+                    underlying TEXT NOT NULL,
+                    contract_type TEXT NOT NULL,
+                    expiration_date TEXT NOT NULL,
+                    name TEXT,
+                    strike_price REAL NOT NULL,
+                    open_interest INTEGER NOT NULL,
+                    close_price REAL NOT NULL,
+                    trading_day TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS contracts_by_expiration
+                    ON contracts (underlying, contract_type, expiration_date);
+            """)
+    
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+    
+    @classmethod
+    def current_trading_day(cls) -> date:
+        """Today's date in New York, rolled back to Friday on weekends"""
+        today = datetime.now(cls.MARKET_TIMEZONE).date()
+        if today.weekday() >= 5:
+            today -= timedelta(days=today.weekday() - 4)
+        return today
+    
+    def warm(self) -> int:
+        """Load the current trading day's contracts into memory and drop older rows
+        
+        Returns the number of contracts loaded.
+        """
+        current_day = self.current_trading_day()
+        trading_day = current_day.isoformat()
+        entries: Dict[Tuple[str, str], Tuple[date, Optional[float], Dict[date, List[Dict]]]] = {}
+        
+        with self._write_lock, self._connect() as conn:
+            conn.execute("DELETE FROM coverage WHERE trading_day != ?", (trading_day,))
+            conn.execute("DELETE FROM contracts WHERE trading_day != ?", (trading_day,))
+            
+            for underlying, contract_type, covered_through, strike_price_lte in conn.execute(
+                "SELECT underlying, contract_type, covered_through, strike_price_lte FROM coverage"
+            ):
+                entries[(underlying, contract_type)] = (date.fromisoformat(covered_through), strike_price_lte, {})
+            
+            rows = conn.execute(
+                "SELECT underlying, contract_type, expiration_date, symbol, name, strike_price, "
+                "open_interest, close_price FROM contracts ORDER BY strike_price"
+            )
+            count = 0
+            for underlying, contract_type, expiration, symbol, name, strike, open_interest, close_price in rows:
+                entry = entries.get((underlying, contract_type))
+                if entry is None:
+                    continue
+                entry[2].setdefault(date.fromisoformat(expiration), []).append({
+                    'symbol': symbol,
+                    'name': name,
+                    'strike_price': strike,
+                    'expiration_date': expiration,
+                    'open_interest': open_interest,
+                    'close_price': close_price
+                })
+                count += 1
+        
+        with self._lock:
+            self._entries = entries
+            self._trading_day = current_day
+        logger.info(f"Contract store warmed with {count} contracts for {len(entries)} underlyings")
+        return count
+    
+    @staticmethod
+    def _covers(entry: Optional[Tuple], end_date: date, strike_price_lte: Optional[float]) -> bool:
+        """Whether a stored entry includes every contract of the requested window"""
+        if entry is None or entry[0] < end_date:
+            return False
+        return entry[1] is None or (strike_price_lte is not None and entry[1] >= strike_price_lte)
+    
+    def _entry(self, underlying: str, contract_type: str) -> Optional[Tuple]:
+        """The in-memory entry for an underlying, after dropping every entry from an earlier trading day"""
+        trading_day = self.current_trading_day()
+        with self._lock:
+            if trading_day != self._trading_day:
+                self._entries = {}
+                self._trading_day = trading_day
+            return self._entries.get((underlying, contract_type))
+    
+    def get(self, underlying: str, contract_type: str, start_date: date, end_date: date,
+            strike_price_lte: Optional[float] = None) -> Optional[Dict[date, List[Dict]]]:
+        """Return contracts expiring between start_date and end_date (and at or below
+        strike_price_lte, if given), or None if not covered"""
+        entry = self._entry(underlying, contract_type)
+        if not self._covers(entry, end_date, strike_price_lte):
+            return None
+        
+        contracts_by_exp = {}
+        for exp_date, options in sorted(entry[2].items()):
+            if start_date <= exp_date <= end_date:
+                if strike_price_lte is not None:
+                    options = [option for option in options if option['strike_price'] <= strike_price_lte]
+                if options:
+                    contracts_by_exp[exp_date] = options
+        return contracts_by_exp
+    
+    def put(self, underlying: str, contract_type: str, covered_through: date,
+            contracts_by_exp: Dict[date, List[Dict]], strike_price_lte: Optional[float] = None) -> None:
+        """Persist a complete discovery result covering expirations up to covered_through
+        and strikes up to strike_price_lte (all strikes if None)"""
+        trading_day = self.current_trading_day().isoformat()
+        with self._write_lock:
+            entry = self._entry(underlying, contract_type)
+            if self._covers(entry, covered_through, strike_price_lte):
+                return
+            
+            with self._connect() as conn:
+                conn.execute(
+                    "DELETE FROM contracts WHERE underlying = ? AND contract_type = ?",
+                    (underlying, contract_type)
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO contracts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (option['symbol'], underlying, contract_type, exp_date.isoformat(), option.get('name'),
+                         option['strike_price'], option['open_interest'], option['close_price'], trading_day)
+                        for exp_date, options in contracts_by_exp.items()
+                        for option in options
+                    ]
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO coverage VALUES (?, ?, ?, ?, ?)",
+                    (underlying, contract_type, covered_through.isoformat(), strike_price_lte, trading_day)
+                )
+            with self._lock:
+                self._entries[(underlying, contract_type)] = (covered_through, strike_price_lte, dict(contracts_by_exp))
+    
+    def clear(self) -> None:
+        """Delete all stored contracts"""
+        with self._write_lock:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM coverage")
+                conn.execute("DELETE FROM contracts")
+            with self._lock:
+                self._entries = {}
+
+class VolatilitySurface:
+    """Implied-volatility surface for one underlying, built from snapshot IVs
+    
+    Each expiration with at least two quoted strikes becomes a slice; IV is
+    interpolated linearly in log-moneyness ln(K/S) within a slice and linearly
+    in total variance (sigma^2 * T) between neighbouring slices. Moneyness is
+    taken against the spot at lookup time, so a cached surface follows small
+    price moves. Lookups outside the quoted strikes or expirations return NaN
+    rather than extrapolating the smile.
+    """
+    
+    def __init__(self, stock_price: float, strikes: np.ndarray, days_to_expiration: np.ndarray,
+                 implied_volatility: np.ndarray):
+        strikes = np.asarray(strikes, dtype=float)
+        days_to_expiration = np.asarray(days_to_expiration)
+        implied_volatility = np.asarray(implied_volatility, dtype=float)
+        usable = (strikes > 0) & (days_to_expiration > 0) & (implied_volatility > 0)
+        
+        # (T in years, sorted log-moneyness, matching IVs) per expiration
+        self.slices: List[Tuple[float, np.ndarray, np.ndarray]] = []
+        for days in np.unique(days_to_expiration[usable]):
+            in_slice = usable & (days_to_expiration == days)
+            log_moneyness = np.log(strikes[in_slice] / stock_price)
+            order = np.argsort(log_moneyness)
+            log_moneyness, sigma = log_moneyness[order], implied_volatility[in_slice][order]
+            if len(np.unique(log_moneyness)) >= 2:
+                self.slices.append((days / 365.0, log_moneyness, sigma))
+    
+    def __len__(self) -> int:
+        return len(self.slices)
+    
+    def _slice_volatility(self, index: int, log_moneyness: np.ndarray) -> np.ndarray:
+        _, points, sigma = self.slices[index]
+        return np.where(
+            (log_moneyness >= points[0]) & (log_moneyness <= points[-1]),
+            np.interp(log_moneyness, points, sigma),
+            np.nan
+        )
+    
+    def implied_volatility(self, stock_price: float, strikes: np.ndarray,
+                           days_to_expiration: np.ndarray) -> np.ndarray:
+        """Interpolated IV (decimal) for each strike and days to expiration, NaN where not covered"""
+        strikes = np.asarray(strikes, dtype=float)
+        T = np.asarray(days_to_expiration, dtype=float) / 365.0
+        result = np.full(strikes.shape, np.nan)
+        if not self.slices:
+            return result
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_moneyness = np.log(strikes / stock_price)
+        expiries = np.array([slice_T for slice_T, _, _ in self.slices])
+        
+        # Chains have few expirations, so work one target expiration at a time
+        for target in np.unique(T[(T >= expiries[0]) & (T <= expiries[-1])]):
+            rows = T == target
+            j = int(np.searchsorted(expiries, target))
+            if expiries[j] == target:
+                result[rows] = self._slice_volatility(j, log_moneyness[rows])
+                continue
+            near = self._slice_volatility(j - 1, log_moneyness[rows])
+            far = self._slice_volatility(j, log_moneyness[rows])
+            weight = (target - expiries[j - 1]) / (expiries[j] - expiries[j - 1])
+            total_variance = (1 - weight) * near**2 * expiries[j - 1] + weight * far**2 * expiries[j]
+            result[rows] = np.sqrt(total_variance / target)
+        return result
+
+class MCPAlpacaClient:
+    """Client to interact with the Alpaca MCP server"""
+    
+    # Contract discovery paging (Alpaca allows up to 10000 contracts per page)
+    DISCOVERY_PAGE_SIZE = 10000
+    MAX_DISCOVERY_PAGES = 20
+    
+    def __init__(self):
+        """Initialize the MCP client"""
+        self.cache = CacheManager(
+            default_ttl=get_config_value(config, 'cache.default_ttl', 300),
+            max_entries=get_config_value(config, 'cache.max_entries', 5000),
+            max_bytes=get_config_value(config, 'cache.max_mb', 64) * 1024 * 1024,
+            negative_ttl=get_config_value(config, 'cache.negative_ttl', 60)
+        )
+        # Contract listings persist on disk for the trading day; they are loaded in the background below
+        self.contract_store = None
+        if get_config_value(config, 'contract_store.enabled', True):
+            try:
+                self.contract_store = ContractMetadataStore(
+                    get_config_value(config, 'contract_store.path', '.cache/contracts.sqlite')
+                )
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Contract store unavailable, contracts will be fetched from Alpaca: {str(e)}")
+                self.contract_store = None
+        # Market data goes stale much faster than contract listings
+        self.quote_ttl = get_config_value(config, 'cache.quote_ttl', 30)
+        self.snapshot_ttl = get_config_value(config, 'cache.snapshot_ttl', 30)
+        # Alpaca accepts up to 100 symbols per snapshot request
+        self.snapshot_batch_size = get_config_value(config, 'processing.snapshot_batch_size', 100)
+        # Fetch a whole chain per symbol instead of per-expiration snapshot batches
+        self.use_option_chain = get_config_value(config, 'processing.use_option_chain', True)
+        # Only request strikes that can pass the max PITM filter, assuming IV never exceeds this bound
+        self.strike_pushdown = get_config_value(config, 'processing.strike_pushdown', True)
+        self.max_implied_volatility = get_config_value(config, 'processing.max_implied_volatility', 3.0)
+        # Upper bound on the rate behind Alpaca's Greeks; never below the 5% the local estimates use
+        self.max_risk_free_rate = max(0.05, get_config_value(config, 'processing.max_risk_free_rate', 0.1))
+        # Without a chain, binary-search each expiration's delta boundary with batches of probe snapshots
+        self.delta_pruning = get_config_value(config, 'processing.delta_pruning', False)
+        # At least one probe per round, or the search never narrows
+        self.delta_probe_count = max(1, int(get_config_value(config, 'processing.delta_probe_count', 8)))
+        # Solve IV and Greeks locally for contracts without them; quote_only skips snapshots entirely
+        self.solve_greeks = get_config_value(config, 'processing.solve_greeks', True)
+        self.quote_only = get_config_value(config, 'processing.quote_only', False)
+        # Interpolate missing Greeks from a per-underlying IV surface built from snapshot IVs
+        self.use_volatility_surface = get_config_value(config, 'processing.volatility_surface', True)
+        self.surface_ttl = get_config_value(config, 'cache.surface_ttl', 120)
+        
+        # Import the MCP server module once and build the dispatch table up front
+        self._dispatch = self._build_dispatch_table()
+        
+        # Streamed quotes are read straight from the server's in-memory books; REST is the fallback
+        self.stream_max_age = get_config_value(config, 'streaming.max_quote_age', 5)
+        self.quote_book = None
+        self.option_quote_book = None
+        if get_config_value(config, 'streaming.enabled', True):
+            self.quote_book = self._server.stock_quote_book
+            if get_config_value(config, 'streaming.option_quotes', False):
+                self.option_quote_book = self._server.option_quote_book
+            # Symbols beyond this (per stream) are unsubscribed, least recently used first
+            max_symbols = get_config_value(config, 'streaming.max_symbols', 500)
+            self._server.stock_quote_book.max_symbols = max_symbols
+            self._server.option_quote_book.max_symbols = max_symbols
+        
+        # One long-lived event loop runs every MCP call; the semaphore caps in-flight calls
+        self.max_concurrency = get_config_value(config, 'processing.max_concurrency', 8)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever, name="mcp-client-loop", daemon=True
+        )
+        self._loop_thread.start()
+        # Upstream requests currently running, keyed by request; only touched on the client loop
+        self._in_flight: Dict[Any, asyncio.Task] = {}
+        # Load the contract store off the loop; lookups wait for it (see _acontract_store)
+        self._contract_store_warm: Optional[Future] = None
+        if self.contract_store is not None:
+            self._contract_store_warm = asyncio.run_coroutine_threadsafe(self._awarm_contract_store(), self._loop)
+        
+        self.server_running = self._check_mcp_server()
+        if not self.server_running:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            raise MCPServerError(
+                "Alpaca MCP server is not ready. Please check the Alpaca API credentials and start it first."
+            )
+    
+    def _build_dispatch_table(self) -> Dict[str, Any]:
+        """Import the MCP server module and map function names to its tool coroutines"""
+        # The MCP tools are called in-process: import the alpaca_mcp_server module
+        # from this directory and call its tool functions directly
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        if current_dir not in sys.path:
+            sys.path.insert(0, current_dir)
+        
+        try:
+            import alpaca_mcp_server as mcp
+        except ImportError as e:
+            raise MCPServerError(
+                "Could not import alpaca_mcp_server module. Please ensure it's in the same directory."
+            ) from e
+        
+        # Every upstream call in this process shares one request budget
+        mcp.configure_rate_limit(get_config_value(config, 'processing.rate_limit_per_minute', 200))
+        mcp.configure_latency_target(get_config_value(config, 'processing.latency_target', 10))
+        self._server = mcp
+        
+        return {
+            "mcp_alpaca_get_stock_quote": mcp.get_stock_quote,
+            "mcp_alpaca_get_option_contracts": mcp.get_option_contracts,
+            "mcp_alpaca_get_option_snapshot": mcp.get_option_snapshot,
+            "mcp_alpaca_get_option_chain": mcp.get_option_chain,
+            "mcp_alpaca_get_account_info": mcp.get_account_info
+        }
+    
+    def _run(self, coro) -> Any:
+        """Run a coroutine on the client's event loop and wait for its result"""
+        if threading.current_thread() is self._loop_thread:
+            raise RuntimeError("Synchronous client methods cannot be called from the client event loop")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+    
+    def _check_mcp_server(self) -> bool:
+        """Check that the MCP server can serve requests
+        
+        By default this is the server's cheap readiness probe (credentials are
+        configured); processing.verify_account_on_start adds an account round trip.
+        """
+        if not self._server.credentials_configured():
+            return False
+        if not get_config_value(config, 'processing.verify_account_on_start', False):
+            return True
+        
+        try:
+            # Try to call a simple function to test connectivity
+            result = self._call_mcp_function("mcp_alpaca_get_account_info", {})
+            return result is not None
+        except Exception:
+            return False
+    
+    async def _awarm_contract_store(self) -> None:
+        """Load the contract store in an executor, dropping the store if its disk is unusable"""
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self.contract_store.warm)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Contract store unavailable, contracts will be fetched from Alpaca: {str(e)}")
+            self.contract_store = None
+    
+    async def _acontract_store(self) -> Optional[ContractMetadataStore]:
+        """The contract store once warmed, or None if disabled or unavailable"""
+        if self._contract_store_warm is not None and not self._contract_store_warm.done():
+            await asyncio.wrap_future(self._contract_store_warm)
+        return self.contract_store
+    
+    async def _acall_mcp_function(self, function_name: str, params: Dict) -> Optional[Dict]:
+        """Call an MCP function on the client event loop and return the result
+        
+        Params are passed to the tool as keyword arguments, so keys must match
+        the tool's argument names.
+        """
+        function = self._dispatch.get(function_name)
+        if function is None:
+            logger.error(f"Unknown MCP function: {function_name}")
+            return None
+        
+        try:
+            async with self._semaphore:
+                result = await function(**params)
+            return {"result": result}
+        except Exception as e:
+            logger.error(f"Error calling MCP function {function_name}: {str(e)}")
+            return None
+    
+    def _call_mcp_function(self, function_name: str, params: Dict) -> Optional[Dict]:
+        """Call an MCP function and return the result"""
+        return self._run(self._acall_mcp_function(function_name, params))
+    
+    async def _single_flight(self, key: Any, fetch, *args) -> Any:
+        """Coalesce concurrent identical requests into one upstream call
+        
+        The first caller for a key starts fetch(*args); callers that arrive while it
+        is running await the same task instead of issuing their own request.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch(*args))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # Shielded so one caller being cancelled does not cancel the others
+        return await asyncio.shield(task)
+    
+    @staticmethod
+    def _raise_if_rate_limited(payload: Dict) -> None:
+        """Raise RateLimitError for an error result caused by upstream throttling
+        
+        Rate limited requests must not be mistaken for "no data", so they are
+        surfaced to the caller instead of being logged and dropped.
+        """
+        if payload.get("rate_limited"):
+            raise RateLimitError(payload.get("error", "Alpaca API rate limit exceeded"))
+    
+    def get_stock_quote(self, symbol: str) -> Optional[Dict]:
+        """Get current stock quote using MCP server with caching"""
+        return self._run(self.aget_stock_quote(symbol))
+    
+    async def aget_stock_quote(self, symbol: str) -> Optional[Dict]:
+        """Get current stock quote using MCP server with caching (async)"""
+        return await self._single_flight(("quote", symbol), self._aget_stock_quote, symbol)
+    
+    async def _aget_stock_quote(self, symbol: str) -> Optional[Dict]:
+        """Fetch a stock quote, checking the cache first"""
+        if not symbol or not symbol.strip():
+            raise DataValidationError("Empty symbol provided")
+        
+        symbol = symbol.upper().strip()
+        cache_key = f"quote_{symbol}"
+        
+        # A fresh streamed quote beats any cached or REST one; unseen symbols start streaming now
+        if self.quote_book is not None:
+            quote = self.quote_book.get(symbol, self.stream_max_age)
+            if quote is None:
+                self.quote_book.subscribe([symbol])
+            elif quote.get('ask_price') and quote.get('bid_price'):
+                return self._to_quote_data(symbol, quote)
+        
+        # Try cache first
+        cached_result = self.cache.get(cache_key)
+        if cached_result:
+            logger.debug(f"Cache hit for quote: {symbol}")
+            return cached_result
+            
+        try:
+            result = await self._acall_mcp_function(
+                "mcp_alpaca_get_stock_quote", {"symbol": symbol, "output_format": "json"}
+            )
+            
+            if not result or "result" not in result:
+                raise DataValidationError(f"No quote data returned for {symbol}")
+            
+            payload = result["result"]
+            if "error" in payload:
+                self._raise_if_rate_limited(payload)
+                raise DataValidationError(payload["error"])
+            
+            quote = payload.get("quote")
+            if not quote:
+                raise DataValidationError(f"Empty quote response for {symbol}")
+            
+            # Ensure we have both bid and ask
+            if quote.get('ask_price') is None or quote.get('bid_price') is None:
+                raise DataValidationError(f"Incomplete quote data for {symbol} - missing bid or ask")
+            
+            quote_data = self._to_quote_data(symbol, quote)
+            
+            # Cache the result (quotes expire quickly)
+            self.cache.set(cache_key, quote_data, ttl=self.quote_ttl)
+            return quote_data
+            
+        except (DataValidationError, RateLimitError):
+            raise  # Re-raise validation and rate limit errors
+        except ConnectionError:
+            raise DataValidationError(f"Connection error while fetching quote for {symbol}")
+        except Exception as e:
+            raise DataValidationError(f"Unexpected error fetching quote for {symbol}: {str(e)}")
+    
+    @staticmethod
+    def _to_quote_data(symbol: str, quote: Dict) -> Dict:
+        """Convert a server quote record to the screener's quote dict"""
+        return {
+            'ask': quote['ask_price'],
+            'bid': quote['bid_price'],
+            'mid_price': (quote['ask_price'] + quote['bid_price']) / 2,
+            'symbol': symbol
+        }
+    
+    def _streamed_option_quotes(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Fresh bid/ask for option contracts from the streamed option book, keyed by symbol
+        
+        Contracts without a fresh quote are subscribed so later screens can use them.
+        """
+        if self.option_quote_book is None:
+            return {}
+        self.option_quote_book.subscribe(symbols)
+        quotes = {}
+        for option_symbol in symbols:
+            quote = self.option_quote_book.get(option_symbol, self.stream_max_age)
+            if quote is not None:
+                quotes[option_symbol] = {'bid': quote['bid_price'], 'ask': quote['ask_price']}
+        return quotes
+    
+    def get_option_contracts(self, symbol: str, expiration_date: date, contract_type: str = "put") -> List[Dict]:
+        """Get option contracts for a symbol and expiration date using MCP server"""
+        return self._run(self.aget_option_contracts(symbol, expiration_date, contract_type))
+    
+    async def aget_option_contracts(self, symbol: str, expiration_date: date, contract_type: str = "put") -> List[Dict]:
+        """Get option contracts for a symbol and expiration date using MCP server (async)"""
+        return await self._single_flight(
+            ("contracts", symbol, expiration_date, contract_type.lower()),
+            self._aget_option_contracts, symbol, expiration_date, contract_type
+        )
+    
+    async def _aget_option_contracts(self, symbol: str, expiration_date: date, contract_type: str) -> List[Dict]:
+        """Fetch option contracts for one expiration, checking the cache first"""
+        # Format the expiration date as string
+        exp_date_str = expiration_date.strftime("%Y-%m-%d")
+        cache_key = f"contracts_{symbol}_{contract_type.lower()}_{exp_date_str}"
+        
+        cached_result = self.cache.get(cache_key)
+        if cached_result is CacheManager.NEGATIVE:
+            return []
+        if cached_result is not None:
+            return cached_result
+        
+        contract_store = await self._acontract_store()
+        if contract_store is not None:
+            stored_result = contract_store.get(symbol, contract_type.lower(), expiration_date, expiration_date)
+            if stored_result is not None:
+                return stored_result.get(expiration_date, [])
+        
+        try:
+            params = {
+                "underlying_symbol": symbol,
+                "expiration_date": exp_date_str,
+                "type": contract_type.lower(),
+                "status": "active",
+                "limit": 100,
+                "output_format": "json"
+            }
+            
+            result = await self._acall_mcp_function("mcp_alpaca_get_option_contracts", params)
+            
+            if result and "result" in result:
+                payload = result["result"]
+                if "error" in payload:
+                    self._raise_if_rate_limited(payload)
+                    logger.warning(payload["error"])
+                    return []
+                
+                option_data = [
+                    self._contract_record_to_option(record)
+                    for record in payload.get("contracts", [])
+                    if record.get("type") == contract_type.lower()
+                ]
+                option_data = sorted(
+                    (option for option in option_data if option['strike_price'] > 0),
+                    key=lambda x: x['strike_price']
+                )
+                
+                if option_data:
+                    self.cache.set(cache_key, option_data)
+                else:
+                    self.cache.set_negative(cache_key)
+                return option_data
+            
+            return []
+            
+        except RateLimitError:
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching options for {symbol}: {str(e)}")
+            return []
+
+    @staticmethod
+    def _contract_record_to_option(record: Dict) -> Dict:
+        """Convert a structured contract record from the MCP server to the screener's option dict"""
+        return {
+            'symbol': record['symbol'],
+            'name': record.get('name'),
+            'strike_price': record.get('strike_price') or 0.0,
+            'expiration_date': record.get('expiration_date'),
+            'open_interest': record.get('open_interest') or 0,
+            'close_price': record.get('close_price') or 0.0
+        }
+    
+    @staticmethod
+    def _snapshot_record_to_greeks(record: Dict) -> Dict:
+        """Convert a structured snapshot record from the MCP server to the screener's Greeks dict"""
+        data = {}
+        
+        greeks = record.get('greeks') or {}
+        for greek in ('delta', 'gamma', 'theta', 'vega', 'rho'):
+            if greeks.get(greek) is not None:
+                data[greek] = greeks[greek]
+        
+        # Implied volatility is kept in percent, matching the rest of the metrics
+        if record.get('implied_volatility') is not None:
+            data['implied_volatility'] = record['implied_volatility'] * 100
+        
+        quote = record.get('latest_quote') or {}
+        if quote.get('bid_price') is not None:
+            data['bid'] = quote['bid_price']
+        if quote.get('ask_price') is not None:
+            data['ask'] = quote['ask_price']
+        if quote.get('bid_size') is not None:
+            data['bid_size'] = int(quote['bid_size'])
+        if quote.get('ask_size') is not None:
+            data['ask_size'] = int(quote['ask_size'])
+        
+        trade = record.get('latest_trade') or {}
+        if trade.get('price') is not None:
+            data['last_price'] = trade['price']
+        if trade.get('size') is not None:
+            # Trade size is used as a volume indicator
+            data['last_trade_size'] = int(trade['size'])
+        
+        return data
+    
+    def get_option_snapshot(self, symbol: str) -> Optional[Dict]:
+        """Get option snapshot with Greeks, pricing data, and volume from MCP server"""
+        snapshots = self.get_option_snapshots([symbol])
+        return snapshots.get(symbol) if snapshots is not None else None
+    
+    def get_option_snapshots(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Get option snapshots for many contracts using chunked batch requests"""
+        return self._run(self.aget_option_snapshots(symbols))
+    
+    async def aget_option_snapshots(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Get option snapshots for many contracts using chunked batch requests (async)
+        
+        Cached snapshots are reused and only the remaining symbols are requested;
+        chunks are fetched concurrently. Returns a map of option symbol to
+        Greeks/pricing dict. Symbols without snapshot data map to an empty dict;
+        symbols in a failed chunk are omitted.
+        """
+        snapshots = {}
+        missing = []
+        for symbol in symbols:
+            cached_result = self.cache.get(f"snapshot_{symbol}")
+            if cached_result is not None:
+                snapshots[symbol] = cached_result
+            else:
+                missing.append(symbol)
+        
+        chunks = [
+            missing[start:start + self.snapshot_batch_size]
+            for start in range(0, len(missing), self.snapshot_batch_size)
+        ]
+        
+        for chunk_snapshots in await asyncio.gather(*(
+            self._single_flight(("snapshots", tuple(chunk)), self._afetch_snapshot_chunk, chunk)
+            for chunk in chunks
+        )):
+            for symbol, snapshot in chunk_snapshots.items():
+                self.cache.set(f"snapshot_{symbol}", snapshot, ttl=self.snapshot_ttl)
+            snapshots.update(chunk_snapshots)
+        
+        return snapshots
+    
+    async def _afetch_snapshot_chunk(self, chunk: List[str]) -> Dict[str, Dict]:
+        """Fetch one batch of option snapshots (at most snapshot_batch_size symbols)"""
+        try:
+            params = {"symbol_or_symbols": chunk, "output_format": "json"}
+            result = await self._acall_mcp_function("mcp_alpaca_get_option_snapshot", params)
+            
+            if not result or "result" not in result:
+                return {}
+            
+            payload = result["result"]
+            if "error" in payload:
+                self._raise_if_rate_limited(payload)
+                logger.warning(payload["error"])
+                return {}
+            
+            return {
+                symbol: self._snapshot_record_to_greeks(record) if record else {}
+                for symbol, record in payload.get("snapshots", {}).items()
+            }
+            
+        except RateLimitError:
+            raise
+        except ConnectionError:
+            logger.error(f"Connection error while fetching option snapshots for {len(chunk)} contracts")
+            return {}
+        except Exception as e:
+            logger.error(f"Unexpected error fetching option snapshots for {len(chunk)} contracts: {str(e)}")
+            return {}
+
+    def get_chain(self, symbol: str, max_days: int, contract_type: str = "put",
+                  strike_price_lte: Optional[float] = None) -> Optional[Dict[str, Dict]]:
+        """Get snapshots for all contracts of a symbol expiring within max_days in one chain request"""
+        return self._run(self.aget_chain(symbol, max_days, contract_type, strike_price_lte))
+    
+    async def aget_chain(self, symbol: str, max_days: int, contract_type: str = "put",
+                         strike_price_lte: Optional[float] = None) -> Optional[Dict[str, Dict]]:
+        """Get snapshots for all contracts of a symbol expiring within max_days in one chain request (async)
+        
+        Returns a map of option symbol to Greeks/pricing dict, or None if the
+        chain request failed so callers can fall back to per-contract snapshots.
+        """
+        return await self._single_flight(
+            ("chain", symbol, max_days, contract_type.lower(), strike_price_lte),
+            self._aget_chain, symbol, max_days, contract_type, strike_price_lte
+        )
+    
+    async def _aget_chain(self, symbol: str, max_days: int, contract_type: str,
+                          strike_price_lte: Optional[float]) -> Optional[Dict[str, Dict]]:
+        """Fetch the option chain snapshots, checking the cache first"""
+        today = current_date()
+        cache_key = f"chain_{symbol}_{contract_type.lower()}_{today.isoformat()}_{max_days}_{strike_price_lte}"
+        
+        cached_result = self.cache.get(cache_key)
+        if cached_result is not None:
+            return cached_result
+        
+        try:
+            params = {
+                "underlying_symbol": symbol,
+                "type": contract_type.lower(),
+                "expiration_date_gte": today.strftime("%Y-%m-%d"),
+                "expiration_date_lte": (today + timedelta(days=max_days)).strftime("%Y-%m-%d"),
+                "strike_price_lte": strike_price_lte,
+                "output_format": "json"
+            }
+            
+            result = await self._acall_mcp_function("mcp_alpaca_get_option_chain", params)
+            
+            if not result or "result" not in result:
+                return None
+            
+            payload = result["result"]
+            if "error" in payload:
+                # Falling back to per-contract snapshots would only add load while throttled
+                self._raise_if_rate_limited(payload)
+                logger.warning(payload["error"])
+                return None
+            
+            chain = {
+                option_symbol: self._snapshot_record_to_greeks(record)
+                for option_symbol, record in payload.get("snapshots", {}).items()
+            }
+            logger.info(f"Fetched option chain for {symbol}: {len(chain)} contracts")
+            self.cache.set(cache_key, chain, ttl=self.snapshot_ttl)
+            return chain
+            
+        except RateLimitError:
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error fetching option chain for {symbol}: {str(e)}")
+            return None
+    
+    def discover_option_contracts(self, symbol: str, max_days: int, contract_type: str = "put",
+                                  strike_price_lte: Optional[float] = None) -> Dict[date, List[Dict]]:
+        """Discover all expirations and their contracts for a symbol in a single ranged query"""
+        return self._run(self.adiscover_option_contracts(symbol, max_days, contract_type, strike_price_lte))
+    
+    async def adiscover_option_contracts(self, symbol: str, max_days: int, contract_type: str = "put",
+                                         strike_price_lte: Optional[float] = None) -> Dict[date, List[Dict]]:
+        """Discover all expirations and their contracts for a symbol in a single ranged query (async)
+        
+        Requests every active contract expiring between today and today + max_days
+        (and struck at or below strike_price_lte, if given), following
+        next_page_token until the listing is exhausted. Returns a map of
+        expiration date to contracts sorted by strike, ordered by expiration.
+        """
+        return await self._single_flight(
+            ("discovery", symbol, max_days, contract_type.lower(), strike_price_lte),
+            self._adiscover_option_contracts, symbol, max_days, contract_type, strike_price_lte
+        )
+    
+    async def _adiscover_option_contracts(self, symbol: str, max_days: int, contract_type: str,
+                                          strike_price_lte: Optional[float]) -> Dict[date, List[Dict]]:
+        """Run the paged contract discovery query, checking the cache first"""
+        today = current_date()
+        end_date = today + timedelta(days=max_days)
+        cache_key = f"discovery_{symbol}_{contract_type.lower()}_{today.isoformat()}_{max_days}_{strike_price_lte}"
+        
+        cached_result = self.cache.get(cache_key)
+        if cached_result is CacheManager.NEGATIVE:
+            return {}
+        if cached_result is not None:
+            return cached_result
+        
+        contract_store = await self._acontract_store()
+        if contract_store is not None:
+            stored_result = contract_store.get(symbol, contract_type.lower(), today, end_date, strike_price_lte)
+            if stored_result is not None:
+                logger.debug(f"Contract store hit for {symbol} within {max_days} days")
+                self.cache.set(cache_key, stored_result)
+                return stored_result
+        
+        contracts_by_exp: Dict[date, List[Dict]] = {}
+        page_token = None
+        # Only a listing that ran to its last page is cached
+        complete = False
+        
+        for _ in range(self.MAX_DISCOVERY_PAGES):
+            params = {
+                "underlying_symbol": symbol,
+                "expiration_date_gte": today.strftime("%Y-%m-%d"),
+                "expiration_date_lte": end_date.strftime("%Y-%m-%d"),
+                "strike_price_lte": str(strike_price_lte) if strike_price_lte is not None else None,
+                "type": contract_type.lower(),
+                "status": "active",
+                "limit": self.DISCOVERY_PAGE_SIZE,
+                "page_token": page_token,
+                "output_format": "json"
+            }
+            
+            result = await self._acall_mcp_function("mcp_alpaca_get_option_contracts", params)
+            if not result or "result" not in result:
+                raise SymbolFetchError(f"Contract discovery for {symbol} failed")
+            
+            payload = result["result"]
+            if "error" in payload:
+                self._raise_if_rate_limited(payload)
+                # A partial listing would be taken for the symbol's complete chain
+                raise SymbolFetchError(f"Contract discovery for {symbol} failed: {payload['error']}")
+            
+            for record in payload.get("contracts", []):
+                if record.get("type") != contract_type.lower():
+                    continue
+                try:
+                    exp_date = date.fromisoformat(record["expiration_date"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                
+                option = self._contract_record_to_option(record)
+                if option['strike_price'] > 0:
+                    contracts_by_exp.setdefault(exp_date, []).append(option)
+            
+            page_token = payload.get("next_page_token")
+            if not page_token:
+                complete = True
+                break
+        else:
+            logger.warning(f"Contract discovery for {symbol} hit the {self.MAX_DISCOVERY_PAGES} page limit")
+        
+        for options in contracts_by_exp.values():
+            options.sort(key=lambda x: x['strike_price'])
+        
+        total = sum(len(options) for options in contracts_by_exp.values())
+        logger.info(f"Discovered {total} {contract_type} contracts across {len(contracts_by_exp)} expirations for {symbol} within {max_days} days")
+        contracts_by_exp = dict(sorted(contracts_by_exp.items()))
+        
+        if complete:
+            if contracts_by_exp:
+                self.cache.set(cache_key, contracts_by_exp)
+            else:
+                self.cache.set_negative(cache_key)
+            if contract_store is not None:
+                try:
+                    # SQLite writes block, so they run in an executor rather than on the client loop
+                    await asyncio.get_running_loop().run_in_executor(
+                        None, contract_store.put, symbol, contract_type.lower(), end_date, contracts_by_exp,
+                        strike_price_lte
+                    )
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not persist contracts for {symbol}: {str(e)}")
+        return contracts_by_exp
+    
+    def get_available_expirations(self, symbol: str, max_days: int) -> List[date]:
+        """Get real expiration dates from Alpaca for the given symbol"""
+        try:
+            expiration_list = list(self.discover_option_contracts(symbol, max_days).keys())
+            
+            # If no expirations found, fall back to Friday logic but with validation
+            if not expiration_list:
+                logger.warning(f"No option expirations found for {symbol}, using Friday estimates")
+                return self._get_friday_estimates(max_days)
+            
+            return expiration_list
+            
+        except Exception as e:
+            logger.warning(f"Error getting expirations for {symbol}: {str(e)}, using Friday estimates")
+            return self._get_friday_estimates(max_days)
+    
+    def _get_friday_estimates(self, max_days: int) -> List[date]:
+        """Fallback method to estimate Friday expirations"""
+        today = current_date()
+        fridays = []
+        
+        # Find next Friday
+        days_ahead = 4 - today.weekday()  # Friday is 4
+        if days_ahead <= 0:
+            days_ahead += 7
+        
+        current_friday = today + timedelta(days=days_ahead)
+        
+        # Get all Fridays within max_days (no arbitrary limit)
+        while (current_friday - today).days <= max_days:
+            fridays.append(current_friday)
+            current_friday += timedelta(days=7)
+        
+        return fridays
+    
+    @staticmethod
+    def validate_stock_quote(quote: Dict) -> Dict:
+        """Validate and clean stock quote data"""
+        if not quote:
+            raise DataValidationError("Empty quote data received")
+        
+        required_fields = ['bid', 'ask']
+        for field in required_fields:
+            if field not in quote:
+                raise DataValidationError(f"Missing required field in quote: {field}")
+            
+            if not isinstance(quote[field], (int, float)) or quote[field] <= 0:
+                raise DataValidationError(f"Invalid {field} price: {quote[field]}")
+        
+        # Calculate mid price if not present
+        if 'mid_price' not in quote:
+            quote['mid_price'] = (quote['bid'] + quote['ask']) / 2
+        
+        # Validate spread isn't too wide (more than 10%)
+        spread_pct = (quote['ask'] - quote['bid']) / quote['mid_price'] * 100
+        if spread_pct > 10:
+            logger.warning(f"Wide bid-ask spread detected for quote: {spread_pct:.1f}%")
+        
+        return quote
+    
+    @staticmethod 
+    def validate_option_data(option: Dict) -> Dict:
+        """Validate and clean option contract data"""
+        if not option:
+            raise DataValidationError("Empty option data received")
+        
+        # Required fields
+        required_fields = ['symbol', 'strike_price', 'close_price', 'open_interest']
+        for field in required_fields:
+            if field not in option:
+                raise DataValidationError(f"Missing required field in option: {field}")
+        
+        # Validate numeric fields
+        if option['strike_price'] <= 0:
+            raise DataValidationError(f"Invalid strike price: {option['strike_price']}")
+            
+        if option['close_price'] <= 0:
+            raise DataValidationError(f"Invalid option price: {option['close_price']}")
+            
+        if option['open_interest'] < 0:
+            raise DataValidationError(f"Invalid open interest: {option['open_interest']}")
+        
+        # Validate option symbol format
+        if not option['symbol'] or len(option['symbol']) < 10:
+            raise DataValidationError(f"Invalid option symbol: {option['symbol']}")
+        
+        return option
+    
+    @staticmethod
+    def validate_metrics(metrics: Dict) -> Dict:
+        """Validate calculated metrics"""
+        if not metrics:
+            raise DataValidationError("Empty metrics data")
+        
+        # Check for required fields
+        required_fields = ['annualized_return', 'pitm', 'cash_required', 'premium_received']
+        for field in required_fields:
+            if field not in metrics:
+                raise DataValidationError(f"Missing metric: {field}")
+            
+            if not isinstance(metrics[field], (int, float)):
+                raise DataValidationError(f"Invalid metric type for {field}: {type(metrics[field])}")
+        
+        # Sanity checks
+        if metrics['annualized_return'] < 0 or metrics['annualized_return'] > 1000:
+            logger.warning(f"Unusual annualized return detected: {metrics['annualized_return']:.1f}%")
+        
+        if metrics['pitm'] < 0 or metrics['pitm'] > 100:
+            raise DataValidationError(f"PITM out of range: {metrics['pitm']}")
+        
+        if metrics['cash_required'] <= 0:
+            raise DataValidationError(f"Invalid cash required: {metrics['cash_required']}")
+        
+        return metrics
+    
+    def process_symbol_parallel(self, symbol: str, max_dte: int, max_pitm: float, 
+                               min_open_interest: int, min_volume: int = 0) -> pd.DataFrame:
+        """Process a single symbol and return all valid options
+        
+        Raises SymbolFetchError (or RateLimitError) if its data could not be fetched.
+        """
+        return self._run(self.aprocess_symbol(symbol, max_dte, max_pitm, min_open_interest, min_volume))
+    
+    def submit_symbol(self, symbol: str, max_dte: int, max_pitm: float,
+                      min_open_interest: int, min_volume: int = 0) -> Future:
+        """Schedule a symbol on the client event loop and return a concurrent.futures.Future
+        
+        Lets callers fan out many symbols on the shared loop and consume them with as_completed.
+        """
+        return asyncio.run_coroutine_threadsafe(
+            self.aprocess_symbol(symbol, max_dte, max_pitm, min_open_interest, min_volume), self._loop
+        )
+    
+    def screen_symbols(self, symbols: List[str], max_dte: int, max_pitm: float,
+                       min_open_interest: int, min_volume: int = 0) -> pd.DataFrame:
+        """Process many symbols concurrently and return all valid options"""
+        return self._run(self.ascreen_symbols(symbols, max_dte, max_pitm, min_open_interest, min_volume))
+    
+    async def ascreen_symbols(self, symbols: List[str], max_dte: int, max_pitm: float,
+                              min_open_interest: int, min_volume: int = 0) -> pd.DataFrame:
+        """Process many symbols concurrently and return all valid options (async)
+        
+        Symbols whose data could not be fetched are logged and skipped.
+        """
+        results = await asyncio.gather(*(
+            self.aprocess_symbol(symbol, max_dte, max_pitm, min_open_interest, min_volume)
+            for symbol in symbols
+        ), return_exceptions=True)
+        frames = []
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, SymbolFetchError):
+                logger.error(str(result))
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                frames.append(result)
+        return combine_results(frames)
+    
+    async def aprocess_symbol(self, symbol: str, max_dte: int, max_pitm: float,
+                              min_open_interest: int, min_volume: int = 0) -> pd.DataFrame:
+        """Process a single symbol and return all valid options (async)
+        
+        With strike pushdown the quote is fetched first and contract discovery and
+        the chain only request strikes below the PITM-derived ceiling; otherwise
+        all three requests run concurrently. Snapshot batches for all expirations
+        are then fetched concurrently.
+        
+        An empty frame means the symbol was fetched and nothing qualified; a failed
+        quote or contract fetch raises SymbolFetchError so callers do not mistake it
+        for "no options" (rate limiting raises RateLimitError).
+        """
+        try:
+            if self.strike_pushdown:
+                # The strike ceiling depends on the stock price, so the quote comes first
+                quote = await self.aget_stock_quote(symbol)
+                strike_ceiling = None
+                if quote:
+                    strike_ceiling = self.calculate_strike_ceiling(
+                        self.validate_stock_quote(quote)['mid_price'], max_pitm, max_dte
+                    )
+                contracts_by_exp, chain = await asyncio.gather(
+                    self.adiscover_option_contracts(symbol, max_dte, "put", strike_ceiling),
+                    self.aget_chain(symbol, max_dte, strike_price_lte=strike_ceiling)
+                    if self.use_option_chain and not self.quote_only else self._none()
+                )
+            else:
+                # Quote, contracts and chain are independent of each other
+                quote, contracts_by_exp, chain = await asyncio.gather(
+                    self.aget_stock_quote(symbol),
+                    self.adiscover_option_contracts(symbol, max_dte, "put"),
+                    self.aget_chain(symbol, max_dte) if self.use_option_chain and not self.quote_only else self._none()
+                )
+            
+            if not quote:
+                raise SymbolFetchError(f"Could not fetch quote for {symbol}")
+            
+            # Validate quote data
+            quote = self.validate_stock_quote(quote)
+            stock_price = quote['mid_price']
+            
+            if not contracts_by_exp:
+                logger.warning(f"No valid expirations found for {symbol} within {max_dte} days")
+                return pd.DataFrame()
+            
+            # Validate and apply basic filters before fetching any market data
+            today = current_date()
+            candidates_by_exp = {}
+            for exp_date, options in contracts_by_exp.items():
+                candidates = self._filter_candidates(options, min_open_interest)
+                if self.strike_pushdown:
+                    # Tighter per-expiration ceiling for the remaining time to expiration
+                    ceiling = self.calculate_strike_ceiling(stock_price, max_pitm, (exp_date - today).days)
+                    if ceiling is not None:
+                        candidates = [option for option in candidates if option['strike_price'] <= ceiling]
+                if candidates:
+                    candidates_by_exp[exp_date] = candidates
+            
+            # Prefetch snapshots for every expiration in batched requests unless the chain covers them
+            if self.quote_only:
+                # Score from contract close prices and any streamed option quotes; Greeks are solved locally
+                snapshots_by_exp = {
+                    exp_date: self._streamed_option_quotes([option['symbol'] for option in candidates])
+                    for exp_date, candidates in candidates_by_exp.items()
+                }
+            elif chain is not None:
+                snapshots_by_exp = {exp_date: chain for exp_date in candidates_by_exp}
+            elif self.delta_pruning:
+                # Only fetch snapshots inside each expiration's qualifying strike range
+                pruned = await asyncio.gather(*(
+                    self._aprune_by_delta(candidates, max_pitm) for candidates in candidates_by_exp.values()
+                ))
+                snapshots_by_exp = {exp_date: snapshots for exp_date, (_, snapshots) in zip(candidates_by_exp, pruned)}
+                candidates_by_exp = {exp_date: kept for exp_date, (kept, _) in zip(candidates_by_exp, pruned)}
+            else:
+                snapshot_maps = await asyncio.gather(*(
+                    self.aget_option_snapshots([option['symbol'] for option in candidates])
+                    for candidates in candidates_by_exp.values()
+                ))
+                snapshots_by_exp = dict(zip(candidates_by_exp.keys(), snapshot_maps))
+            
+            # Analyze every expiration in one vectorized pass
+            all_options = self._score_candidates(
+                symbol, stock_price, candidates_by_exp, snapshots_by_exp, max_pitm, min_volume
+            )
+            
+            logger.info(f"Processed {symbol}: found {len(all_options)} valid options")
+            return all_options
+            
+        except (RateLimitError, SymbolFetchError):
+            raise  # Reported per symbol by the caller rather than returned as "no options"
+        except DataValidationError as e:
+            raise SymbolFetchError(f"Invalid data for {symbol}: {str(e)}") from e
+        except Exception as e:
+            raise SymbolFetchError(f"Error processing {symbol}: {str(e)}") from e
+    
+    async def _aprune_by_delta(self, candidates: List[Dict], max_pitm: float) -> Tuple[List[Dict], Dict[str, Dict]]:
+        """Find one expiration's qualifying strike range by probing deltas, then fetch only that range (async)
+        
+        Put |delta| rises with strike, so the strike-sorted candidates that pass
+        max_pitm form a prefix. Each round fetches one batch of delta_probe_count
+        evenly spaced probe snapshots and narrows the boundary (a k-ary search).
+        Candidates above the boundary are dropped without fetching their snapshots.
+        If a probe has no delta/IV (PITM would be estimated) or deltas are not
+        monotonic, every candidate is kept. Returns the kept candidates and their snapshots.
+        """
+        symbols = [option['symbol'] for option in candidates]
+        probe_count = self.delta_probe_count
+        # candidates[:lo + 1] are known to pass, candidates[hi:] are known to fail
+        lo, hi = -1, len(candidates)
+        
+        while hi - lo - 1 > probe_count:
+            span = hi - lo - 1
+            probes = sorted({lo + (span + 1) * j // (probe_count + 1) for j in range(1, probe_count + 1)})
+            snapshots = await self.aget_option_snapshots([symbols[i] for i in probes])
+            
+            new_lo, new_hi = lo, hi
+            for i in probes:
+                snapshot = snapshots.get(symbols[i]) or {}
+                if 'delta' not in snapshot or 'implied_volatility' not in snapshot:
+                    logger.debug(f"Probe {symbols[i]} has no Greeks, fetching every strike")
+                    return candidates, await self.aget_option_snapshots(symbols)
+                if abs(snapshot['delta']) * 100 <= max_pitm:
+                    new_lo = max(new_lo, i)
+                else:
+                    new_hi = min(new_hi, i)
+            
+            if new_lo > new_hi:
+                logger.debug(f"Deltas are not monotonic in strike around {symbols[new_hi]}, fetching every strike")
+                return candidates, await self.aget_option_snapshots(symbols)
+            lo, hi = new_lo, new_hi
+        
+        # Probe snapshots are cached, so this only requests the rest of the range
+        kept = candidates[:hi]
+        return kept, await self.aget_option_snapshots(symbols[:hi])
+    
+    @staticmethod
+    async def _none() -> None:
+        """Awaitable placeholder for optional requests inside asyncio.gather"""
+        return None
+    
+    def _filter_candidates(self, options: List[Dict], min_open_interest: int) -> List[Dict]:
+        """Validate contracts and apply the open interest filter"""
+        candidates = []
+        for option in options:
+            try:
+                option = self.validate_option_data(option)
+            except DataValidationError as e:
+                logger.warning(f"Skipping invalid option {option.get('symbol', 'unknown')}: {str(e)}")
+                continue
+            
+            if option['open_interest'] < min_open_interest:
+                continue
+            
+            candidates.append(option)
+        return candidates
+    
+    def _score_candidates(self, symbol: str, stock_price: float,
+                          candidates_by_exp: Dict[date, List[Dict]],
+                          snapshots_by_exp: Dict[date, Dict[str, Dict]],
+                          max_pitm: float, min_volume: int) -> pd.DataFrame:
+        """Calculate metrics for all of a symbol's candidates in one vectorized pass and return the rows that pass the filters
+        
+        Rows are returned as a typed numeric frame; formatting happens only at render time (see RESULT_FORMATS).
+        """
+        today = current_date()
+        rows = []
+        for exp_date, candidates in candidates_by_exp.items():
+            snapshots = snapshots_by_exp[exp_date]
+            for option in candidates:
+                rows.append((exp_date, option, snapshots.get(option['symbol']) or {}))
+        
+        if not rows:
+            return pd.DataFrame()
+        
+        def snapshot_field(field: str) -> np.ndarray:
+            return np.array([snapshot.get(field, np.nan) for _, _, snapshot in rows], dtype=float)
+        
+        days_to_exp = np.array([(exp_date - today).days for exp_date, _, _ in rows])
+        strikes = np.array([option['strike_price'] for _, option, _ in rows], dtype=float)
+        premiums = np.array([option['close_price'] for _, option, _ in rows], dtype=float)
+        volume = np.array([snapshot.get('last_trade_size', 0) for _, _, snapshot in rows])
+        delta = snapshot_field('delta')
+        implied_volatility = snapshot_field('implied_volatility')
+        gamma = snapshot_field('gamma')
+        theta = snapshot_field('theta')
+        
+        greek_source = np.full(len(rows), "Alpaca_Real", dtype=object)
+        if self.use_volatility_surface:
+            surface = self._volatility_surface(symbol, stock_price, strikes, days_to_exp, delta, implied_volatility)
+            if surface is not None:
+                sigma = surface.implied_volatility(stock_price, strikes, days_to_exp)
+                filled = self._fill_missing_greeks(
+                    stock_price, strikes, days_to_exp, sigma, delta, implied_volatility, gamma, theta
+                )
+                greek_source[filled] = "Surface"
+        
+        missing = np.isnan(delta) | np.isnan(implied_volatility)
+        if self.solve_greeks and missing.any():
+            # Price rows without Greeks from the live mid when quoted, otherwise the last close
+            bid = snapshot_field('bid')
+            ask = snapshot_field('ask')
+            option_prices = np.where((bid > 0) & (ask >= bid), (bid + ask) / 2, premiums)
+            sigma = np.full(len(rows), np.nan)
+            sigma[missing] = self.solve_implied_volatility(
+                stock_price, strikes[missing], option_prices[missing], days_to_exp[missing],
+                max_volatility=self.max_implied_volatility
+            )
+            filled = self._fill_missing_greeks(
+                stock_price, strikes, days_to_exp, sigma, delta, implied_volatility, gamma, theta
+            )
+            greek_source[filled] = "Implied"
+        
+        metrics = self.calculate_chain_metrics(
+            stock_price,
+            strikes,
+            premiums,
+            days_to_exp,
+            delta=delta,
+            implied_volatility=implied_volatility,
+            gamma=gamma,
+            theta=theta,
+            greek_source=greek_source
+        )
+        
+        for i in np.flatnonzero((metrics['annualized_return'] < 0) | (metrics['annualized_return'] > 1000)):
+            logger.warning(f"Unusual annualized return detected: {metrics['annualized_return'][i]:.1f}%")
+        for i in np.flatnonzero(~metrics['valid']):
+            logger.warning(f"Skipping invalid option {rows[i][1].get('symbol', 'unknown')}: "
+                           f"PITM out of range: {metrics['pitm'][i]}")
+        
+        # Apply filters (volume filter only if specified)
+        keep = metrics['valid'] & (metrics['pitm'] <= max_pitm)
+        if min_volume > 0:
+            keep &= volume >= min_volume
+        
+        kept = np.flatnonzero(keep)
+        delta = metrics['delta'][kept]
+        theta = metrics['theta'][kept]
+        
+        # User-preferred column order; zero Greeks and volume mean "no data" and are left missing
+        return pd.DataFrame({
+            'Ticker': pd.Categorical([symbol] * len(kept)),
+            'Price': np.full(len(kept), stock_price),
+            'Strike': strikes[kept],
+            'Expiration': pd.to_datetime([rows[i][0] for i in kept]),
+            'DTE': days_to_exp[kept],
+            'Premium': metrics['premium_received'][kept],
+            'Distance %': metrics['distance_to_strike'][kept],
+            'Annual Return': metrics['annualized_return'][kept],
+            'PITM': metrics['pitm'][kept],
+            
+            # High Importance - Risk & Quality Metrics
+            'Score': metrics['advanced_score'][kept],
+            'Expected Return': metrics['expected_return'][kept],
+            'Sharpe': metrics['sharpe_ratio'][kept],
+            
+            # Medium Importance - Advanced Analysis
+            'Theta Eff': metrics['theta_efficiency'][kept],
+            'Vol Premium': metrics['volatility_risk_premium'][kept],
+            'Cash Required': metrics['cash_required'][kept],
+            
+            # Greeks & Technical Data
+            'IV %': metrics['implied_volatility'][kept],
+            'Delta': np.where(delta != 0, delta, np.nan),
+            'Theta': np.where(theta != 0, theta, np.nan),
+            
+            # Market Data & Quality Indicators
+            'OI': np.array([rows[i][1]['open_interest'] for i in kept], dtype=np.int64),
+            'Volume': pd.Series(volume[kept], dtype='Int64').where(volume[kept] > 0),
+            'Source': pd.Categorical(metrics['data_source'][kept])
+        })
+    
+    def calculate_strike_ceiling(self, stock_price: float, max_pitm: float, days_to_expiration: int,
+                                 risk_free_rate: Optional[float] = None) -> Optional[float]:
+        """Highest strike whose put can still pass the max PITM filter within days_to_expiration
+        
+        PITM is |delta| = N(-d1) with real Greeks and N(-d2) with estimated IV, so a
+        put can only pass if ln(K/S) stays below the matching Black-Scholes exponent.
+        That exponent is maximized over every volatility up to max_implied_volatility
+        and every day up to days_to_expiration (risk_free_rate, by default
+        processing.max_risk_free_rate, is an upper bound on the rate), making the
+        ceiling conservative. It is rounded up to a coarse price grid so small
+        quote moves keep reusing cached contract listings.
+        Returns None when every strike can pass.
+        """
+        pitm_limit = max_pitm / 100
+        if pitm_limit >= 0.999:
+            return None  # Estimated PITM is capped at 99.9%
+        
+        if risk_free_rate is None:
+            risk_free_rate = self.max_risk_free_rate
+        z = norm.ppf(max(pitm_limit, 1e-9))
+        sigma_max = self.max_implied_volatility
+        # Same-day expirations still have hours left, and their real Greeks are priced with them
+        T = np.arange(0, max(days_to_expiration, 1) + 1) / 365.0
+        sqrt_T = np.sqrt(T)
+        
+        # Delta path: the exponent z*sigma*sqrt(T) + (r + sigma^2/2)*T is convex in sigma,
+        # so its maximum over [0, sigma_max] is at one of the ends
+        delta_exponent = np.maximum(
+            risk_free_rate * T, z * sigma_max * sqrt_T + (risk_free_rate + 0.5 * sigma_max**2) * T
+        )
+        
+        # Estimated path: z*sigma*sqrt(T) + (r - sigma^2/2)*T is concave in sigma,
+        # with its maximum at sigma = z / sqrt(T) clipped to [0, sigma_max]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sigma_star = np.clip(np.where(T > 0, z / sqrt_T, 0.0), 0.0, sigma_max)
+        estimated_exponent = z * sigma_star * sqrt_T + (risk_free_rate - 0.5 * sigma_star**2) * T
+        
+        ceiling = stock_price * math.exp(max(0.0, delta_exponent.max(), estimated_exponent.max()))
+        step = 5 * 10 ** (math.floor(math.log10(ceiling)) - 2)
+        return round(math.ceil(ceiling / step) * step, 2)
+    
+    def _volatility_surface(self, symbol: str, stock_price: float, strikes: np.ndarray,
+                            days_to_expiration: np.ndarray, delta: np.ndarray,
+                            implied_volatility: np.ndarray) -> Optional[VolatilitySurface]:
+        """Build (and cache) the symbol's IV surface from rows with snapshot Greeks
+        
+        When this pass has too few quoted IVs to form a slice (quote-only or pruned
+        screens), the surface cached by an earlier pass is returned instead.
+        """
+        cache_key = f"iv_surface_{symbol}"
+        quoted = ~np.isnan(delta) & ~np.isnan(implied_volatility)
+        surface = VolatilitySurface(
+            stock_price, strikes[quoted], days_to_expiration[quoted], implied_volatility[quoted] / 100
+        )
+        if len(surface):
+            self.cache.set(cache_key, surface, ttl=self.surface_ttl)
+            return surface
+        return self.cache.get(cache_key)
+    
+    def _fill_missing_greeks(self, stock_price: float, strikes: np.ndarray, days_to_expiration: np.ndarray,
+                             sigma: np.ndarray, delta: np.ndarray, implied_volatility: np.ndarray,
+                             gamma: np.ndarray, theta: np.ndarray) -> np.ndarray:
+        """Fill Black-Scholes Greeks from sigma (decimal) for rows whose snapshot has no delta or IV
+        
+        Updates delta, implied_volatility (percent), gamma and theta in place and
+        returns the mask of rows that were filled. Rows where sigma is NaN are
+        left missing.
+        """
+        filled = (np.isnan(delta) | np.isnan(implied_volatility)) & np.isfinite(sigma)
+        if not filled.any():
+            return filled
+        
+        greeks = self.calculate_black_scholes_greeks(
+            stock_price, strikes[filled], days_to_expiration[filled], sigma[filled]
+        )
+        delta[filled] = greeks['delta']
+        implied_volatility[filled] = sigma[filled] * 100
+        gamma[filled] = greeks['gamma']
+        theta[filled] = greeks['theta']
+        return filled
+    
+    @staticmethod
+    def _black_scholes_put(stock_price, strikes: np.ndarray, T: np.ndarray, sigma: np.ndarray,
+                           risk_free_rate: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """European put price plus d1 and sqrt(T) for arrays of strikes, times (years) and volatilities"""
+        sqrt_T = np.sqrt(T)
+        d1 = (np.log(stock_price / strikes) + (risk_free_rate + 0.5 * sigma**2) * T) / (sigma * sqrt_T)
+        d2 = d1 - sigma * sqrt_T
+        price = strikes * np.exp(-risk_free_rate * T) * norm.cdf(-d2) - stock_price * norm.cdf(-d1)
+        return price, d1, sqrt_T
+    
+    @classmethod
+    def solve_implied_volatility(cls, stock_price, strikes: np.ndarray, option_prices: np.ndarray,
+                                 days_to_expiration: np.ndarray, risk_free_rate: float = 0.05,
+                                 max_volatility: float = 5.0, tolerance: float = 1e-6,
+                                 max_iterations: int = 50) -> np.ndarray:
+        """Vectorized Black-Scholes implied volatility for puts (decimal, NaN where unsolvable)
+        
+        Runs Newton steps on the whole array at once and falls back to bisection for
+        rows where a Newton step would leave the current bracket or vega vanishes.
+        Prices outside the no-arbitrage bounds, expired contracts and volatilities
+        above max_volatility yield NaN. tolerance is relative for prices under 1, so
+        a near-zero price is not taken as solved wherever the model price is also
+        near zero.
+        """
+        strikes = np.asarray(strikes, dtype=float)
+        option_prices = np.asarray(option_prices, dtype=float)
+        T = np.asarray(days_to_expiration, dtype=float) / 365.0
+        stock_price = np.broadcast_to(np.asarray(stock_price, dtype=float), strikes.shape)
+        
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            discounted_strike = strikes * np.exp(-risk_free_rate * T)
+            low_price, _, _ = cls._black_scholes_put(stock_price, strikes, T, np.full(strikes.shape, 1e-4), risk_free_rate)
+            high_price, _, _ = cls._black_scholes_put(stock_price, strikes, T, np.full(strikes.shape, max_volatility), risk_free_rate)
+            solvable = (
+                (T > 0) & (stock_price > 0) & (strikes > 0) & np.isfinite(option_prices) &
+                (option_prices > np.maximum(np.maximum(low_price, discounted_strike - stock_price), 0)) &
+                (option_prices < np.minimum(high_price, discounted_strike))
+            )
+            
+            lo = np.full(strikes.shape, 1e-4)
+            hi = np.full(strikes.shape, max_volatility)
+            # Brenner-Subrahmanyam starting point
+            sigma = np.clip(np.sqrt(2 * np.pi / np.where(T > 0, T, 1)) * option_prices / stock_price, 0.05, max_volatility / 2)
+            converged = ~solvable
+            
+            for _ in range(max_iterations):
+                price, d1, sqrt_T = cls._black_scholes_put(stock_price, strikes, T, sigma, risk_free_rate)
+                diff = price - option_prices
+                converged |= np.abs(diff) < tolerance * np.minimum(option_prices, 1.0)
+                if converged.all():
+                    break
+                
+                # Put price rises with volatility, so the sign of diff narrows the bracket
+                hi = np.where(diff > 0, np.minimum(hi, sigma), hi)
+                lo = np.where(diff < 0, np.maximum(lo, sigma), lo)
+                vega = stock_price * norm.pdf(d1) * sqrt_T
+                newton = sigma - diff / vega
+                use_bisection = ~np.isfinite(newton) | (newton <= lo) | (newton >= hi) | (vega < 1e-10)
+                sigma = np.where(converged, sigma, np.where(use_bisection, (lo + hi) / 2, newton))
+        
+        return np.where(solvable & converged, sigma, np.nan)
+    
+    @classmethod
+    def calculate_black_scholes_greeks(cls, stock_price, strikes: np.ndarray, days_to_expiration: np.ndarray,
+                                       sigma: np.ndarray, risk_free_rate: float = 0.05) -> Dict[str, np.ndarray]:
+        """Vectorized Black-Scholes put Greeks, with theta per calendar day and vega per volatility point"""
+        strikes = np.asarray(strikes, dtype=float)
+        T = np.asarray(days_to_expiration, dtype=float) / 365.0
+        sigma = np.asarray(sigma, dtype=float)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            _, d1, sqrt_T = cls._black_scholes_put(stock_price, strikes, T, sigma, risk_free_rate)
+            d2 = d1 - sigma * sqrt_T
+            pdf_d1 = norm.pdf(d1)
+            return {
+                'delta': norm.cdf(d1) - 1,
+                'gamma': pdf_d1 / (stock_price * sigma * sqrt_T),
+                'theta': (-stock_price * pdf_d1 * sigma / (2 * sqrt_T) +
+                          risk_free_rate * strikes * np.exp(-risk_free_rate * T) * norm.cdf(-d2)) / 365,
+                'vega': stock_price * pdf_d1 * sqrt_T / 100
+            }
+    
+    @staticmethod
+    def calculate_chain_metrics(stock_price, strikes: np.ndarray, premiums: np.ndarray,
+                                days_to_expiration: np.ndarray, delta: np.ndarray,
+                                implied_volatility: np.ndarray, gamma: np.ndarray,
+                                theta: np.ndarray, risk_free_rate: float = 0.05,
+                                greek_source: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Vectorized calculate_option_metrics and validate_metrics for a whole chain
+        
+        Inputs are equal-length arrays (stock_price may also be a scalar). Greeks and
+        implied volatility (in percent) are NaN where missing; the optional
+        greek_source labels where each row's Greeks came from ("Alpaca_Real" by
+        default). Returns arrays matching the scalar metrics row for row, plus a
+        'valid' mask that is False where validate_metrics would reject the row.
+        """
+        strikes = np.asarray(strikes, dtype=float)
+        premiums = np.asarray(premiums, dtype=float)
+        dte = np.asarray(days_to_expiration, dtype=float)
+        stock_price = np.broadcast_to(np.asarray(stock_price, dtype=float), strikes.shape)
+        delta = np.asarray(delta, dtype=float)
+        implied_volatility = np.asarray(implied_volatility, dtype=float)
+        gamma = np.nan_to_num(np.asarray(gamma, dtype=float), nan=0.0)
+        theta = np.nan_to_num(np.asarray(theta, dtype=float), nan=0.0)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Basic metrics
+            cash_required = strikes * 100
+            premium_received = premiums * 100
+            period_return = (premium_received / cash_required) * 100
+            annualized_return = period_return * (365 / np.maximum(dte, 1))
+            distance_to_strike = ((stock_price - strikes) / stock_price) * 100
+            
+            # PITM from delta where real Greeks exist, Black-Scholes on estimated IV elsewhere
+            has_greeks = ~np.isnan(delta) & ~np.isnan(implied_volatility)
+            moneyness = stock_price / strikes
+            estimated_vol = np.select(
+                [moneyness > 1.1, moneyness > 1.05, moneyness > 0.95], [0.25, 0.35, 0.45], 0.55
+            )
+            T = dte / 365.0
+            d2 = (np.log(stock_price / strikes) +
+                  (risk_free_rate - 0.5 * estimated_vol**2) * T) / (estimated_vol * np.sqrt(T))
+            estimated_pitm = np.where(
+                dte <= 0,
+                np.where(stock_price < strikes, 100.0, 0.0),
+                np.clip(norm.cdf(-d2) * 100, 0.1, 99.9)
+            )
+            pitm = np.where(has_greeks, np.abs(delta) * 100, estimated_pitm)
+            implied_vol = np.where(has_greeks, implied_volatility / 100, estimated_vol)
+            data_source = np.where(
+                has_greeks, "Alpaca_Real" if greek_source is None else greek_source, "Estimated"
+            )
+            
+            # 1. Probability-weighted expected return
+            pitm_decimal = pitm / 100
+            expected_profit = premium_received * (1 - pitm_decimal) + premium_received * pitm_decimal
+            expected_return = expected_profit / cash_required * (365 / np.maximum(dte, 1)) * 100
+            
+            # 2. Volatility risk premium
+            vol_premium = np.maximum(0, (implied_vol * 100 - 20) * 2)
+            volatility_risk_premium = np.maximum(0, vol_premium - np.abs(gamma) * 50)
+            
+            # 3. Options Sharpe ratio
+            strategy_vol = implied_vol * np.sqrt(dte / 365) * (0.5 + np.abs((stock_price - strikes) / stock_price))
+            sharpe_ratio = np.where(
+                strategy_vol > 0, np.maximum(0, (expected_return - 5.0) / (strategy_vol * 100)), 0.0
+            )
+            
+            # 4. Theta efficiency
+            theta_efficiency = np.where(
+                (premiums > 0) & (dte > 0), np.minimum(100, (np.abs(theta) * dte) / premiums * 1000), 0.0
+            )
+            
+            # 5. Advanced composite score
+            advanced_score = (
+                np.minimum(1.0, expected_return / 50) * 30 +
+                np.minimum(1.0, sharpe_ratio / 2) * 25 +
+                np.minimum(1.0, volatility_risk_premium / 20) * 20 +
+                np.minimum(1.0, theta_efficiency / 100) * 25
+            )
+        
+        return {
+            'cash_required': cash_required,
+            'premium_received': premium_received,
+            'period_return': period_return,
+            'annualized_return': annualized_return,
+            'pitm': pitm,
+            'distance_to_strike': distance_to_strike,
+            'implied_volatility': np.where(implied_vol != 0, implied_vol * 100, 0.0),
+            'delta': np.nan_to_num(delta, nan=0.0),
+            'gamma': gamma,
+            'theta': theta,
+            'expected_return': expected_return,
+            'volatility_risk_premium': volatility_risk_premium,
+            'sharpe_ratio': sharpe_ratio,
+            'theta_efficiency': theta_efficiency,
+            'advanced_score': advanced_score,
+            'data_source': data_source,
+            'valid': (pitm >= 0) & (pitm <= 100) & (cash_required > 0)
+        }
+    
+    def calculate_implied_volatility(self, stock_price: float, strike_price: float, 
+                                   premium: float, days_to_expiration: int, 
+                                   risk_free_rate: float = 0.05) -> float:
+        """Estimate implied volatility using simplified approach"""
+        # This is a rough approximation - in reality you'd use Newton-Raphson
+        # For now, we'll estimate based on typical market volatilities
+        
+        # Time to expiration in years
+        time_to_exp = days_to_expiration / 365.0
+        
+        # Moneyness (how far ITM/OTM the option is)
+        moneyness = stock_price / strike_price
+        
+        # Rough IV estimation based on premium and moneyness
+        # This is very simplified but gives reasonable estimates
+        if moneyness > 1.1:  # Deep OTM put
+            return 0.25  # 25% IV
+        elif moneyness > 1.05:  # Moderately OTM
+            return 0.35  # 35% IV
+        elif moneyness > 0.95:  # Near the money
+            return 0.45  # 45% IV
+        else:  # ITM put
+            return 0.55  # 55% IV
+
+    def calculate_probability_weighted_return(self, stock_price: float, strike_price: float,
+                                            premium: float, days_to_expiration: int,
+                                            pitm: float, implied_vol: float) -> float:
+        """Calculate expected return considering all possible outcomes"""
+        
+        cash_required = strike_price * 100
+        premium_received = premium * 100
+        pitm_decimal = pitm / 100
+        
+        # Scenario 1: Option expires worthless (probability = 1 - PITM)
+        profit_expire_worthless = premium_received
+        prob_expire_worthless = 1 - pitm_decimal
+        
+        # Scenario 2: Assignment occurs (probability = PITM)
+        # For assignment scenario, estimate expected stock price given ITM condition
+        # Using conditional expectation based on log-normal distribution
+        
+        # Time to expiration in years
+        T = days_to_expiration / 365.0
+        
+        if T > 0 and implied_vol > 0:
+            # Calculate expected stock price if assigned (conditional on being ITM)
+            risk_free_rate = 0.05
+            d1 = (math.log(stock_price / strike_price) + (risk_free_rate + 0.5 * implied_vol**2) * T) / (implied_vol * math.sqrt(T))
+            d2 = d1 - implied_vol * math.sqrt(T)
+            
+            # Conditional expected stock price given assignment
+            # This is an approximation - assumes normal distribution for simplicity
+            expected_stock_if_assigned = strike_price * 0.95  # Conservative estimate
+        else:
+            expected_stock_if_assigned = strike_price
+        
+        # Profit if assigned = premium + any appreciation above strike
+        # Note: CSP seller keeps premium but may have unrealized loss on stock
+        profit_if_assigned = premium_received
+        
+        # Expected profit
+        expected_profit = (
+            profit_expire_worthless * prob_expire_worthless +
+            profit_if_assigned * pitm_decimal
+        )
+        
+        # Annualized expected return
+        period_return = expected_profit / cash_required
+        annualized_expected = period_return * (365 / max(days_to_expiration, 1))
+        
+        return annualized_expected * 100
+
+    def calculate_volatility_risk_premium(self, implied_vol: float, gamma: float) -> float:
+        """Calculate premium for volatility risk exposure"""
+        
+        # Higher IV = more premium, but also more risk
+        # Sweet spot is moderate IV with low gamma (less sensitive to moves)
+        vol_premium = max(0, (implied_vol - 20) * 2)  # Reward IV above 20%
+        gamma_penalty = abs(gamma) * 50  # Penalize high gamma exposure
+        
+        return max(0, vol_premium - gamma_penalty)
+
+    def calculate_options_sharpe_ratio(self, expected_return: float, stock_price: float, 
+                                     strike_price: float, days_to_expiration: int,
+                                     implied_vol: float) -> float:
+        """Calculate Sharpe ratio for options strategy"""
+        
+        # Estimate volatility of CSP returns based on underlying characteristics
+        time_factor = math.sqrt(days_to_expiration / 365)
+        moneyness_factor = abs((stock_price - strike_price) / stock_price)
+        
+        # Strategy volatility is lower than underlying due to limited upside
+        strategy_vol = implied_vol * time_factor * (0.5 + moneyness_factor)
+        
+        risk_free_rate = 5.0  # 5% risk-free rate
+        
+        if strategy_vol > 0:
+            sharpe = (expected_return - risk_free_rate) / (strategy_vol * 100)
+            return max(0, sharpe)
+        
+        return 0
+
+    def calculate_theta_efficiency(self, theta: float, premium: float, 
+                                 days_to_expiration: int) -> float:
+        """Calculate theta efficiency score"""
+        
+        theta_abs = abs(theta)  # Theta is negative for puts we sell
+        
+        if premium > 0 and days_to_expiration > 0:
+            # Theta efficiency = theta decay per day / premium at risk
+            daily_decay = theta_abs
+            theta_efficiency = (daily_decay * days_to_expiration) / premium
+            
+            # Normalize to 0-100 scale, cap at reasonable levels
+            return min(100, theta_efficiency * 1000)
+        
+        return 0
+
+    def calculate_advanced_score(self, metrics: Dict) -> float:
+        """Advanced multi-factor scoring for CSP selection"""
+        
+        # Extract key metrics
+        annualized_return = metrics.get('annualized_return', 0)
+        expected_return = metrics.get('expected_return', annualized_return)
+        sharpe_ratio = metrics.get('sharpe_ratio', 0)
+        vol_risk_premium = metrics.get('volatility_risk_premium', 0)
+        theta_efficiency = metrics.get('theta_efficiency', 0)
+        
+        # Normalize components to 0-1 scale
+        return_component = min(1.0, expected_return / 50)  # Cap at 50% return
+        sharpe_component = min(1.0, sharpe_ratio / 2)      # Cap at 2.0 Sharpe
+        vol_component = min(1.0, vol_risk_premium / 20)    # Cap at 20 points
+        theta_component = min(1.0, theta_efficiency / 100) # Cap at 100 points
+        
+        # Weighted composite score (0-100 scale)
+        composite_score = (
+            return_component * 30 +      # Expected return (30%)
+            sharpe_component * 25 +      # Risk-adjusted return (25%)  
+            vol_component * 20 +         # Volatility premium (20%)
+            theta_component * 25         # Theta efficiency (25%)
+        )
+        
+        return composite_score
+
+    def calculate_pitm_black_scholes(self, stock_price: float, strike_price: float,
+                                   days_to_expiration: int, volatility: float,
+                                   risk_free_rate: float = 0.05) -> float:
+        """Calculate probability ITM using Black-Scholes framework"""
+        
+        if days_to_expiration <= 0:
+            # Option has expired
+            return 100.0 if stock_price < strike_price else 0.0
+        
+        # Time to expiration in years
+        T = days_to_expiration / 365.0
+        
+        # Prevent division by zero
+        if T <= 0 or volatility <= 0:
+            return 50.0  # Default fallback
+        
+        try:
+            # Black-Scholes d2 parameter
+            d2 = (math.log(stock_price / strike_price) + 
+                  (risk_free_rate - 0.5 * volatility**2) * T) / (volatility * math.sqrt(T))
+            
+            # For a put option, PITM = N(-d2) where N is cumulative normal distribution
+            pitm = norm.cdf(-d2) * 100
+            
+            # Ensure reasonable bounds
+            return max(0.1, min(99.9, pitm))
+            
+        except (ValueError, ZeroDivisionError, OverflowError):
+            # Fallback to simple calculation if Black-Scholes fails
+            distance_pct = ((stock_price - strike_price) / strike_price) * 100
+            if distance_pct > 20:
+                return 5.0
+            elif distance_pct > 10:
+                return 15.0
+            elif distance_pct > 0:
+                return 25.0
+            else:
+                return 50.0
+
+    def calculate_option_metrics(self, stock_price: float, strike_price: float, 
+                                premium: float, days_to_expiration: int, 
+                                option_symbol: Optional[str] = None,
+                                snapshot: Optional[Dict] = None) -> Dict:
+        """Calculate advanced option metrics for cash-secured puts
+        
+        Greeks come from a prefetched snapshot when one is given, otherwise
+        from a snapshot fetched for option_symbol.
+        """
+        
+        # Basic metrics
+        cash_required = strike_price * 100
+        premium_received = premium * 100
+        period_return = (premium_received / cash_required) * 100
+        annualized_return = period_return * (365 / max(days_to_expiration, 1))
+        distance_to_strike = ((stock_price - strike_price) / stock_price) * 100
+        
+        # Try to get real Greeks and IV from Alpaca if option symbol provided
+        real_greeks = {}
+        if snapshot is None and option_symbol:
+            snapshot = self.get_option_snapshot(option_symbol)
+        if snapshot:
+            real_greeks = snapshot
+        
+        # Calculate PITM using Delta (most accurate method)
+        if 'delta' in real_greeks and 'implied_volatility' in real_greeks:
+            # Use real data from Alpaca
+            pitm = abs(real_greeks['delta']) * 100
+            implied_vol = real_greeks.get('implied_volatility', 0) / 100  # Convert from percentage to decimal
+            data_source = "Alpaca_Real"
+        else:
+            # Fallback to simplified calculation if no Greeks available
+            implied_vol = self.calculate_implied_volatility(
+                stock_price, strike_price, premium, days_to_expiration
+            )
+            pitm = self.calculate_pitm_black_scholes(
+                stock_price, strike_price, days_to_expiration, implied_vol
+            )
+            data_source = "Estimated"
+        
+        # Advanced Phase 1 calculations
+        gamma = real_greeks.get('gamma', 0)
+        theta = real_greeks.get('theta', 0)
+        
+        # 1. Probability-weighted expected return
+        expected_return = self.calculate_probability_weighted_return(
+            stock_price, strike_price, premium, days_to_expiration, pitm, implied_vol
+        )
+        
+        # 2. Volatility risk premium
+        volatility_risk_premium = self.calculate_volatility_risk_premium(
+            implied_vol * 100, gamma
+        )
+        
+        # 3. Options Sharpe ratio
+        sharpe_ratio = self.calculate_options_sharpe_ratio(
+            expected_return, stock_price, strike_price, days_to_expiration, implied_vol
+        )
+        
+        # 4. Theta efficiency
+        theta_efficiency = self.calculate_theta_efficiency(
+            theta, premium, days_to_expiration
+        )
+        
+        # Create comprehensive metrics dictionary
+        metrics = {
+            # Basic metrics
+            'cash_required': cash_required,
+            'premium_received': premium_received,
+            'period_return': period_return,
+            'annualized_return': annualized_return,
+            'pitm': pitm,
+            'distance_to_strike': distance_to_strike,
+            'implied_volatility': implied_vol * 100 if implied_vol else 0,
+            
+            # Greeks
+            'delta': real_greeks.get('delta', 0),
+            'gamma': gamma,
+            'theta': theta,
+            'vega': real_greeks.get('vega', 0),
+            'rho': real_greeks.get('rho', 0),
+            
+            # Market data
+            'bid': real_greeks.get('bid', 0),
+            'ask': real_greeks.get('ask', 0),
+            'last_price': real_greeks.get('last_price', premium),
+            'volume': real_greeks.get('last_trade_size', 0),
+            'bid_size': real_greeks.get('bid_size', 0),
+            'ask_size': real_greeks.get('ask_size', 0),
+            
+            # Advanced Phase 1 metrics
+            'expected_return': expected_return,
+            'volatility_risk_premium': volatility_risk_premium,
+            'sharpe_ratio': sharpe_ratio,
+            'theta_efficiency': theta_efficiency,
+            
+            'data_source': data_source
+        }
+        
+        # 5. Calculate advanced composite score
+        metrics['advanced_score'] = self.calculate_advanced_score(metrics)
+        
+        return metrics
+
+def combine_results(results: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate per-symbol result frames, keeping Ticker and Source categorical"""
+    frames = [frame for frame in results if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    
+    df = pd.concat(frames, ignore_index=True)
+    df['Ticker'] = df['Ticker'].astype('category')
+    df['Source'] = df['Source'].astype('category')
+    return df
+
+def best_per_ticker(df: pd.DataFrame) -> pd.DataFrame:
+    """Keep each ticker's highest-scoring contract, ranked by score with a clean 0,1,2... index"""
+    if df.empty:
+        return df
+    df = df.loc[df.groupby('Ticker', observed=True)['Score'].idxmax()]
+    return df.sort_values('Score', ascending=False).reset_index(drop=True)
+
+class ScreenUniverse:
+    """Scored contracts from a session's last screen, kept for instant re-filtering
+    
+    Contracts are scored without the open interest and volume filters and up to
+    the max DTE and max PITM they were fetched with, so any tighter filters (and
+    any subset of the symbols) are answered in memory. Only new symbols, or a
+    larger max DTE or max PITM, need another trip upstream.
+    """
+    
+    def __init__(self, frame: pd.DataFrame, symbols: List[str], max_dte: int, max_pitm: float):
+        self.frame = frame
+        self.symbols = set(symbols)
+        self.max_dte = max_dte
+        self.max_pitm = max_pitm
+        self.created_at = time.time()
+    
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.created_at <= ttl
+    
+    def covers(self, max_dte: int, max_pitm: float) -> bool:
+        return max_dte <= self.max_dte and max_pitm <= self.max_pitm
+    
+    def missing_symbols(self, symbols: List[str]) -> List[str]:
+        return [symbol for symbol in symbols if symbol not in self.symbols]
+    
+    def extend(self, frame: pd.DataFrame, symbols: List[str]) -> 'ScreenUniverse':
+        """Return a universe with newly screened symbols added (fetched with the same max DTE and PITM)"""
+        extended = ScreenUniverse(
+            combine_results([self.frame, frame]), list(self.symbols | set(symbols)), self.max_dte, self.max_pitm
+        )
+        extended.created_at = self.created_at  # Expires with its oldest data
+        return extended
+    
+    def filter(self, symbols: List[str], max_dte: int, max_pitm: float,
+               min_open_interest: int, min_volume: int) -> pd.DataFrame:
+        """Apply the screen filters in memory"""
+        df = self.frame
+        if df.empty:
+            return df
+        keep = (
+            df['Ticker'].isin(symbols).to_numpy() &
+            (df['DTE'] <= max_dte).to_numpy() &
+            (df['PITM'] <= max_pitm).to_numpy() &
+            (df['OI'] >= min_open_interest).to_numpy()
+        )
+        # Volume filter only if specified; missing volume counts as zero
+        if min_volume > 0:
+            keep &= (df['Volume'].fillna(0) >= min_volume).to_numpy()
+        return df[keep]
+
+def iter_screen(client: MCPAlpacaClient, symbols: List[str], max_dte: int, max_pitm: float,
+                min_open_interest: int = 0, min_volume: int = 0) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """Screen symbols concurrently and yield (symbol, scored contracts) as each one completes
+    
+    Symbols that fail, including rate limited ones, are logged and skipped.
+    """
+    future_to_symbol = {
+        client.submit_symbol(symbol, max_dte, max_pitm, min_open_interest, min_volume): symbol
+        for symbol in symbols
+    }
+    for future in as_completed(future_to_symbol):
+        symbol = future_to_symbol[future]
+        try:
+            symbol_results = future.result()
+        except Exception as e:
+            logger.error(f"Error screening {symbol}: {str(e)}")
+            continue
+        yield symbol, symbol_results
+
+def screen(client: MCPAlpacaClient, symbols: List[str], max_dte: int, max_pitm: float) -> ScreenUniverse:
+    """Screen symbols and return every scored contract as a universe to filter and rank
+    
+    Symbols that failed are missing from the universe's symbols.
+    """
+    started_at = time.time()
+    results = dict(iter_screen(client, symbols, max_dte, max_pitm))
+    universe = ScreenUniverse(combine_results(list(results.values())), list(results), max_dte, max_pitm)
+    universe.created_at = started_at
+    return universe
+
+class PrescreenScheduler:
+    """Background worker that keeps a scored universe of the default symbols ready for every session
+    
+    During regular market hours (9:30-16:00 New York, weekdays) the symbols are
+    re-screened every interval seconds; outside them, once after the close and
+    then not again until the open. Exchange holidays are treated as trading days.
+    The latest result is published in memory and to a parquet file with a JSON
+    metadata sidecar, so a restarted app can serve it before its first screen
+    finishes. Writing parquet needs pyarrow; without it results stay in memory.
+    """
+    
+    MARKET_TIMEZONE = ContractMetadataStore.MARKET_TIMEZONE
+    POLL_INTERVAL = 30  # Seconds between schedule checks
+    
+    def __init__(self, mcp_client: MCPAlpacaClient, symbols: List[str], max_dte: int, max_pitm: float,
+                 interval: float = 300, path: Optional[str] = None):
+        self.mcp_client = mcp_client
+        self.symbols = symbols
+        self.max_dte = max_dte
+        self.max_pitm = max_pitm
+        self.interval = interval
+        self.path = path
+        self.latest: Optional[ScreenUniverse] = self._load()
+        self.last_error: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run_forever, name="prescreen-scheduler", daemon=True)
+    
+    def start(self) -> None:
+        self._thread.start()
+    
+    def stop(self) -> None:
+        self._stop.set()
+    
+    @classmethod
+    def market_is_open(cls, now: Optional[datetime] = None) -> bool:
+        now = now or datetime.now(cls.MARKET_TIMEZONE)
+        minutes = now.hour * 60 + now.minute
+        return now.weekday() < 5 and 9 * 60 + 30 <= minutes < 16 * 60
+    
+    @classmethod
+    def last_close(cls, now: Optional[datetime] = None) -> datetime:
+        """The most recent weekday 16:00 New York at or before now"""
+        now = now or datetime.now(cls.MARKET_TIMEZONE)
+        close = now.replace(hour=16, minute=0, second=0, microsecond=0)
+        if close > now:
+            close -= timedelta(days=1)
+        while close.weekday() >= 5:
+            close -= timedelta(days=1)
+        return close
+    
+    def is_due(self, now: Optional[datetime] = None) -> bool:
+        if self.latest is None:
+            return True
+        if self.market_is_open(now):
+            return time.time() - self.latest.created_at >= self.interval
+        # After hours, one screen past the close captures the closing prices
+        return self.latest.created_at < self.last_close(now).timestamp()
+    
+    def _run_forever(self) -> None:
+        while not self._stop.is_set():
+            if self.is_due():
+                try:
+                    self.run_once()
+                    self.last_error = None
+                except Exception as e:
+                    self.last_error = str(e)
+                    logger.error(f"Pre-screen failed: {str(e)}")
+            self._stop.wait(self.POLL_INTERVAL)
+    
+    def run_once(self) -> ScreenUniverse:
+        """Screen the symbols now and publish the result"""
+        # Failed symbols are left out of the universe, so sessions screen them live on demand
+        universe = screen(self.mcp_client, self.symbols, self.max_dte, self.max_pitm)
+        self.latest = universe
+        self._save(universe)
+        logger.info(f"Pre-screened {len(universe.symbols)} symbols in {time.time() - universe.created_at:.1f}s")
+        return universe
+    
+    def _metadata_path(self) -> str:
+        return f"{self.path}.json"
+    
+    def _save(self, universe: ScreenUniverse) -> None:
+        """Write the frame as parquet and its settings to a JSON sidecar, each replaced atomically"""
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            universe.frame.to_parquet(temp_path, index=False)
+            os.replace(temp_path, self.path)
+            # The sidecar goes last and records the row count, so a frame without a matching sidecar is ignored
+            temp_path = f"{self._metadata_path()}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump({
+                    'symbols': sorted(universe.symbols),
+                    'max_dte': universe.max_dte,
+                    'max_pitm': universe.max_pitm,
+                    'created_at': universe.created_at,
+                    'rows': len(universe.frame)
+                }, f)
+            os.replace(temp_path, self._metadata_path())
+        except ImportError as e:
+            logger.warning(f"Could not save pre-screen results, parquet needs pyarrow installed: {str(e)}")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not save pre-screen results: {str(e)}")
+    
+    def _load(self) -> Optional[ScreenUniverse]:
+        """Load the last published result if it was screened with the current settings"""
+        if not self.path or not os.path.exists(self.path) or not os.path.exists(self._metadata_path()):
+            return None
+        try:
+            with open(self._metadata_path()) as f:
+                saved = json.load(f)
+            if (saved['max_dte'], saved['max_pitm']) != (self.max_dte, self.max_pitm) or not set(saved['symbols']) <= set(self.symbols):
+                return None
+            frame = pd.read_parquet(self.path)
+            if len(frame) != saved['rows']:
+                raise ValueError("results do not match their metadata")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable pre-screen results: {str(e)}")
+            return None
+        universe = ScreenUniverse(frame, saved['symbols'], saved['max_dte'], saved['max_pitm'])
+        universe.created_at = saved['created_at']
+        return universe
+
+def parse_symbols(symbols_input: str) -> List[str]:
+    """Split a comma-separated symbol list into upper-case tickers"""
+    return [s.strip().upper() for s in symbols_input.split(',') if s.strip()]
@@ -0,0 +1,21 @@
+import copy
+import os
+
+import pytest
+
+os.environ.setdefault("ALPACA_API_KEY", "test")
+os.environ.setdefault("ALPACA_SECRET_KEY", "test")
+
+import putscreenpro_engine as engine
+
+@pytest.fixture(scope="session")
+def client():
+    """An engine client that never touches the network or the disk unless a test points it somewhere"""
+    saved_config = copy.deepcopy(engine.config)
+    engine.config.setdefault('streaming', {})['enabled'] = False
+    engine.config.setdefault('contract_store', {})['enabled'] = False
+    mcp_client = engine.MCPAlpacaClient()
+    yield mcp_client
+    mcp_client._loop.call_soon_threadsafe(mcp_client._loop.stop)
+    engine.config.clear()
+    engine.config.update(saved_config)
@@ -0,0 +1,98 @@
+import sys
+
+import numpy as np
+import pytest
+
+import putscreenpro_engine as engine
+
+@pytest.fixture
+def clock(monkeypatch):
+    """The cache's monotonic clock, advanced through clock[0]"""
+    now = [1000.0]
+    monkeypatch.setattr(engine.time, 'monotonic', lambda: now[0])
+    return now
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = engine.CacheManager(default_ttl=60)
+    cache.set("quote", {"bid": 1.0})
+    cache.set("snapshot", {"delta": -0.2}, ttl=5)
+
+    clock[0] += 5
+    assert cache.get("snapshot") is None
+    assert cache.get("quote") == {"bid": 1.0}
+    clock[0] += 55
+    assert cache.get("quote") is None
+    assert cache.stats()['expirations'] == 2
+    assert cache.stats()['bytes'] == 0
+
+def test_least_recently_used_entries_are_evicted_first(clock):
+    cache = engine.CacheManager(max_entries=3)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    assert cache.get("a") == "a"
+    cache.set("d", "d")
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in ("a", "c", "d")] == ["a", "c", "d"]
+    assert cache.stats()['evictions'] == 1
+
+def test_expired_entries_are_evicted_before_live_ones(clock):
+    cache = engine.CacheManager(max_entries=2)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2, ttl=100)
+    clock[0] += 1
+    cache.set("new", 3)
+    assert cache.get("long") == 2
+    assert cache.stats()['evictions'] == 0
+
+def test_max_bytes_counts_numpy_array_data(clock):
+    array = np.zeros(100_000)
+    cache = engine.CacheManager(max_bytes=2 * array.nbytes)
+    for key in ("a", "b", "c"):
+        cache.set(key, (array.copy(), array[::2]))
+    # Each entry holds 1.5 arrays of data, so only the newest fits
+    assert len(cache) == 1 and cache.get("c") is not None
+    assert cache.stats()['bytes'] >= 1.5 * array.nbytes
+
+def test_volatility_surfaces_are_sized_by_their_arrays():
+    strikes = np.tile(np.arange(50.0, 150.0, 0.5), 20)
+    dte = np.repeat(np.arange(1, 21), 200)
+    surface = engine.VolatilitySurface(100.0, strikes, dte, np.full(strikes.size, 0.3))
+    data = sum(points.nbytes + sigma.nbytes for _, points, sigma in surface.slices)
+    assert data <= engine.CacheManager._approximate_size(surface) <= 2 * data
+
+class CountingCache(engine.CacheManager):
+    sized = 0
+
+    @classmethod
+    def _approximate_size(cls, value, depth=0):
+        cls.sized += 1
+        return super()._approximate_size(value, depth)
+
+def test_large_listings_are_sized_from_a_sample():
+    listing = {f"2025-01-{day:02d}": [{'symbol': f"XYZ{day:02d}P{strike:05d}", 'strike_price': float(strike),
+                                       'open_interest': strike, 'close_price': 1.25}
+                                      for strike in range(2000)]
+               for day in range(1, 21)}
+    walked = sys.getsizeof(listing) + sum(
+        sys.getsizeof(day) + sys.getsizeof(options) +
+        sum(sys.getsizeof(option) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in option.items())
+            for option in options)
+        for day, options in listing.items()
+    )
+    CountingCache(max_entries=10).set("listing", listing)
+    assert CountingCache.sized < 10_000 < 9 * 40_000
+    assert CountingCache._approximate_size(listing) == pytest.approx(walked, rel=0.05)
+
+def test_negative_entries_are_cached_for_negative_ttl(clock):
+    cache = engine.CacheManager(default_ttl=300, negative_ttl=30)
+    cache.set_negative("contracts_XYZ")
+    assert cache.get("contracts_XYZ") is engine.CacheManager.NEGATIVE
+    assert cache.stats()['hits'] == 1
+
+    clock[0] += 30
+    assert cache.get("contracts_XYZ") is None
+    cache.set_negative("contracts_XYZ", ttl=300)
+    clock[0] += 299
+    assert cache.get("contracts_XYZ") is engine.CacheManager.NEGATIVE
+    cache.set("contracts_XYZ", {"2025-01-17": []})
+    assert cache.get("contracts_XYZ") == {"2025-01-17": []}
@@ -0,0 +1,73 @@
+import os
+import re
+import socket
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_market import SyntheticMarket
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(REPO_DIR, "putscreenpro_cli.py")
+
+def closed_port_url() -> str:
+    """URL of a local port nothing listens on, so every request is refused"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+def run_cli(cwd, url: str, *args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, TRADE_API_URL=url, DATA_API_URL=url,
+               ALPACA_API_KEY="test", ALPACA_SECRET_KEY="test")
+    return subprocess.run([sys.executable, CLI, *args], cwd=cwd, env=env, capture_output=True, text=True, timeout=120)
+
+@pytest.fixture(scope="module")
+def fake_alpaca():
+    """URL of a local fake Alpaca API on which ZZZZ is an unknown ticker"""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_alpaca_server", "--port", "0",
+         "--expirations", "3", "--strikes", "30", "--unlisted", "ZZZZ"],
+        cwd=REPO_DIR, stderr=subprocess.PIPE, text=True
+    )
+    try:
+        yield re.search(r"http://[\d.]+:\d+", server.stderr.readline()).group(0)
+    finally:
+        server.terminate()
+        server.communicate(timeout=30)
+
+def test_screen_exits_1_when_alpaca_is_unreachable(tmp_path):
+    out = tmp_path / "results.csv"
+    # Run from an empty directory: the repo's config.json, but no contract store or .env from the repo
+    result = run_cli(tmp_path, closed_port_url(), "screen", "--symbols", "AAPL,MSFT", "--out", str(out))
+    assert result.returncode == 1, result.stderr
+    assert "Screened 0/2 symbols" in result.stderr
+    assert "Failed: AAPL, MSFT" in result.stderr
+
+def test_screen_writes_the_screened_symbols_and_exits_3_when_some_fail(tmp_path, fake_alpaca):
+    out = tmp_path / "results.csv"
+    result = run_cli(tmp_path, fake_alpaca, "screen", "--symbols", "AAPL,MSFT,ZZZZ", "--max-dte", "20",
+                     "--max-pitm", "25", "--out", str(out))
+    assert result.returncode == 3, result.stderr
+    assert "Screened 2/3 symbols" in result.stderr
+    assert "Failed: ZZZZ" in result.stderr
+
+    df = pd.read_csv(out)
+    assert set(df['Ticker']) == {"AAPL", "MSFT"}
+    assert df['Score'].is_monotonic_decreasing
+    assert df['DTE'].between(0, 20).all() and df['PITM'].between(0, 25).all()
+    market = SyntheticMarket(3, 30)
+    expirations = {expiration.isoformat() for expiration in market.expiration_dates()}
+    for ticker, rows in df.groupby('Ticker'):
+        assert set(rows['Strike']) <= set(market.strikes(ticker))
+        assert set(rows['Expiration']) <= expirations
+        assert (rows['Strike'] < rows['Price']).all()
+
+def test_screen_exits_0_when_every_symbol_is_screened(tmp_path, fake_alpaca):
+    out = tmp_path / "best.jsonl"
+    result = run_cli(tmp_path, fake_alpaca, "screen", "--symbols", "AAPL,MSFT", "--best-only", "--out", str(out))
+    assert result.returncode == 0, result.stderr
+    df = pd.read_json(out, lines=True)
+    assert sorted(df['Ticker']) == ["AAPL", "MSFT"]
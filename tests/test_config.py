@@ -0,0 +1,17 @@
+import json
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_the_engine_loads_its_own_config_from_any_directory(tmp_path):
+    env = dict(os.environ, PYTHONPATH=REPO_DIR, ALPACA_API_KEY="test", ALPACA_SECRET_KEY="test")
+    result = subprocess.run(
+        [sys.executable, "-c", "import json, putscreenpro_engine as engine; print(json.dumps(engine.config))"],
+        cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    # Importing the engine writes nothing to stdout but what the caller prints
+    with open(os.path.join(REPO_DIR, "config.json")) as f:
+        assert json.loads(result.stdout) == json.load(f)
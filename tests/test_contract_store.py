@@ -0,0 +1,90 @@
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+import putscreenpro_engine as engine
+
+MONDAY = date(2025, 1, 6)
+
+def contract(strike: float, expiration: date) -> dict:
+    return {'symbol': f"XYZ{expiration:%y%m%d}P{int(strike * 1000):08d}", 'name': None, 'strike_price': strike,
+            'expiration_date': expiration.isoformat(), 'open_interest': 100, 'close_price': 1.0}
+
+def listing(expirations, strikes) -> dict:
+    return {expiration: [contract(strike, expiration) for strike in strikes] for expiration in expirations}
+
+@pytest.fixture
+def trading_day(monkeypatch):
+    """The store's current trading day, settable through trading_day[0]"""
+    day = [MONDAY]
+    monkeypatch.setattr(engine.ContractMetadataStore, 'current_trading_day', classmethod(lambda cls: day[0]))
+    return day
+
+@pytest.fixture
+def store(tmp_path, trading_day):
+    store = engine.ContractMetadataStore(str(tmp_path / "contracts.sqlite"))
+    store.warm()
+    return store
+
+def stored_days(store) -> set:
+    with sqlite3.connect(store.path) as conn:
+        return {row[0] for row in conn.execute("SELECT trading_day FROM contracts UNION SELECT trading_day FROM coverage")}
+
+def test_coverage_serves_narrower_requests_only(store):
+    expirations = [MONDAY + timedelta(days=days) for days in (4, 11, 18)]
+    store.put("XYZ", "put", expirations[-1], listing(expirations, [90.0, 95.0, 100.0]), strike_price_lte=100.0)
+
+    served = store.get("XYZ", "put", MONDAY, expirations[1], strike_price_lte=95.0)
+    assert list(served) == expirations[:2]
+    assert [option['strike_price'] for option in served[expirations[0]]] == [90.0, 95.0]
+    # Further out, above the stored ceiling, for all strikes, or for another underlying: not covered
+    assert store.get("XYZ", "put", MONDAY, expirations[-1] + timedelta(days=7), 95.0) is None
+    assert store.get("XYZ", "put", MONDAY, expirations[-1], 105.0) is None
+    assert store.get("XYZ", "put", MONDAY, expirations[-1]) is None
+    assert store.get("ABC", "put", MONDAY, expirations[-1], 95.0) is None
+
+def test_a_new_store_serves_the_same_trading_day_from_disk(store, trading_day):
+    expirations = [MONDAY + timedelta(days=4)]
+    store.put("XYZ", "put", expirations[0], listing(expirations, [90.0, 95.0]))
+
+    reopened = engine.ContractMetadataStore(store.path)
+    assert reopened.warm() == 2
+    assert reopened.get("XYZ", "put", MONDAY, expirations[0]) == store.get("XYZ", "put", MONDAY, expirations[0])
+    assert stored_days(reopened) == {MONDAY.isoformat()}
+
+def test_earlier_trading_days_are_invalidated(store, trading_day):
+    expirations = [MONDAY + timedelta(days=4)]
+    store.put("XYZ", "put", expirations[0], listing(expirations, [90.0, 95.0]))
+
+    trading_day[0] = MONDAY + timedelta(days=1)
+    # Neither the running store nor one warmed from disk serves yesterday's listing
+    assert store.get("XYZ", "put", trading_day[0], expirations[0]) is None
+    reopened = engine.ContractMetadataStore(store.path)
+    assert reopened.warm() == 0
+    assert reopened.get("XYZ", "put", trading_day[0], expirations[0]) is None
+    assert stored_days(reopened) == set()
+
+    store.put("XYZ", "put", expirations[0], listing(expirations, [95.0]))
+    served = store.get("XYZ", "put", trading_day[0], expirations[0])
+    assert [option['strike_price'] for option in served[expirations[0]]] == [95.0]
+    assert stored_days(store) == {trading_day[0].isoformat()}
+
+def test_a_rollover_does_not_keep_the_earlier_day_covered(store, trading_day):
+    expirations = [MONDAY + timedelta(days=4), MONDAY + timedelta(days=11)]
+    store.put("XYZ", "put", expirations[1], listing(expirations, [90.0]))
+
+    # A narrower discovery the next day must be stored, not skipped as already covered
+    trading_day[0] = MONDAY + timedelta(days=1)
+    store.put("XYZ", "put", expirations[0], listing(expirations[:1], [95.0]))
+    assert store.get("XYZ", "put", trading_day[0], expirations[1]) is None
+    assert list(store.get("XYZ", "put", trading_day[0], expirations[0])) == expirations[:1]
+
+def test_weekends_belong_to_fridays_trading_day(monkeypatch):
+    class Saturday(engine.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(2025, 1, 11, 12, 0, tzinfo=tz)
+
+    monkeypatch.setattr(engine, 'datetime', Saturday)
+    assert engine.ContractMetadataStore.current_trading_day() == date(2025, 1, 10)
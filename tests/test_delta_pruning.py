@@ -0,0 +1,65 @@
+import pytest
+
+PROBE_COUNT = 3
+
+def make_candidates(count: int):
+    return [{'symbol': f"XYZ250117P{i:08d}", 'strike_price': 50.0 + i} for i in range(count)]
+
+@pytest.fixture
+def snapshots(client, monkeypatch):
+    """Serve snapshots from a symbol -> snapshot table, recording every request"""
+    table, requests = {}, []
+
+    async def aget_option_snapshots(symbols):
+        requests.append(list(symbols))
+        return {symbol: table[symbol] for symbol in symbols if symbol in table}
+
+    monkeypatch.setattr(client, 'aget_option_snapshots', aget_option_snapshots)
+    monkeypatch.setattr(client, 'delta_probe_count', PROBE_COUNT)
+    return table, requests
+
+def set_pitms(table, candidates, pitms):
+    for option, pitm in zip(candidates, pitms):
+        table[option['symbol']] = {'delta': -pitm / 100, 'implied_volatility': 40.0}
+
+@pytest.mark.parametrize("count", [0, 1, PROBE_COUNT, PROBE_COUNT + 1, 17, 40])
+def test_pruning_keeps_every_passing_strike_and_only_drops_failing_ones(client, snapshots, count):
+    table, requests = snapshots
+    candidates = make_candidates(count)
+    set_pitms(table, candidates, [5 + i for i in range(count)])
+    for passing in range(count + 1):
+        requests.clear()
+        kept, kept_snapshots = client._run(client._aprune_by_delta(candidates, 5 + passing - 0.5))
+        # The boundary lies somewhere in the last unprobed gap, never more than a probe batch wide
+        assert kept == candidates[:len(kept)]
+        assert passing <= len(kept) <= max(passing + PROBE_COUNT, count if count <= PROBE_COUNT else 0)
+        assert set(kept_snapshots) == {option['symbol'] for option in kept}
+        assert all(len(request) <= PROBE_COUNT for request in requests[:-1])
+        assert requests[-1] == [option['symbol'] for option in kept]
+
+@pytest.mark.parametrize("probe_result", ["no_greeks", "failed"])
+def test_a_probe_without_a_delta_keeps_every_strike(client, snapshots, probe_result):
+    table, requests = snapshots
+    candidates = make_candidates(20)
+    set_pitms(table, candidates, [5 + i for i in range(20)])
+    # The middle probe of the first round, which splits the 20 candidates at 4, 9 and 14
+    probe = candidates[9]['symbol']
+    if probe_result == "no_greeks":
+        table[probe] = {}
+    else:
+        del table[probe]
+    kept, _ = client._run(client._aprune_by_delta(candidates, 10))
+    assert kept == candidates
+    assert requests[0] == [candidates[i]['symbol'] for i in (4, 9, 14)]
+    assert requests[-1] == [option['symbol'] for option in candidates]
+
+def test_non_monotonic_deltas_keep_every_strike(client, snapshots):
+    table, requests = snapshots
+    candidates = make_candidates(20)
+    pitms = [5 + i for i in range(20)]
+    # A failing first-round probe below a passing one
+    pitms[4], pitms[14] = 50, 1
+    set_pitms(table, candidates, pitms)
+    kept, _ = client._run(client._aprune_by_delta(candidates, 20))
+    assert kept == candidates
+    assert requests[-1] == [option['symbol'] for option in candidates]
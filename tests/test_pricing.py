@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+import pytest
+
+import putscreenpro_engine as engine
+
+Client = engine.MCPAlpacaClient
+
+def put_prices(stock_price, strikes, dte, sigma, r=0.05):
+    strikes = np.asarray(strikes, dtype=float)
+    T = np.broadcast_to(np.asarray(dte, dtype=float) / 365.0, strikes.shape)
+    sigma = np.broadcast_to(np.asarray(sigma, dtype=float), strikes.shape)
+    price, d1, sqrt_T = Client._black_scholes_put(stock_price, strikes, T, sigma, r)
+    vega = stock_price * np.exp(-d1 ** 2 / 2) / math.sqrt(2 * math.pi) * sqrt_T
+    return price, vega
+
+def test_implied_volatility_round_trips_black_scholes_prices():
+    strikes, dte, sigma = (a.ravel() for a in np.meshgrid(
+        np.arange(60.0, 141.0, 5.0), [1, 7, 30, 90, 365], [0.1, 0.3, 0.6, 1.2, 2.5], indexing='ij'
+    ))
+    prices, vega = put_prices(100.0, strikes, dte, sigma)
+    # Where vega is negligible the price does not pin down the volatility
+    solvable = vega > 1e-3
+    solved = Client.solve_implied_volatility(100.0, strikes[solvable], prices[solvable], dte[solvable])
+    assert np.all(np.isfinite(solved))
+    np.testing.assert_allclose(solved, sigma[solvable], atol=1e-3)
+
+def test_newton_steps_that_leave_the_bracket_fall_back_to_bisection():
+    strikes, dte, sigma = np.array([80.0, 80.0, 130.0]), np.array([1, 1, 3]), np.array([3.0, 1.5, 4.0])
+    prices, _ = put_prices(100.0, strikes, dte, sigma)
+    # The first Newton step from the solver's starting guess lands outside (0, max_volatility)
+    solved = Client.solve_implied_volatility(100.0, strikes, prices, dte)
+    np.testing.assert_allclose(solved, sigma, atol=1e-4)
+
+def test_near_zero_prices_are_solved_or_rejected_not_left_at_the_starting_guess():
+    strikes = np.array([60.0, 70.0, 80.0, 60.0])
+    dte = np.array([1, 1, 7, 30])
+    sigma = np.array([0.3, 0.2, 0.1, 0.15])
+    prices, _ = put_prices(100.0, strikes, dte, sigma)
+    assert np.all(prices < 1e-6)
+    solved = Client.solve_implied_volatility(100.0, strikes, prices, dte)
+    found = np.isfinite(solved)
+    np.testing.assert_allclose(solved[found], sigma[found], atol=1e-3)
+
+def test_prices_outside_the_arbitrage_bounds_yield_nan():
+    strikes = np.array([100.0, 120.0, 90.0, 100.0, 100.0])
+    prices = np.array([0.0, 15.0, 95.0, -1.0, 3.0])
+    dte = np.array([30, 30, 30, 30, 0])
+    solved = Client.solve_implied_volatility(100.0, strikes, prices, dte)
+    assert np.all(np.isnan(solved))
+
+@pytest.fixture
+def chain():
+    rng = np.random.default_rng(7)
+    strikes = np.arange(70.0, 131.0, 2.5)
+    dte = rng.choice([0, 1, 7, 21, 45], size=strikes.size)
+    premiums, _ = put_prices(100.0, strikes, np.maximum(dte, 1), 0.4)
+    premiums = np.round(np.maximum(premiums, 0.01), 2)
+    greeks = Client.calculate_black_scholes_greeks(100.0, strikes, np.maximum(dte, 1), np.full(strikes.size, 0.4))
+    greeks['implied_volatility'] = np.full(strikes.size, 40.0)
+    # Every third contract has no Greeks and falls back to the estimated path
+    missing = np.arange(strikes.size) % 3 == 0
+    for values in greeks.values():
+        values[missing] = np.nan
+    return strikes, premiums, dte, greeks, missing
+
+def test_chain_metrics_match_the_scalar_metrics_row_for_row(client, chain):
+    strikes, premiums, dte, greeks, missing = chain
+    metrics = Client.calculate_chain_metrics(
+        100.0, strikes, premiums, dte, greeks['delta'], greeks['implied_volatility'],
+        greeks['gamma'], greeks['theta']
+    )
+    for i in range(strikes.size):
+        snapshot = {} if missing[i] else {name: float(values[i]) for name, values in greeks.items()}
+        expected = client.calculate_option_metrics(100.0, strikes[i], premiums[i], int(dte[i]), snapshot=snapshot)
+        Client.validate_metrics(expected)
+        assert metrics['valid'][i]
+        assert metrics['data_source'][i] == expected['data_source']
+        for name in ('cash_required', 'premium_received', 'period_return', 'annualized_return', 'pitm',
+                     'distance_to_strike', 'implied_volatility', 'delta', 'gamma', 'theta', 'expected_return',
+                     'volatility_risk_premium', 'sharpe_ratio', 'theta_efficiency', 'advanced_score'):
+            assert metrics[name][i] == pytest.approx(expected[name], rel=1e-9, abs=1e-9), (name, i)
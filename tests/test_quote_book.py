@@ -0,0 +1,78 @@
+import asyncio
+import os
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("ALPACA_API_KEY", "test")
+os.environ.setdefault("ALPACA_SECRET_KEY", "test")
+
+import alpaca_mcp_server as server
+
+class FakeStream:
+    """Records subscription changes; run() blocks until stop() like the SDK's streams"""
+
+    def __init__(self):
+        self.subscribed = set()
+        self.calls = []
+        self._stopped = threading.Event()
+
+    def subscribe_quotes(self, handler, *symbols):
+        self.calls.append(("subscribe", symbols))
+        self.subscribed.update(symbols)
+
+    def unsubscribe_quotes(self, *symbols):
+        self.calls.append(("unsubscribe", symbols))
+        for symbol in symbols:
+            self.subscribed.remove(symbol)
+
+    def run(self):
+        self._stopped.wait()
+
+    def stop(self):
+        self._stopped.set()
+
+@pytest.fixture
+def stream():
+    return FakeStream()
+
+@pytest.fixture
+def book(stream):
+    book = server.QuoteBook(stream, "test", max_symbols=3)
+    yield book
+    book.stop()
+
+def flush(book):
+    """Wait for queued subscription changes to reach the stream"""
+    book._subscriber.submit(lambda: None).result()
+
+def receive(book, symbol):
+    quote = SimpleNamespace(symbol=symbol, bid_price=1.0, ask_price=1.1, bid_size=1, ask_size=1,
+                            timestamp=datetime.now(timezone.utc))
+    asyncio.run(book._on_quote(quote))
+
+def test_least_recently_used_symbols_are_unsubscribed_beyond_the_cap(book, stream):
+    assert book.subscribe(["AAA", "BBB", "CCC"]) == 3
+    for symbol in ("AAA", "BBB", "CCC"):
+        receive(book, symbol)
+    # Reading AAA and resubscribing BBB leave CCC least recently used
+    assert book.get("AAA", 60) is not None
+    assert book.subscribe(["BBB"]) == 0
+    assert book.subscribe(["DDD"]) == 1
+    flush(book)
+
+    assert stream.subscribed == {"AAA", "BBB", "DDD"}
+    assert not book.is_subscribed("CCC") and book.get("CCC", 60) is None
+    assert book.stats["subscribed"] == 3 and book.stats["quotes"] == 2
+    # A late quote for an unsubscribed symbol is dropped
+    receive(book, "CCC")
+    assert book.get("CCC", 60) is None
+
+def test_a_request_larger_than_the_cap_keeps_its_newest_symbols(book, stream):
+    book.subscribe(["AAA"])
+    assert book.subscribe(["BBB", "CCC", "DDD", "EEE"]) == 3
+    flush(book)
+    assert stream.subscribed == {"CCC", "DDD", "EEE"}
+    assert stream.calls == [("subscribe", ("AAA",)), ("unsubscribe", ("AAA",)), ("subscribe", ("CCC", "DDD", "EEE"))]
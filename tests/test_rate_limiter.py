@@ -0,0 +1,79 @@
+import json
+import os
+
+import pytest
+import requests
+from alpaca.common.exceptions import APIError
+
+os.environ.setdefault("ALPACA_API_KEY", "test")
+os.environ.setdefault("ALPACA_SECRET_KEY", "test")
+
+import alpaca_mcp_server as server
+
+def api_error(status: int) -> APIError:
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps({"code": status * 100000, "message": "error"}).encode()
+    return APIError(response.text, requests.HTTPError(response=response))
+
+def failing(*statuses: int):
+    """A request that fails with the given statuses in turn, then succeeds"""
+    calls = []
+
+    def request():
+        calls.append(len(calls))
+        if len(calls) <= len(statuses):
+            raise api_error(statuses[len(calls) - 1])
+        return {"ok": True}
+
+    return request, calls
+
+@pytest.fixture
+def limiter(monkeypatch):
+    monkeypatch.setattr(server.time, "sleep", lambda seconds: None)
+    return server.UpstreamRateLimiter(10 ** 6, 4, max_retries=3)
+
+def test_idempotent_requests_retry_server_errors(limiter):
+    request, calls = failing(500, 503)
+    assert limiter.call(request, idempotent=True) == {"ok": True}
+    assert len(calls) == 3
+    assert limiter.stats["retries"] == 2
+
+def test_non_idempotent_requests_fail_on_the_first_server_error(limiter):
+    request, calls = failing(500)
+    with pytest.raises(APIError):
+        limiter.call(request)
+    assert len(calls) == 1
+
+def test_gateway_timeouts_are_left_to_the_sdk(limiter):
+    request, calls = failing(504)
+    with pytest.raises(APIError):
+        limiter.call(request, idempotent=True)
+    assert len(calls) == 1
+
+def test_client_errors_are_not_retried(limiter):
+    request, calls = failing(404)
+    with pytest.raises(APIError):
+        limiter.call(request, idempotent=True)
+    assert len(calls) == 1
+
+def test_rate_limited_requests_retry_until_max_retries(limiter, monkeypatch):
+    monkeypatch.setattr(limiter, "_back_off", lambda delay: None)
+    request, calls = failing(429, 429)
+    assert limiter.call(request) == {"ok": True}
+    assert limiter.stats["rate_limited"] == 2
+
+    request, calls = failing(*[429] * 4)
+    with pytest.raises(server.RateLimitExceeded):
+        limiter.call(request)
+    assert len(calls) == 4
+
+def test_clients_pass_their_retry_codes_and_rate_limit_each_request(monkeypatch):
+    client = server.StockHistoricalDataClientSigned("test", "test")
+    assert client._retry_codes == server.SDK_RETRY_CODES
+    requests_made = []
+    monkeypatch.setattr(server.rate_limiter, "call",
+                        lambda func, *args, **kwargs: requests_made.append((func.__name__, kwargs)))
+    client.get("/stocks/quotes/latest", {"symbols": "AAPL"})
+    client.post("/orders", {})
+    assert requests_made == [("get", {"idempotent": True}), ("post", {})]
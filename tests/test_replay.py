@@ -0,0 +1,33 @@
+import json
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_benchmark(*args: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_screen", "--universe", "3", "--expirations", "3",
+         "--strikes", "30", "--repeat", "1", "--no-memory", *args],
+        cwd=REPO_DIR, capture_output=True, text=True, timeout=300
+    )
+    assert result.returncode == 0, result.stderr
+    return result
+
+def test_saved_fixtures_replay_on_a_later_day(tmp_path):
+    fixtures = tmp_path / "fixtures.jsonl"
+    recorded, replayed = tmp_path / "recorded.json", tmp_path / "replayed.json"
+    # Record as of a past day, then replay today: every request must still hit the fixtures
+    run_benchmark("--as-of", "2025-01-06", "--save-fixtures", str(fixtures), "--json", str(recorded))
+    with open(fixtures) as f:
+        assert json.loads(f.readline()) == {"as_of": "2025-01-06"}
+
+    run_benchmark("--fixtures", str(fixtures), "--json", str(replayed))
+    with open(recorded) as f:
+        expected = json.load(f)["results"][0]
+    with open(replayed) as f:
+        result = json.load(f)["results"][0]
+    assert result["unrecorded_requests"] == 0
+    assert result["upstream_errors"] == 0
+    assert result["failed_symbols"] == 0
+    assert result["contracts_scored"] == expected["contracts_scored"] > 0
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+@pytest.mark.parametrize("stock_price", [3.17, 42.5, 187.3, 1234.0])
+@pytest.mark.parametrize("max_pitm", [1, 5, 20, 50, 90])
+@pytest.mark.parametrize("dte", [0, 1, 7, 45, 365])
+def test_no_strike_above_the_ceiling_can_pass_max_pitm(client, stock_price, max_pitm, dte):
+    ceiling = client.calculate_strike_ceiling(stock_price, max_pitm, dte)
+    assert ceiling is not None and ceiling >= stock_price
+    strikes = ceiling + np.linspace(0.01, 2 * stock_price, 200)
+    days = np.unique(np.linspace(1, max(dte, 1), 30).round())
+    sigmas = np.linspace(0.01, client.max_implied_volatility, 40)
+    K, D, V = (grid.ravel() for grid in np.meshgrid(strikes, days, sigmas))
+
+    # Real Greeks: |delta| at any IV up to max_implied_volatility, any day to expiration and any rate up to the bound
+    for rate in (0.0, 0.05, client.max_risk_free_rate):
+        delta = client.calculate_black_scholes_greeks(stock_price, K, D, V, rate)['delta']
+        assert (np.abs(delta) * 100 > max_pitm).all(), f"strike {K[np.abs(delta) * 100 <= max_pitm].min()} cut off"
+
+    # Estimated Greeks: the chain metrics' own PITM estimate
+    K, D = (grid.ravel() for grid in np.meshgrid(strikes, np.unique(np.append(days, dte))))
+    nan = np.full(K.shape, np.nan)
+    metrics = client.calculate_chain_metrics(stock_price, K, np.ones(K.shape), D, nan, nan, nan, nan)
+    assert (metrics['pitm'] > max_pitm).all(), f"strike {K[metrics['pitm'] <= max_pitm].min()} cut off"
+
+def test_no_ceiling_when_every_strike_can_pass(client):
+    assert client.calculate_strike_ceiling(100.0, 99.9, 30) is None
+
+def test_ceiling_follows_the_configured_rate_bound(client, monkeypatch):
+    low = client.calculate_strike_ceiling(100.0, 20, 365)
+    monkeypatch.setattr(client, "max_risk_free_rate", 0.5)
+    assert client.calculate_strike_ceiling(100.0, 20, 365) > low